@@ -0,0 +1,409 @@
+"""Offline backfill of historical Zeek, Suricata and OSQuery logs.
+
+Usage:
+    python backfill.py [--source zeek|suricata|osquery] [--workers N]
+                       [--checkpoint data/backfill_checkpoint.json] PATH [PATH ...]
+
+PATH can be a file, a directory (searched recursively for *.log* and
+*.json*) or a glob. Files may be gzip-compressed. Zeek logs can be native TSV
+or JSON; Suricata (eve.json) and OSQuery results are NDJSON.
+
+Files are spread over a process pool. Every worker parses its file with
+LogParser and bulk-loads the rows into security_logs through
+SQLALCHEMY_DATABASE_URL (or --database-url), committing one chunk at a time.
+After each commit the worker reports the file offset it reached, and the
+parent records it in the checkpoint file. An interrupted run started again
+with the same checkpoint resumes where it stopped. Every row gets an id
+derived from its file and line offset, and rows whose id is already stored
+are skipped, so chunks that were committed just before the interruption but
+not yet checkpointed are not loaded twice. For Zeek TSV files the
+checkpoint also records where the header block in effect starts, so a
+resume inside a later block of a concatenated file uses that block's
+columns.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Lines parsed and committed per chunk; also the checkpoint granularity
+BACKFILL_CHUNK_LINES = 10000
+
+DEFAULT_CHECKPOINT = os.path.join('data', 'backfill_checkpoint.json')
+
+# Seconds between throughput reports
+REPORT_INTERVAL = 5.0
+
+SOURCES = ('zeek', 'suricata', 'osquery')
+
+# File names picked up when a directory is given
+LOG_PATTERNS = ('*.log*', '*.json*')
+
+# Namespace of the row ids derived from file and line offset
+ROW_ID_NAMESPACE = uuid.UUID('5b0f4c52-7d2e-4a8f-9c61-3e1d2a9b8f07')
+
+# Worker process state, set up by _init_worker
+_worker_session_factory = None
+_worker_progress = None
+
+
+def detect_source(path: str) -> Optional[str]:
+    """Guess the log source of a file from its path."""
+    lowered = path.lower()
+    stem = os.path.basename(lowered).split('.')[0]
+    if 'zeek' in lowered or stem == 'conn':
+        return 'zeek'
+    if 'suricata' in lowered or stem == 'eve':
+        return 'suricata'
+    if 'osquery' in lowered:
+        return 'osquery'
+    return None
+
+
+class Checkpoint:
+    """File/offset progress of a backfill, persisted as JSON.
+
+    Offsets are positions in the decompressed stream. A file whose inode
+    changed, or that shrank below its recorded size, is loaded from the
+    start again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.files: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.files = json.load(f).get('files', {})
+
+    def _entry(self, file_path: str) -> Optional[Dict[str, Any]]:
+        entry = self.files.get(os.path.abspath(file_path))
+        if entry is None:
+            return None
+        stat = os.stat(file_path)
+        if entry['inode'] != stat.st_ino or entry['size'] > stat.st_size:
+            return None
+        return entry
+
+    def offset(self, file_path: str) -> int:
+        entry = self._entry(file_path)
+        return entry['offset'] if entry else 0
+
+    def header_offset(self, file_path: str) -> int:
+        """Start of the Zeek header block in effect at ``offset``."""
+        entry = self._entry(file_path)
+        return entry.get('header_offset', 0) if entry else 0
+
+    def is_complete(self, file_path: str) -> bool:
+        """True when the file was fully loaded and has not grown since."""
+        entry = self._entry(file_path)
+        return bool(entry and entry['complete'] and entry['size'] == os.stat(file_path).st_size)
+
+    def update(self, file_path: str, offset: int, complete: bool, header_offset: int = 0):
+        stat = os.stat(file_path)
+        self.files[os.path.abspath(file_path)] = {
+            'offset': offset,
+            'header_offset': header_offset,
+            'complete': complete,
+            'inode': stat.st_ino,
+            'size': stat.st_size,
+            'updated_at': time.time()
+        }
+
+    def save(self):
+        """Atomically replace the checkpoint file."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.checkpoint-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'files': self.files}, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+
+def _init_worker(database_url: str, progress):
+    global _worker_session_factory, _worker_progress
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from system.database import engine_options
+
+    logging.basicConfig(level=logging.WARNING)
+    # Same pool, timeout and logging settings as the API's engine
+    engine = create_engine(database_url, **engine_options(database_url))
+    _worker_session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    _worker_progress = progress
+
+
+def _read_zeek_header(f):
+    """Consume a leading Zeek TSV header block, or return None for JSON logs."""
+    from system.zeek_reader import ZeekHeader
+
+    header = None
+    while True:
+        position = f.tell()
+        line = f.readline()
+        if not line.startswith(b'#'):
+            f.seek(position)
+            return header
+        header = header or ZeekHeader()
+        line = line.decode('utf-8', errors='replace').rstrip('\n')
+        if not line.startswith(('#open', '#close')):
+            header.update(line)
+
+
+def _zeek_tsv_row(values: List[str], line: str, convert, strict: bool) -> Dict[str, Any]:
+    from system.ingest import parsed_log_to_row
+    from system.log_parsers import LogParser
+
+    record = convert(values)
+    if record.timestamp is None:
+        # An unset ts (-) would fail the NOT NULL insert of the whole chunk
+        raise ValueError("timestamp is missing or not a valid time")
+    # Same shape as a JSON Zeek record sent to /ingest
+    content = record._asdict()
+    content['timestamp'] = record.timestamp.timestamp()
+    if strict:
+        return parsed_log_to_row('zeek', LogParser.parse_zeek(dict(content)), line, content)
+    return parsed_log_to_row('zeek', record, line, content)
+
+
+def _zeek_json_line(line: str) -> str:
+    """Rename Zeek's own JSON field names (id.orig_h, ...) to ZeekLog's."""
+    from system.zeek_reader import ZEEK_CONN_FIELD_MAP
+
+    content = json.loads(line)
+    if 'id.orig_h' not in content:
+        return line
+    return json.dumps({ZEEK_CONN_FIELD_MAP.get(name, name): value for name, value in content.items()})
+
+
+def load_file(path: str, source: str, offset: int, chunk_lines: int, strict: bool,
+              header_offset: int = 0) -> Dict[str, Any]:
+    """Process-pool task: parse one file from ``offset`` and bulk-load it.
+
+    ``header_offset`` is where the Zeek header block in effect at ``offset``
+    starts. Progress is reported after every committed chunk as
+    ``(path, offset, header_offset, lines, accepted, rejected, complete)``.
+    """
+    from system.ingest import bulk_insert_security_logs, ndjson_line_to_row
+    from system.zeek_reader import check_conn_header, open_log, record_converter
+
+    totals = {'path': path, 'lines': 0, 'accepted': 0, 'rejected': 0}
+    # Stable across runs, so a reloaded line gets the id it was stored with
+    id_prefix = f"{os.path.abspath(path)}:{os.stat(path).st_ino}:"
+    db = _worker_session_factory()
+    try:
+        with open_log(path, binary=True) as f:
+            header = None
+            if source == 'zeek':
+                if offset > header_offset > 0:
+                    f.seek(header_offset)
+                else:
+                    header_offset = 0
+                header = _read_zeek_header(f)
+            # The converter is rebuilt at the first row after each header block
+            convert, skip_block, header_changed = None, False, header is not None
+            if offset > f.tell():
+                f.seek(offset)
+
+            position = f.tell()
+            in_header = False
+            rows, lines, rejected = [], 0, 0
+            for raw_line in f:
+                line_offset = position
+                position += len(raw_line)
+                line = raw_line.decode('utf-8', errors='replace').rstrip('\r\n')
+                if line.startswith('#'):
+                    # Header block of a concatenated rotation, or #close
+                    if header is not None and not line.startswith(('#open', '#close')):
+                        if not in_header:
+                            header_offset = line_offset
+                            in_header = True
+                        header.update(line)
+                        header_changed = True
+                    continue
+                in_header = False
+                if not line.strip():
+                    continue
+                if header_changed:
+                    # Blocks of other Zeek logs (dns, http, ...) are skipped with a warning
+                    skip_block = not check_conn_header(path, header)
+                    convert = None if skip_block else record_converter(header)
+                    header_changed = False
+                if skip_block:
+                    continue
+
+                lines += 1
+                try:
+                    if convert is not None:
+                        row = _zeek_tsv_row(line.split(header.separator), line, convert, strict)
+                    elif source == 'zeek':
+                        row = ndjson_line_to_row(source, _zeek_json_line(line), strict)
+                    else:
+                        row = ndjson_line_to_row(source, line, strict)
+                    row['id'] = str(uuid.uuid5(ROW_ID_NAMESPACE, f"{id_prefix}{line_offset}"))
+                    rows.append(row)
+                except (ValueError, TypeError, IndexError, AttributeError) as e:
+                    rejected += 1
+                    logger.debug(f"{path}: rejected line: {str(e)}")
+
+                if lines >= chunk_lines:
+                    accepted = bulk_insert_security_logs(db, rows, skip_existing=True)
+                    _worker_progress.put((path, position, header_offset, lines, accepted, rejected, False))
+                    for key, value in (('lines', lines), ('accepted', accepted), ('rejected', rejected)):
+                        totals[key] += value
+                    rows, lines, rejected = [], 0, 0
+
+            accepted = bulk_insert_security_logs(db, rows, skip_existing=True)
+            _worker_progress.put((path, position, header_offset, lines, accepted, rejected, True))
+            for key, value in (('lines', lines), ('accepted', accepted), ('rejected', rejected)):
+                totals[key] += value
+    finally:
+        db.close()
+    return totals
+
+
+class BackfillStats:
+    """Aggregate throughput of a backfill run."""
+
+    def __init__(self, files: int):
+        self.files = files
+        self.files_done = 0
+        self.files_failed = 0
+        self.lines = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.started_at = time.time()
+
+    def report(self) -> str:
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        return (
+            f"{self.files_done}/{self.files} files, {self.lines} lines, {self.accepted} accepted, "
+            f"{self.rejected} rejected in {elapsed:.1f}s "
+            f"({self.lines / elapsed:,.0f} lines/sec, {self.accepted / elapsed:,.0f} rows/sec)"
+        )
+
+
+def run_backfill(paths: List[str], source: Optional[str], database_url: str,
+                 checkpoint_path: str = DEFAULT_CHECKPOINT, workers: Optional[int] = None,
+                 chunk_lines: int = BACKFILL_CHUNK_LINES, strict: bool = False) -> BackfillStats:
+    """Load every file under ``paths`` in parallel, resuming from the checkpoint."""
+    from system.zeek_reader import expand_log_paths
+
+    checkpoint = Checkpoint(checkpoint_path)
+    tasks = []
+    for path in expand_log_paths(paths, LOG_PATTERNS):
+        file_source = source or detect_source(path)
+        if file_source is None:
+            logger.warning(f"Skipping {path}: cannot tell its log source, pass --source")
+            continue
+        if checkpoint.is_complete(path):
+            logger.info(f"Skipping {path}: already loaded")
+            continue
+        tasks.append((path, file_source, checkpoint.offset(path), checkpoint.header_offset(path)))
+
+    stats = BackfillStats(len(tasks))
+    if not tasks:
+        return stats
+
+    context = multiprocessing.get_context('spawn')
+    progress = context.Queue()
+    workers = workers or multiprocessing.cpu_count()
+    last_report = time.time()
+
+    def apply(update):
+        path, offset, header_offset, lines, accepted, rejected, complete = update
+        checkpoint.update(path, offset, complete, header_offset)
+        checkpoint.save()
+        stats.lines += lines
+        stats.accepted += accepted
+        stats.rejected += rejected
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=context,
+                             initializer=_init_worker, initargs=(database_url, progress)) as pool:
+        futures = {
+            pool.submit(load_file, path, file_source, offset, chunk_lines, strict, header_offset): path
+            for path, file_source, offset, header_offset in tasks
+        }
+        pending = set(futures)
+        while pending:
+            try:
+                apply(progress.get(timeout=0.5))
+            except queue.Empty:
+                pass
+
+            for future in [f for f in pending if f.done()]:
+                pending.discard(future)
+                try:
+                    future.result()
+                    stats.files_done += 1
+                except Exception as e:
+                    stats.files_failed += 1
+                    logger.error(f"Backfill of {futures[future]} failed: {str(e)}")
+
+            if time.time() - last_report >= REPORT_INTERVAL:
+                logger.info(stats.report())
+                last_report = time.time()
+
+        # Progress messages sent just before the last tasks finished
+        while True:
+            try:
+                apply(progress.get(timeout=0.5))
+            except queue.Empty:
+                break
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill historical security logs into security_logs")
+    parser.add_argument('paths', nargs='+', help="log files, directories or glob patterns")
+    parser.add_argument('--source', choices=SOURCES, help="log source (guessed from the path if omitted)")
+    parser.add_argument('--workers', type=int, default=None, help="parser processes (default: CPU count)")
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT, help="checkpoint file for resuming")
+    parser.add_argument('--chunk-lines', type=int, default=BACKFILL_CHUNK_LINES,
+                        help="lines committed per chunk")
+    parser.add_argument('--strict', action='store_true', help="validate every record with pydantic")
+    parser.add_argument('--database-url', default=None,
+                        help="defaults to SQLALCHEMY_DATABASE_URL from the environment/.env")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    from system.config import settings
+
+    stats = run_backfill(
+        args.paths, args.source, args.database_url or settings.SQLALCHEMY_DATABASE_URL,
+        checkpoint_path=args.checkpoint, workers=args.workers,
+        chunk_lines=args.chunk_lines, strict=args.strict
+    )
+    logger.info(f"Backfill finished: {stats.report()}")
+    if stats.files_failed:
+        logger.error(f"{stats.files_failed} file(s) failed, run again to resume them")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nBackfill interrupted, run again with the same checkpoint to resume")
+        sys.exit(130)
@@ -0,0 +1,160 @@
+"""Requests/sec of GET /threats with blocking vs async database sessions.
+
+Usage:
+    python benchmarks/bench_async_db.py [--clients 500] [--requests 20000] [--database-url URL]
+
+Serves two versions of the threat list endpoint from one app:
+
+* /legacy/threats: the previous handler shape, an ``async def`` making
+  blocking ``Session.query`` calls on the event loop;
+* /threats: the router from system/routers/threat_management.py on an
+  ``AsyncSession``.
+
+``--clients`` concurrent clients hammer each endpoint in turn through
+httpx's ASGI transport, so the numbers reflect how well the event loop
+overlaps requests rather than socket overhead. Without --database-url a
+throwaway SQLite file (aiosqlite driver) is used. Point it at a scratch
+PostgreSQL database (asyncpg driver) to measure a networked database, where
+blocking calls hurt most.
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from system.database import Base, async_database_url, get_async_db
+from system.models import AnomalyDetection, Threat
+from system.routers import threat_management
+from system.schemas_consolidated import ThreatListResponse, ThreatResponse
+
+
+def seed(database_url: str, threats: int, anomalies: int):
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    now = datetime.datetime.utcnow()
+    with Session(engine) as db:
+        db.add_all(
+            Threat(id=str(uuid.uuid4()), threat_type="intrusion", title=f"Threat {i}",
+                   description="Synthetic threat", severity="high", status="active",
+                   timestamp=now, source_ip=f"10.0.0.{i % 254 + 1}", target_system="web-01")
+            for i in range(threats)
+        )
+        db.add_all(
+            AnomalyDetection(timestamp=now, detection_type="network", confidence_score=90)
+            for _ in range(anomalies)
+        )
+        db.commit()
+    engine.dispose()
+
+
+def build_app(database_url: str) -> FastAPI:
+    # The blocking handler runs on the event loop thread, its cleanup in a worker thread
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    sync_session = sessionmaker(bind=create_engine(database_url, connect_args=connect_args))
+    async_session = sessionmaker(create_async_engine(async_database_url(database_url)),
+                                 class_=AsyncSession, expire_on_commit=False)
+
+    def get_sync_db():
+        db = sync_session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_bench_async_db():
+        async with async_session() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(threat_management.router)
+    app.dependency_overrides[get_async_db] = get_bench_async_db
+
+    @app.get("/legacy/threats", response_model=ThreatListResponse)
+    async def legacy_threats(db: Session = Depends(get_sync_db)):
+        recent = db.query(AnomalyDetection).filter(
+            AnomalyDetection.timestamp >= datetime.datetime.utcnow() - datetime.timedelta(hours=24)
+        ).all()
+        threats = db.query(Threat).filter(Threat.status == 'active').all()
+        return ThreatListResponse(
+            threats=[ThreatResponse(
+                id=t.id, threat_type=t.threat_type, title=t.title, description=t.description,
+                severity=t.severity, status=t.status, timestamp=t.timestamp,
+                source_ip=t.source_ip, target_system=t.target_system
+            ) for t in threats],
+            threat_level="high" if len(recent) > 10 else "low",
+            anomaly_count=len(recent)
+        )
+
+    return app
+
+
+async def hammer(app: FastAPI, path: str, clients: int, total: int):
+    latencies = []
+    errors = 0
+    remaining = total
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60.0) as client:
+        async def worker():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--threats", type=int, default=50)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        seed(database_url, args.threats, anomalies=20)
+
+        app = build_app(database_url)
+        print(f"{args.clients} clients, {args.requests} requests per endpoint")
+        print(f"{'endpoint':>16}{'req/s':>10}{'p50 (ms)':>11}{'p99 (ms)':>11}{'errors':>8}")
+        for name, path in (("blocking", "/legacy/threats"), ("async", "/threats")):
+            result = asyncio.run(hammer(app, path, args.clients, args.requests))
+            print(f"{name:>16}{result['rps']:>10,.0f}{result['p50_ms']:>11.1f}"
+                  f"{result['p99_ms']:>11.1f}{result['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
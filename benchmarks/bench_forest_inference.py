@@ -0,0 +1,64 @@
+"""Latency of scikit-learn vs flattened Isolation Forest scoring.
+
+Usage:
+    python benchmarks/bench_forest_inference.py [--estimators 100] [--repeat 50]
+
+Reports the median latency per call at batch sizes 1, 100 and 10k and the
+largest absolute difference between the two backends' score_samples output.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+from sklearn.ensemble import IsolationForest
+
+from system.forest_inference import FlatIsolationForest
+
+BATCH_SIZES = [1, 100, 10000]
+TOLERANCE = 1e-9
+
+
+def median_latency(fn, X, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(X)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--estimators", type=int, default=100)
+    parser.add_argument("--features", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    training = rng.normal(size=(20000, args.features))
+    model = IsolationForest(n_estimators=args.estimators, contamination=0.1, random_state=42)
+    model.fit(training)
+    flat = FlatIsolationForest.from_sklearn(model)
+
+    print(f"{'batch':>8}{'sklearn (ms)':>15}{'flat (ms)':>12}{'speedup':>10}{'max |diff|':>14}")
+    for batch_size in BATCH_SIZES:
+        X = rng.normal(size=(batch_size, args.features))
+        repeat = max(3, args.repeat // max(1, batch_size // 1000))
+
+        diff = float(np.max(np.abs(model.score_samples(X) - flat.score_samples(X))))
+        sklearn_time = median_latency(model.score_samples, X, repeat)
+        flat_time = median_latency(flat.score_samples, X, repeat)
+
+        print(f"{batch_size:>8}{sklearn_time * 1000:>15.3f}{flat_time * 1000:>12.3f}"
+              f"{sklearn_time / flat_time:>9.1f}x{diff:>14.2e}")
+        if diff > TOLERANCE:
+            raise SystemExit(f"Flat scores diverge from scikit-learn by {diff}")
+
+
+if __name__ == "__main__":
+    main()
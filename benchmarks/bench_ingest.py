@@ -0,0 +1,110 @@
+"""Compare single-record and batched ingestion throughput.
+
+Usage:
+    python benchmarks/bench_ingest.py [--events 20000] [--database-url URL]
+
+Without --database-url a throwaway SQLite file is used (executemany path);
+point it at a scratch PostgreSQL database to measure the COPY path.
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from system.database import Base
+from system.models import SecurityLog
+from system.schemas_consolidated import LogData
+from system.ingest import log_data_to_row, bulk_insert_security_logs
+
+
+def make_events(count: int):
+    """Build synthetic Zeek connection events."""
+    now = datetime.datetime.utcnow()
+    return [
+        LogData(
+            timestamp=now - datetime.timedelta(seconds=i),
+            source="zeek",
+            event_type="conn",
+            data={
+                "source_ip": f"10.0.{random.randint(0, 255)}.{random.randint(1, 254)}",
+                "dest_ip": f"192.168.1.{random.randint(1, 254)}",
+                "orig_bytes": random.randint(0, 100000),
+                "resp_bytes": random.randint(0, 100000),
+                "conn_state": random.choice(["SF", "S0", "REJ"])
+            }
+        )
+        for i in range(count)
+    ]
+
+
+def bench_single(session_factory, events):
+    """One add + commit per event, as done by POST /ingest."""
+    db = session_factory()
+    try:
+        start = time.perf_counter()
+        for event in events:
+            db.add(SecurityLog(**log_data_to_row(event)))
+            db.commit()
+        return time.perf_counter() - start
+    finally:
+        db.close()
+
+
+def bench_batch(session_factory, events):
+    """Validated rows written through bulk_insert_security_logs."""
+    db = session_factory()
+    try:
+        start = time.perf_counter()
+        rows = [log_data_to_row(event) for event in events]
+        bulk_insert_security_logs(db, rows)
+        return time.perf_counter() - start
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--single-events", type=int, default=2000,
+                        help="events for the (slow) single-record path")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    tmp_dir = None
+    url = args.database_url
+    if url is None:
+        tmp_dir = tempfile.mkdtemp()
+        url = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+
+    single_events = make_events(args.single_events)
+    batch_events = make_events(args.events)
+
+    single_time = bench_single(session_factory, single_events)
+    batch_time = bench_batch(session_factory, batch_events)
+
+    single_rate = len(single_events) / single_time
+    batch_rate = len(batch_events) / batch_time
+
+    print(f"database: {engine.dialect.name}")
+    print(f"single-record: {len(single_events):>8} events in {single_time:8.3f}s -> {single_rate:12.0f} events/sec")
+    print(f"batch:         {len(batch_events):>8} events in {batch_time:8.3f}s -> {batch_rate:12.0f} events/sec")
+    print(f"speedup:       {batch_rate / single_rate:.1f}x")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
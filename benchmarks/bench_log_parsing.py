@@ -0,0 +1,102 @@
+"""Records/sec of strict (pydantic) vs fast log parsing.
+
+Usage:
+    python benchmarks/bench_log_parsing.py [--records 100000]
+
+Parses synthetic NDJSON lines for every source with
+``LogParser.parse_batch`` in both modes and checks that the timestamps the
+two modes produce agree.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from system.log_parsers import LogParser
+
+
+def make_lines(source: str, count: int):
+    """Build synthetic NDJSON lines, timestamps at second resolution."""
+    start = datetime(2024, 1, 1)
+    lines = []
+    for i in range(count):
+        ts = start + timedelta(seconds=i // 50)
+        if source == "zeek":
+            record = {
+                "timestamp": ts.timestamp(),
+                "uid": f"C{i:08x}",
+                "source_ip": f"10.0.{random.randint(0, 255)}.{random.randint(1, 254)}",
+                "source_port": random.randint(1024, 65535),
+                "dest_ip": f"192.168.1.{random.randint(1, 254)}",
+                "dest_port": random.choice([22, 53, 80, 443]),
+                "protocol": "tcp",
+                "duration": random.random(),
+                "orig_bytes": random.randint(0, 100000),
+                "resp_bytes": random.randint(0, 100000),
+                "conn_state": random.choice(["SF", "S0", "REJ"]),
+                "service": None, "local_orig": True, "local_resp": False,
+                "missed_bytes": 0, "history": "ShADadFf", "orig_pkts": 6,
+                "orig_ip_bytes": 400, "resp_pkts": 4, "resp_ip_bytes": 300
+            }
+        elif source == "suricata":
+            record = {
+                "timestamp": ts.strftime("%Y-%m-%dT%H:%M:%S.%f") + "+0000",
+                "event_type": "alert",
+                "src_ip": f"10.0.{random.randint(0, 255)}.{random.randint(1, 254)}",
+                "src_port": random.randint(1024, 65535),
+                "dest_ip": f"192.168.1.{random.randint(1, 254)}",
+                "dest_port": 443,
+                "proto": "TCP",
+                "flow_id": random.randint(0, 2 ** 40),
+                "alert": {"signature": "ET SCAN", "signature_id": 2001219, "severity": 2},
+                "flow": {"start": ts.strftime("%Y-%m-%dT%H:%M:%S.%f") + "+0000", "pkts_toserver": 3}
+            }
+        else:
+            record = {
+                "name": "process_events",
+                "action": "added",
+                "hostIdentifier": "host-1",
+                "calendarTime": ts.strftime("%Y-%m-%dT%H:%M:%S"),
+                "unixTime": int(ts.timestamp()),
+                "columns": {"pid": str(i), "path": "/usr/bin/ssh"},
+                "counter": 0,
+                "decorations": None
+            }
+        lines.append(json.dumps(record))
+    return lines
+
+
+def records_per_second(source: str, lines, strict: bool):
+    start = time.perf_counter()
+    records, errors = LogParser.parse_batch(source, lines, strict=strict)
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise SystemExit(f"{source} ({'strict' if strict else 'fast'}): {len(errors)} errors, first: {errors[0]}")
+    return records, len(lines) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'source':>10}{'strict (rec/s)':>17}{'fast (rec/s)':>15}{'speedup':>10}")
+    for source in ("zeek", "suricata", "osquery"):
+        lines = make_lines(source, args.records)
+        strict_records, strict_rate = records_per_second(source, lines, strict=True)
+        fast_records, fast_rate = records_per_second(source, lines, strict=False)
+
+        for strict_record, fast_record in zip(strict_records, fast_records):
+            if strict_record.timestamp != fast_record.timestamp:
+                raise SystemExit(f"{source}: timestamps differ between modes")
+
+        print(f"{source:>10}{strict_rate:>17,.0f}{fast_rate:>15,.0f}{fast_rate / strict_rate:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
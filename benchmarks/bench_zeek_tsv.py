@@ -0,0 +1,130 @@
+"""Native Zeek TSV reading vs converting conn.log to JSON first.
+
+Usage:
+    python benchmarks/bench_zeek_tsv.py [--records 200000] [--gzip]
+
+Writes a synthetic conn.log in Zeek's tab-separated format and loads it
+three ways:
+
+* json-first: each row converted to a JSON object with Zeek's field names
+  (what ``LogAscii::use_json`` or a conversion script produces), then
+  decoded, renamed and validated with ``LogParser.parse_zeek``;
+* records: ``read_zeek_records`` straight into ZeekRecord tuples;
+* columns: ``read_zeek_columns`` straight into feature extraction arrays.
+
+Zeek features computed from every path must agree.
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from system.feature_extraction import FeatureExtractor
+from system.log_parsers import LogParser, ZeekRecord
+from system.zeek_reader import ZEEK_CONN_FIELD_MAP, iter_zeek_rows, read_zeek_columns, read_zeek_records
+
+FIELDS = ['ts', 'uid', 'id.orig_h', 'id.orig_p', 'id.resp_h', 'id.resp_p', 'proto', 'service',
+          'duration', 'orig_bytes', 'resp_bytes', 'conn_state', 'local_orig', 'local_resp',
+          'missed_bytes', 'history', 'orig_pkts', 'orig_ip_bytes', 'resp_pkts', 'resp_ip_bytes',
+          'tunnel_parents']
+TYPES = ['time', 'string', 'addr', 'port', 'addr', 'port', 'enum', 'string', 'interval', 'count',
+         'count', 'string', 'bool', 'bool', 'count', 'string', 'count', 'count', 'count', 'count',
+         'set[string]']
+
+
+def write_conn_log(path: str, count: int, compress: bool):
+    start = time.time() - 120
+    opener = gzip.open if compress else open
+    with opener(path, 'wt') as f:
+        f.write('#separator \\x09\n#set_separator\t,\n#empty_field\t(empty)\n#unset_field\t-\n')
+        f.write('#path\tconn\n#fields\t' + '\t'.join(FIELDS) + '\n#types\t' + '\t'.join(TYPES) + '\n')
+        for i in range(count):
+            unset = random.random() < 0.2
+            f.write('\t'.join([
+                f"{start + i * 100.0 / count:.6f}", f"C{i:016x}",
+                f"10.0.{random.randint(0, 63)}.{random.randint(1, 254)}", str(random.randint(1024, 65535)),
+                f"192.168.{random.randint(0, 3)}.{random.randint(1, 254)}", random.choice(['22', '53', '80', '443']),
+                'tcp', '-' if unset else 'http',
+                '-' if unset else f"{random.random():.6f}",
+                '-' if unset else str(random.randint(0, 100000)),
+                '-' if unset else str(random.randint(0, 100000)),
+                random.choice(['SF', 'S0', 'REJ', 'RSTO']), random.choice(['T', 'F']), 'F', '0', 'ShADadFf',
+                str(random.randint(1, 50)), str(random.randint(40, 5000)),
+                str(random.randint(0, 50)), str(random.randint(0, 5000)), '(empty)'
+            ]) + '\n')
+
+
+def json_first(path: str):
+    """Convert every row to JSON, then parse it like an /ingest payload."""
+    lines = []
+    header, converters = None, []
+    for row_header, values in iter_zeek_rows(path):
+        if row_header is not header:
+            header = row_header
+            converters = [float if zeek_type == 'time' else header.converter(zeek_type)
+                          for zeek_type in header.types]
+        lines.append(json.dumps({
+            name: None if value == header.unset_field else convert(value)
+            for name, convert, value in zip(header.fields, converters, values)
+        }))
+
+    records = []
+    for line in lines:
+        content = json.loads(line)
+        renamed = {ZEEK_CONN_FIELD_MAP[name]: value for name, value in content.items() if name in ZEEK_CONN_FIELD_MAP}
+        records.append(LogParser.parse_zeek(renamed))
+    return records
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def to_logs(records):
+    return [{k: (0 if v is None else v) for k, v in record._asdict().items()} for record in records]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--gzip", action="store_true", help="gzip the generated log")
+    args = parser.parse_args()
+
+    extractor = FeatureExtractor()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'conn.log.gz' if args.gzip else 'conn.log')
+        write_conn_log(path, args.records, args.gzip)
+
+        json_records, json_time = timed(lambda: json_first(path))
+        records, records_time = timed(lambda: list(read_zeek_records([path])))
+        columns, columns_time = timed(lambda: read_zeek_columns([path]))
+
+    print(f"{'path':>12}{'seconds':>10}{'records/sec':>14}")
+    for name, elapsed in (('json-first', json_time), ('records', records_time), ('columns', columns_time)):
+        print(f"{name:>12}{elapsed:>10.3f}{args.records / elapsed:>14,.0f}")
+
+    expected = extractor.extract_zeek_features([
+        {name: (0 if getattr(record, name) is None else getattr(record, name)) for name in ZeekRecord._fields}
+        for record in json_records
+    ])
+    for name, features in (
+        ('records', extractor.extract_zeek_features(to_logs(records))),
+        ('columns', extractor.extract_zeek_features_columnar(columns))
+    ):
+        if not np.allclose(features, expected):
+            raise SystemExit(f"{name} features differ from json-first: {features} != {expected}")
+
+
+if __name__ == "__main__":
+    main()
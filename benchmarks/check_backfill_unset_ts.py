@@ -0,0 +1,63 @@
+"""Check that backfill rejects Zeek TSV rows with an unset ``ts``.
+
+Usage:
+    SQLALCHEMY_DATABASE_URL=sqlite:////tmp/scratch.db python benchmarks/check_backfill_unset_ts.py
+
+Runs against a scratch database (the tables are created if missing). Writes
+a small conn.log whose third row has ``ts`` set to ``-`` and loads it with
+``backfill.load_file`` in fast and strict mode. Either way that row must be
+counted as rejected and the other rows inserted, rather than the NULL
+timestamp failing the insert of the whole chunk. Exits with status 1 on any
+failure.
+"""
+import os
+import queue
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import backfill
+import system.models  # noqa: F401  (registers the tables)
+from bench_zeek_tsv import write_conn_log
+from system.config import settings
+from system.database import Base, engine
+
+RECORDS = 10
+
+
+def check(name: str, ok: bool, detail: str = "") -> int:
+    print(f"{'ok' if ok else 'FAIL':>4}  {name}{f': {detail}' if detail and not ok else ''}")
+    return 0 if ok else 1
+
+
+def unset_third_ts(path: str):
+    with open(path) as f:
+        lines = f.readlines()
+    data = [i for i, line in enumerate(lines) if not line.startswith('#')]
+    lines[data[2]] = '-' + lines[data[2]][lines[data[2]].index('\t'):]
+    with open(path, 'w') as f:
+        f.writelines(lines)
+
+
+def main():
+    Base.metadata.create_all(engine)
+    backfill._init_worker(settings.SQLALCHEMY_DATABASE_URL, queue.SimpleQueue())
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for strict in (False, True):
+            # Row ids derive from the path, so each mode gets its own file
+            path = os.path.join(tmp, f"conn.{'strict' if strict else 'fast'}.log")
+            write_conn_log(path, RECORDS, compress=False)
+            unset_third_ts(path)
+            totals = backfill.load_file(path, 'zeek', 0, 1000, strict)
+            mode = 'strict' if strict else 'fast'
+            failures += check(f"{mode}: unset ts rejected", totals['rejected'] == 1, str(totals))
+            failures += check(f"{mode}: other rows inserted", totals['accepted'] == RECORDS - 1, str(totals))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Check the import time of the API entry point against a budget.
+
+Usage:
+    python benchmarks/check_import_time.py [--module system.main] [--budget-ms 1500] [--repeat 5]
+
+Imports ``--module`` in ``--repeat`` fresh interpreters and keeps the fastest
+run, so a cold page cache on the first run is not counted. The script exits
+with status 1 if that run exceeds ``--budget-ms``. It also fails if any of
+the heavy ML/LLM/HTTP packages in ``HEAVY_MODULES`` were imported. Those
+packages are imported lazily by log_analysis, anomaly_detection,
+model_registry and response_actions. The slowest imports are then listed
+from a ``python -X importtime`` run, as a starting point for finding
+regressions.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Imported on first use only; none of them may load with the entry point
+HEAVY_MODULES = ("torch", "transformers", "openai", "sklearn", "joblib", "aiohttp")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    result = subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"Importing failed:\n{result.stderr}")
+    return result
+
+
+def measure(module: str):
+    """Seconds to import ``module`` and the heavy packages it pulled in."""
+    result = run_python("-c", PROBE.format(module=module, heavy=HEAVY_MODULES))
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    return probe["seconds"], probe["heavy"]
+
+
+def slowest_imports(module: str, count: int):
+    """(self ms, cumulative ms, name) of the ``count`` slowest imports by self time."""
+    result = run_python("-X", "importtime", "-c", f"import {module}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us) / 1000, int(cumulative_us) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="system.main")
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.repeat)]
+    seconds = min(elapsed for elapsed, _ in runs)
+    heavy = sorted({name for _, names in runs for name in names})
+
+    over_budget = seconds * 1000 > args.budget_ms
+    print(f"{'FAIL' if over_budget else 'ok':>4}  import {args.module}: {seconds * 1000:.0f} ms "
+          f"(budget {args.budget_ms:.0f} ms, best of {args.repeat})")
+    print(f"{'FAIL' if heavy else 'ok':>4}  heavy modules imported: {', '.join(heavy) or 'none'}")
+
+    print(f"\nSlowest {args.top} imports (self / cumulative ms):")
+    for self_ms, cumulative_ms, name in slowest_imports(args.module, args.top):
+        print(f"  {self_ms:8.1f} {cumulative_ms:9.1f}  {name}")
+
+    if over_budget or heavy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
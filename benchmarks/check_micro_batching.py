@@ -0,0 +1,79 @@
+"""Check that one malformed feature vector fails only its own scoring request.
+
+Usage:
+    python benchmarks/check_micro_batching.py
+
+Trains a small model in a temporary directory and submits valid vectors to
+a MicroBatcher concurrently with a NaN vector, an infinite one, a vector of
+the wrong width and one of strings. The malformed ones must be rejected
+with ValueError and the valid ones scored. A row of strings slipped past
+validation into a batch must fail alone, with the rest of its batch
+scored one by one. Exits with status 1 on any failure.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from system.anomaly_detection import AnomalyDetector
+from system.micro_batching import MicroBatcher
+
+N_FEATURES = 7
+
+
+def check(name: str, ok: bool, detail: str = "") -> int:
+    print(f"{'ok' if ok else 'FAIL':>4}  {name}{f': {detail}' if detail and not ok else ''}")
+    return 0 if ok else 1
+
+
+async def run(detector: AnomalyDetector) -> int:
+    failures = 0
+    rng = np.random.default_rng(0)
+    batcher = MicroBatcher(detector, max_batch_size=64, max_latency_ms=20)
+    await batcher.start()
+    try:
+        valid = [list(row) for row in rng.normal(size=(8, N_FEATURES))]
+        malformed = {
+            "NaN": [float("nan")] * N_FEATURES,
+            "inf": [float("inf")] + [0.0] * (N_FEATURES - 1),
+            "wrong width": [0.0] * (N_FEATURES + 1),
+            "strings": ["x"] * N_FEATURES
+        }
+        results = await asyncio.gather(
+            *(batcher.submit(features) for features in valid + list(malformed.values())),
+            return_exceptions=True
+        )
+        failures += check("valid vectors scored next to malformed ones",
+                          all(isinstance(result, dict) for result in results[:len(valid)]),
+                          str(results[:len(valid)]))
+        for name, result in zip(malformed, results[len(valid):]):
+            failures += check(f"{name} vector rejected with ValueError", isinstance(result, ValueError), repr(result))
+
+        # A row that bypassed validation: its batch falls back to row by row
+        loop = asyncio.get_running_loop()
+        bad = loop.create_future()
+        batcher._queue.put_nowait((np.array(["x"] * N_FEATURES, dtype=object), bad))
+        results = await asyncio.gather(*(batcher.submit(features) for features in valid), return_exceptions=True)
+        failures += check("batch with an unvalidated row still scores the others",
+                          all(isinstance(result, dict) for result in results), str(results))
+        failures += check("only the unvalidated row fails", bad.done() and bad.exception() is not None)
+    finally:
+        await batcher.stop()
+    return failures
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        detector = AnomalyDetector(model_path=os.path.join(tmp, "model.joblib"))
+        detector.train(np.random.default_rng(1).normal(size=(500, N_FEATURES)))
+        if asyncio.run(run(detector)):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
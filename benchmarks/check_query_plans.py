@@ -0,0 +1,149 @@
+"""Check that the hot read endpoints' queries don't fall back to sequential scans.
+
+Usage:
+    python benchmarks/check_query_plans.py --database-url postgresql://.../scratch [--rows 10000000]
+
+Seeds a scratch PostgreSQL database with ``--rows`` security_logs and
+anomaly_detections rows spread over ``--days`` days, plus ``--threats``
+threats of which 1% are active. The rows are generated server side with
+generate_series. After ANALYZE, the script prints the EXPLAIN plan of each
+query issued by /threats and /logs, and of the windowed counts that seed
+the /stats/network counters at startup. It exits with status 1 if any plan
+sequentially scans a relation with at least ``--min-rows`` rows. Small
+relations such as empty future partitions are ignored, since a sequential
+scan is the right plan for them.
+
+Pass --skip-seed to re-check plans against an already seeded database,
+e.g. after changing indexes.
+"""
+import argparse
+import datetime
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, select, text
+
+from system.database import Base
+from system.models import AnomalyDetection, SecurityLog, Threat
+from system.pagination import DEFAULT_PAGE_SIZE, encode_cursor, keyset_page
+from system.network_stats import ANOMALY_BUCKET_SECONDS, LAST_HOUR_BUCKET_SECONDS, bucket_count_query
+
+
+def seed(conn, rows: int, threats: int, days: int):
+    params = {"rows": rows, "threats": threats, "span": f"{days} days"}
+    conn.execute(text("""
+        INSERT INTO threats (id, threat_type, title, severity, status, "timestamp")
+        SELECT 'threat-' || i, 'intrusion', 'Threat ' || i, 'high',
+               CASE WHEN i % 100 = 0 THEN 'active' ELSE 'resolved' END,
+               (now() AT TIME ZONE 'utc') - random() * CAST(:span AS interval)
+        FROM generate_series(1, :threats) AS i
+    """), params)
+    conn.execute(text("""
+        INSERT INTO security_logs (id, "timestamp", log_type, source, message)
+        SELECT md5(i::text), (now() AT TIME ZONE 'utc') - random() * CAST(:span AS interval),
+               'conn', 'zeek', 'synthetic connection'
+        FROM generate_series(1, :rows) AS i
+    """), params)
+    conn.execute(text("""
+        INSERT INTO anomaly_detections (id, "timestamp", detection_type, confidence_score)
+        SELECT md5(i::text), (now() AT TIME ZONE 'utc') - random() * CAST(:span AS interval),
+               'network', (random() * 100)::int
+        FROM generate_series(1, :rows) AS i
+    """), params)
+
+
+def hot_queries():
+    """The statements issued by the hot read endpoints and the stats seeding."""
+    now = datetime.datetime.utcnow()
+    return {
+        "/threats first page": keyset_page(
+            select(Threat.id, Threat.title, Threat.severity, Threat.timestamp).filter(
+                Threat.status == 'active', Threat.timestamp.isnot(None)
+            ), Threat.timestamp, Threat.id, None, DEFAULT_PAGE_SIZE
+        ),
+        "/logs first page": keyset_page(
+            select(SecurityLog.id, SecurityLog.timestamp, SecurityLog.message),
+            SecurityLog.timestamp, SecurityLog.id, None, DEFAULT_PAGE_SIZE
+        ),
+        "/logs page 60 days deep": keyset_page(
+            select(SecurityLog.id, SecurityLog.timestamp, SecurityLog.message),
+            SecurityLog.timestamp, SecurityLog.id,
+            encode_cursor(now - datetime.timedelta(days=60), "ffffffff"), DEFAULT_PAGE_SIZE
+        ),
+        "stats seed: connections per minute, last hour": bucket_count_query(
+            SecurityLog.timestamp, now - datetime.timedelta(hours=1), LAST_HOUR_BUCKET_SECONDS
+        ),
+        "stats seed: anomalies per 5 minutes, last 24h": bucket_count_query(
+            AnomalyDetection.timestamp, now - datetime.timedelta(hours=24), ANOMALY_BUCKET_SECONDS
+        ),
+    }
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(conn, statement):
+    compiled = statement.compile(dialect=conn.dialect)
+    result = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    return result[0]["Plan"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", required=True, help="scratch PostgreSQL database")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--threats", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--min-rows", type=int, default=10_000,
+                        help="ignore sequential scans of relations smaller than this")
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    if engine.dialect.name != "postgresql":
+        parser.error("EXPLAIN plans are only checked on PostgreSQL")
+
+    with engine.begin() as conn:
+        Base.metadata.create_all(bind=conn)
+        if not args.skip_seed:
+            start = time.perf_counter()
+            seed(conn, args.rows, args.threats, args.days)
+            print(f"Seeded {args.rows:,} logs/anomalies and {args.threats:,} threats "
+                  f"in {time.perf_counter() - start:.1f}s")
+
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        reltuples = {name: rows for name, rows in conn.execute(
+            text("SELECT relname, reltuples FROM pg_class WHERE relkind IN ('r', 'p')")
+        )}
+
+        failures = 0
+        for name, statement in hot_queries().items():
+            plan = explain(conn, statement)
+            scans = [
+                (node["Node Type"], node.get("Relation Name"), node.get("Index Name"))
+                for node in plan_nodes(plan) if "Relation Name" in node
+            ]
+            seq_scans = [
+                relation for node_type, relation, _ in scans
+                if node_type == "Seq Scan" and reltuples.get(relation, 0) >= args.min_rows
+            ]
+            print(f"{'FAIL' if seq_scans else 'ok':>4}  {name}  (cost {plan['Total Cost']:,.0f})")
+            for node_type, relation, index in scans:
+                print(f"        {node_type} on {relation}" + (f" using {index}" if index else ""))
+            failures += bool(seq_scans)
+
+    engine.dispose()
+    if failures:
+        print(f"{failures} hot queries use sequential scans")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
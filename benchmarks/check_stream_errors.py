@@ -0,0 +1,73 @@
+"""Check the status codes /ingest/stream returns for bad uploads.
+
+Usage:
+    SQLALCHEMY_DATABASE_URL=sqlite:////tmp/scratch.db python benchmarks/check_stream_errors.py
+
+Runs against a scratch database (the tables are created if missing). An
+unsupported ``Content-Encoding`` must get 415. Corrupt gzip, truncated gzip
+and (when ``zstandard`` is installed) corrupt zstd bodies must get 400,
+while valid gzip and zstd uploads return 200. Exits with status 1 on any
+failure.
+"""
+import datetime
+import gzip
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from fastapi.testclient import TestClient
+
+import system.models  # noqa: F401  (registers the tables)
+from system.database import Base, engine
+from system.main import app
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def check(name: str, ok: bool, detail: str = "") -> int:
+    print(f"{'ok' if ok else 'FAIL':>4}  {name}{f': {detail}' if detail and not ok else ''}")
+    return 0 if ok else 1
+
+
+def body(lines: int = 50) -> bytes:
+    now = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f+0000")
+    return "".join(json.dumps({
+        "timestamp": now, "event_type": "alert", "src_ip": "10.0.0.1", "src_port": 4444,
+        "dest_ip": "10.0.0.2", "dest_port": 80, "proto": "TCP", "severity": 2, "signature": "ET TEST"
+    }) + "\n" for _ in range(lines)).encode()
+
+
+def main():
+    Base.metadata.create_all(engine)
+    # No `with` block: the startup tasks (queue, spool, seeding) are not needed here
+    client = TestClient(app)
+    compressed = gzip.compress(body())
+    uploads = [
+        ("gzip body", "gzip", compressed, 200),
+        ("unsupported encoding", "br", compressed, 415),
+        ("corrupt gzip body", "gzip", b"\x1f\x8b\x08\x00" + b"\xff" * 64, 400),
+        ("truncated gzip body", "gzip", compressed[:len(compressed) // 2], 400),
+    ]
+    if zstandard is not None:
+        uploads += [
+            ("zstd body", "zstd", zstandard.ZstdCompressor().compress(body()), 200),
+            ("corrupt zstd body", "zstd", b"\x28\xb5\x2f\xfd" + b"\xff" * 64, 400),
+        ]
+
+    failures = 0
+    for name, encoding, content, expected in uploads:
+        response = client.post("/ingest/stream?source=suricata", content=content,
+                               headers={"Content-Type": "application/x-ndjson", "Content-Encoding": encoding})
+        failures += check(f"{name}: {expected}", response.status_code == expected,
+                          f"{response.status_code} {response.text}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Check that the sliding-window feature states match extract_*_features.
+
+Usage:
+    python benchmarks/check_window_features.py [--events 20000] [--ticks 200]
+
+Replays ``--events`` synthetic Zeek, Suricata and OSQuery events over a
+two-hour span through a WindowedFeatureAggregator. The span includes a
+gap longer than the window. At ``--ticks`` points in time, the current
+feature vector is compared with the dict-based extractor over every event
+added so far. Events up to a minute past the tick are already added when
+it is read, so events later than ``now`` must be ignored the same way. The
+empty window in the gap must give the all-zero vector. Exits with status 1
+on any mismatch.
+"""
+import argparse
+import datetime
+import random
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from bench_feature_extraction import make_osquery, make_suricata, make_zeek
+from system.feature_extraction import FeatureExtractor, WindowedFeatureAggregator
+
+WINDOW_MINUTES = 5
+SPAN = datetime.timedelta(hours=2)
+# No events in this part of the span, so some windows are empty
+GAP = (datetime.timedelta(minutes=50), datetime.timedelta(minutes=70))
+LOOKAHEAD = datetime.timedelta(minutes=1)
+
+
+def spread(logs, start: datetime.datetime):
+    """Give the events sorted timestamps across SPAN, outside GAP."""
+    offsets = []
+    while len(offsets) < len(logs):
+        offset = datetime.timedelta(seconds=random.uniform(0, SPAN.total_seconds()))
+        if not GAP[0] <= offset < GAP[1]:
+            offsets.append(offset)
+    for log, offset in zip(logs, sorted(offsets)):
+        log['timestamp'] = start + offset
+    return logs
+
+
+def check(source: str, logs, extract, ticks: int) -> int:
+    aggregator = WindowedFeatureAggregator(WINDOW_MINUTES)
+    start = logs[0]['timestamp']
+    tick_times = sorted(start + datetime.timedelta(seconds=random.uniform(0, SPAN.total_seconds()))
+                        for _ in range(ticks))
+    tick_times.append(start + (GAP[0] + GAP[1]) / 2)  # inside the gap
+    tick_times.sort()
+
+    mismatches = 0
+    added = 0
+    for now in tick_times:
+        while added < len(logs) and logs[added]['timestamp'] <= now + LOOKAHEAD:
+            aggregator.add(source, logs[added])
+            added += 1
+        expected = extract(logs[:added], WINDOW_MINUTES, end_time=now)
+        actual = aggregator.features(source, now)
+        if len(actual) != len(expected) or not np.allclose(expected, actual, equal_nan=True):
+            mismatches += 1
+            if mismatches <= 3:
+                print(f"  {source} at {now}: expected {expected}, got {actual}")
+    print(f"{'FAIL' if mismatches else 'ok':>4}  {source}: {len(tick_times)} ticks, {mismatches} mismatches")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    extractor = FeatureExtractor()
+    start = datetime.datetime(2024, 3, 14)
+    cases = [
+        ('zeek', make_zeek, extractor.extract_zeek_features),
+        ('suricata', make_suricata, extractor.extract_suricata_features),
+        ('osquery', make_osquery, extractor.extract_osquery_features),
+    ]
+    failures = 0
+    for source, make_logs, extract in cases:
+        logs = spread(make_logs(args.events, start), start)
+        failures += check(source, logs, extract, args.ticks) > 0
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Partition security_logs and anomaly_detections by day
+
+Only applied on PostgreSQL with PARTITIONING_ENABLED; otherwise the
+tables are left as they are. See system/partitioning.py for the layout
+and the maintenance job that keeps partitions ahead of time.
+
+Revision ID: d4e8a1b7c9f2
+Revises: c1f47f0cfca7
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from system.config import settings
+from system.partitioning import partition_tables, unpartition_tables
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e8a1b7c9f2'
+down_revision: Union[str, None] = 'c1f47f0cfca7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Rebuild the time-series tables as daily range-partitioned tables."""
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql" or not settings.PARTITIONING_ENABLED:
+        return
+
+    partition_tables(conn, premake_days=settings.PARTITION_PREMAKE_DAYS,
+                     retention_days=settings.PARTITION_RETENTION_DAYS)
+
+
+def downgrade() -> None:
+    """Fold the partitions back into plain tables."""
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        return
+
+    unpartition_tables(conn)
@@ -0,0 +1,43 @@
+"""Indexes for the hot read endpoints
+
+Composite and partial indexes matched to the /threats, /logs and
+/stats/network queries. IF NOT EXISTS keeps the timestamp indexes that
+d4e8a1b7c9f2 already created on partitioned tables.
+
+Revision ID: e7b2c5d9a3f1
+Revises: d4e8a1b7c9f2
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b2c5d9a3f1'
+down_revision: Union[str, None] = 'd4e8a1b7c9f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    # get_threats: status = 'active'
+    "ix_threats_status_timestamp": 'threats (status, "timestamp")',
+    "ix_threats_active_timestamp": "threats (\"timestamp\") WHERE status = 'active'",
+    # get_threats / get_network_stats: timestamp >= now - 24h
+    "ix_anomaly_detections_timestamp": 'anomaly_detections ("timestamp")',
+    # get_logs: ORDER BY timestamp DESC LIMIT 100
+    "ix_security_logs_timestamp": 'security_logs ("timestamp")',
+}
+
+
+def upgrade() -> None:
+    """Create the hot path indexes."""
+    for name, definition in INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade() -> None:
+    """Drop the hot path indexes."""
+    for name in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,47 @@
+"""Keyset pagination indexes
+
+/logs and /threats page on (timestamp, id), newest first. Extending the
+timestamp indexes with id lets every page be read straight off the index;
+the narrower indexes they replace become redundant.
+
+Revision ID: f3a9c6e1d2b8
+Revises: e7b2c5d9a3f1
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c6e1d2b8'
+down_revision: Union[str, None] = 'e7b2c5d9a3f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# new index: (definition, index it replaces, definition of the replaced index)
+INDEXES = {
+    "ix_security_logs_timestamp_id": (
+        'security_logs ("timestamp", id)',
+        "ix_security_logs_timestamp", 'security_logs ("timestamp")'
+    ),
+    "ix_threats_status_timestamp_id": (
+        'threats (status, "timestamp", id)',
+        "ix_threats_status_timestamp", 'threats (status, "timestamp")'
+    ),
+}
+
+
+def upgrade() -> None:
+    """Create the (timestamp, id) indexes and drop their prefixes."""
+    for name, (definition, replaced, _) in INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+        op.execute(f"DROP INDEX IF EXISTS {replaced}")
+
+
+def downgrade() -> None:
+    """Restore the narrower indexes."""
+    for name, (_, replaced, replaced_definition) in INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {replaced} ON {replaced_definition}")
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -1,72 +1,278 @@
+# scikit-learn and joblib are imported where they are used, so processes
+# that never load or train a model (ingest workers) don't pay for them
 import numpy as np
-from sklearn.ensemble import IsolationForest
-import joblib
 import logging
 from typing import List, Dict, Any, Optional
 import os
+import time
+from datetime import datetime
+
+from .config import settings
+from .forest_inference import FlatIsolationForest
+from .model_registry import ModelRegistry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+INFERENCE_BACKENDS = ("sklearn", "flat")
+
+# Seconds between checks of the registry's CURRENT pointer for a new version
+MODEL_RELOAD_CHECK_SECONDS = 5.0
+
+class LoadedModel:
+    """A trained (or fresh) model together with everything needed to score with it.
+
+    AnomalyDetector swaps whole LoadedModel instances, so a scoring call never
+    mixes the estimator of one version with the calibration of another.
+    """
+
+    def __init__(self, model: Any, score_min: Optional[float] = None, score_max: Optional[float] = None,
+                 flat_model: Optional[FlatIsolationForest] = None, version: Optional[str] = None,
+                 metadata: Optional[Dict[str, Any]] = None):
+        self.model = model
+        self.score_min = score_min
+        self.score_max = score_max
+        self.flat_model = flat_model
+        self.version = version
+        self.metadata = metadata or {}
+
+    @property
+    def is_trained(self) -> bool:
+        return self.model is not None and hasattr(self.model, "estimators_")
+
 class AnomalyDetector:
-    def __init__(self, model_path: Optional[str] = None):
+    def __init__(self, model_path: Optional[str] = None, backend: Optional[str] = None,
+                 registry: Optional[ModelRegistry] = None):
+        # An explicit model_path keeps the single-file layout; otherwise models
+        # are versioned in the registry
         self.model_path = model_path or "models/isolation_forest.joblib"
-        self.model = None
+        self.registry = registry if registry is not None else (None if model_path else ModelRegistry())
+        self.backend = backend or settings.ANOMALY_INFERENCE_BACKEND
+        if self.backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Unsupported inference backend: {self.backend}")
+        self._state = LoadedModel(None)
+        self._last_reload_check = time.monotonic()
         self.initialize_model()
 
+    # The active model state; replaced as a whole on training and hot swaps
+    @property
+    def model(self):
+        return self._state.model
+
+    @property
+    def flat_model(self) -> Optional[FlatIsolationForest]:
+        return self._state.flat_model
+
+    @property
+    def score_min(self) -> Optional[float]:
+        return self._state.score_min
+
+    @property
+    def score_max(self) -> Optional[float]:
+        return self._state.score_max
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._state.version
+
+    @property
+    def is_trained(self) -> bool:
+        return self._state.is_trained
+
+    def _new_model(self):
+        from sklearn.ensemble import IsolationForest
+        return IsolationForest(
+            n_estimators=100,
+            contamination=0.1,
+            random_state=42,
+            n_jobs=-1
+        )
+
+    def _state_from_artifact(self, artifact: Any, version: Optional[str] = None,
+                             metadata: Optional[Dict[str, Any]] = None) -> LoadedModel:
+        if not isinstance(artifact, dict):
+            # Legacy artifact: bare estimator without calibration
+            artifact = {"model": artifact}
+
+        flat_model = None
+        if self.backend == "flat":
+            flat_model = artifact.get("flat_model")
+            if flat_model is None and hasattr(artifact["model"], "estimators_"):
+                flat_model = FlatIsolationForest.from_sklearn(artifact["model"])
+                logger.info("Compiled Isolation Forest into flat inference arrays")
+
+        return LoadedModel(
+            artifact["model"],
+            score_min=artifact.get("score_min"),
+            score_max=artifact.get("score_max"),
+            flat_model=flat_model,
+            version=version,
+            metadata=metadata
+        )
+
     def initialize_model(self):
         """Initialize or load the Isolation Forest model."""
         try:
-            if os.path.exists(self.model_path):
+            version = self.registry.current_version() if self.registry else None
+            if version is not None:
+                logger.info(f"Loading model version {version} from {self.registry.root}")
+                artifact, metadata = self.registry.load(version)
+                self._state = self._state_from_artifact(artifact, version, metadata)
+            elif os.path.exists(self.model_path):
                 logger.info(f"Loading existing model from {self.model_path}")
-                self.model = joblib.load(self.model_path)
+                import joblib
+                self._state = self._state_from_artifact(joblib.load(self.model_path))
             else:
                 logger.info("Creating new Isolation Forest model")
-                self.model = IsolationForest(
-                    n_estimators=100,
-                    contamination=0.1,
-                    random_state=42,
-                    n_jobs=-1
-                )
+                self._state = LoadedModel(self._new_model())
         except Exception as e:
             logger.error(f"Error initializing model: {str(e)}")
             raise
 
-    def train(self, features: np.ndarray):
-        """Train the Isolation Forest model."""
+    def reload_if_changed(self, force: bool = False) -> bool:
+        """Hot-swap to the registry's current version if it has changed.
+
+        The pointer is only re-read every MODEL_RELOAD_CHECK_SECONDS unless
+        ``force`` is set. Returns True when a new version was loaded.
+        """
+        if self.registry is None:
+            return False
+        now = time.monotonic()
+        if not force and now - self._last_reload_check < MODEL_RELOAD_CHECK_SECONDS:
+            return False
+        self._last_reload_check = now
+
+        version = self.registry.current_version()
+        if version is None or version == self._state.version:
+            return False
+        artifact, metadata = self.registry.load(version)
+        self._state = self._state_from_artifact(artifact, version, metadata)
+        logger.info(f"Hot-swapped anomaly model to version {version}")
+        return True
+
+    def activate(self, version: str):
+        """Make a stored version current and switch to it immediately."""
+        if self.registry is None:
+            raise ValueError("Model registry is not enabled for this detector")
+        self.registry.activate(version)
+        self.reload_if_changed(force=True)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Model metadata in the shape of the ModelMetrics schema."""
+        state = self._state
+        model = state.model
+        return {
+            "threshold": float(getattr(model, "offset_", 0.0)),
+            "contamination": model.contamination if isinstance(model.contamination, float) else 0.0,
+            "n_estimators": model.n_estimators,
+            "feature_importances": None,
+            "last_training_date": state.metadata.get("last_training_date"),
+            "total_samples_trained": state.metadata.get("total_samples_trained"),
+            "version": state.version,
+            "score_min": state.score_min,
+            "score_max": state.score_max
+        }
+
+    def score_samples(self, features: np.ndarray, state: Optional[LoadedModel] = None) -> np.ndarray:
+        """Raw Isolation Forest scores from the configured backend."""
+        state = state or self._state
+        if state.flat_model is not None:
+            return state.flat_model.score_samples(features)
+        return state.model.score_samples(features)
+
+    def train(self, features: np.ndarray, metadata: Optional[Dict[str, Any]] = None):
+        """Train a new Isolation Forest model and make it the active one.
+
+        A fresh estimator is fitted, so scoring keeps using the previous model
+        until the new one is saved and swapped in.
+        """
         try:
             logger.info("Training Isolation Forest model")
-            self.model.fit(features)
-            
-            # Save the trained model
-            os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-            joblib.dump(self.model, self.model_path)
-            logger.info(f"Model saved to {self.model_path}")
+            model = self._new_model()
+            model.fit(features)
+
+            # Calibrate score normalization on the training distribution
+            training_scores = model.score_samples(features)
+            artifact = {
+                "model": model,
+                "score_min": float(training_scores.min()),
+                "score_max": float(training_scores.max()),
+                "flat_model": FlatIsolationForest.from_sklearn(model)
+            }
+            metadata = dict(
+                metadata or {},
+                threshold=float(model.offset_),
+                contamination=model.contamination if isinstance(model.contamination, float) else 0.0,
+                n_estimators=model.n_estimators,
+                n_features=int(model.n_features_in_),
+                score_min=artifact["score_min"],
+                score_max=artifact["score_max"],
+                last_training_date=datetime.utcnow().isoformat(),
+                total_samples_trained=int(len(features))
+            )
+
+            version = None
+            if self.registry is not None:
+                version = self.registry.save(artifact, metadata)
+                self.registry.prune(settings.MODEL_REGISTRY_KEEP)
+                logger.info(f"Model saved as version {version}")
+            else:
+                # Write next to the target and rename so readers never see a partial file
+                os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
+                tmp_path = f"{self.model_path}.{os.getpid()}.tmp"
+                import joblib
+                joblib.dump(artifact, tmp_path)
+                os.replace(tmp_path, self.model_path)
+                logger.info(f"Model saved to {self.model_path}")
+
+            self._state = self._state_from_artifact(artifact, version, metadata)
         except Exception as e:
             logger.error(f"Error training model: {str(e)}")
             raise
 
+    def normalize_scores(self, scores: np.ndarray, state: Optional[LoadedModel] = None) -> np.ndarray:
+        """Map raw scores to anomaly scores in [0, 1], higher is more anomalous.
+
+        Uses the score range calibrated at training time. Models trained
+        before calibration existed fall back to ``-score``, which is the
+        original Isolation Forest anomaly score and already lies in [0, 1].
+        """
+        state = state or self._state
+        if state.score_min is not None and state.score_max is not None and state.score_max > state.score_min:
+            normalized = 1 - (scores - state.score_min) / (state.score_max - state.score_min)
+        else:
+            normalized = -scores
+        return np.clip(normalized, 0.0, 1.0)
+
+    def score_batch(self, features: np.ndarray) -> Dict[str, np.ndarray]:
+        """Score a matrix of feature vectors with a single score_samples call.
+
+        Predictions are derived from the model's ``offset_`` exactly like
+        ``IsolationForest.predict`` does, without scoring the rows again.
+        """
+        self.reload_if_changed()
+        state = self._state
+
+        features_array = np.asarray(features, dtype=np.float64)
+        if features_array.ndim == 1:
+            features_array = features_array.reshape(1, -1)
+
+        scores = self.score_samples(features_array, state)
+        return {
+            "is_anomaly": scores < state.model.offset_,
+            "anomaly_score": self.normalize_scores(scores, state),
+            "raw_score": scores
+        }
+
     def detect(self, features: List[float]) -> Dict[str, Any]:
         """Detect anomalies in the input features."""
         try:
-            # Reshape features for single sample prediction
-            features_array = np.array(features).reshape(1, -1)
-            
-            # Get anomaly score (-1 for anomalies, 1 for normal samples)
-            score = self.model.score_samples(features_array)[0]
-            
-            # Get prediction (-1 for anomalies, 1 for normal samples)
-            is_anomaly = self.model.predict(features_array)[0] == -1
-            
-            # Convert score to a normalized anomaly score between 0 and 1
-            normalized_score = 1 - (score - self.model.score_samples(features_array).min()) / \
-                (self.model.score_samples(features_array).max() - self.model.score_samples(features_array).min())
-            
+            result = self.score_batch(np.array(features).reshape(1, -1))
             return {
-                "is_anomaly": bool(is_anomaly),
-                "anomaly_score": float(normalized_score),
-                "raw_score": float(score)
+                "is_anomaly": bool(result["is_anomaly"][0]),
+                "anomaly_score": float(result["anomaly_score"][0]),
+                "raw_score": float(result["raw_score"][0])
             }
         except Exception as e:
             logger.error(f"Error detecting anomalies: {str(e)}")
@@ -75,22 +281,27 @@ class AnomalyDetector:
     def bulk_detect(self, features_list: List[List[float]]) -> List[Dict[str, Any]]:
         """Detect anomalies in multiple samples."""
         try:
-            features_array = np.array(features_list)
-            scores = self.model.score_samples(features_array)
-            predictions = self.model.predict(features_array)
-            
-            # Normalize scores
-            normalized_scores = 1 - (scores - scores.min()) / (scores.max() - scores.min())
-            
-            results = []
-            for i in range(len(features_list)):
-                results.append({
-                    "is_anomaly": bool(predictions[i] == -1),
-                    "anomaly_score": float(normalized_scores[i]),
-                    "raw_score": float(scores[i])
-                })
-            
-            return results
+            result = self.score_batch(np.array(features_list))
+            return [
+                {
+                    "is_anomaly": bool(is_anomaly),
+                    "anomaly_score": float(anomaly_score),
+                    "raw_score": float(raw_score)
+                }
+                for is_anomaly, anomaly_score, raw_score in zip(
+                    result["is_anomaly"], result["anomaly_score"], result["raw_score"]
+                )
+            ]
         except Exception as e:
             logger.error(f"Error in bulk anomaly detection: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+
+_detector: Optional[AnomalyDetector] = None
+
+def get_detector() -> AnomalyDetector:
+    """Shared AnomalyDetector instance, loaded on first use."""
+    global _detector
+    if _detector is None:
+        _detector = AnomalyDetector()
+    return _detector
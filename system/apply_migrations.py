@@ -1,16 +1,22 @@
-import os
-import shutil
+import logging
+from typing import Any, Dict, Optional
+
 from alembic import command
 from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
 from pathlib import Path
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.pool import NullPool
 from .database import SQLALCHEMY_DATABASE_URL
 
+logger = logging.getLogger(__name__)
+
 MIGRATION_RESET_MARKER = Path(__file__).parent / ".migration_reset_completed"
 
 def reset_migration_state():
-    """Reset database schema properly before applying migrations."""
-    print("Starting reset_migration_state...")
+    """Drop and recreate the public schema. Destroys all data; only run on request."""
+    logger.warning("Dropping schema public and every table in it...")
     
     # Create engine with AUTOCOMMIT
     engine = create_engine(
@@ -36,33 +42,64 @@ def reset_migration_state():
     finally:
         engine.dispose()
 
-    print("Schema reset complete")
+    MIGRATION_RESET_MARKER.touch()
+    logger.warning("Schema reset complete")
 
-def apply_migrations():
-    """Apply all migrations after reset."""
-    print("Starting migrations...")
-    
-    # First reset the state
-    reset_migration_state()
-    
-    config_dir = Path(__file__).parent.resolve()
-    alembic_cfg = Config(str(config_dir / "alembic.ini"))
-    
-    # Create engine for migrations
-    engine = create_engine(
-        SQLALCHEMY_DATABASE_URL,
-        future=True,
-        poolclass=None  # Disable connection pooling during migrations
-    )
-    
+def alembic_config() -> Config:
+    return Config(str(Path(__file__).parent.resolve() / "alembic.ini"))
+
+def current_revision(connection) -> Optional[str]:
+    """Revision stamped in alembic_version, None for an unversioned database."""
+    return MigrationContext.configure(connection).get_current_revision()
+
+def head_revision(config: Config) -> str:
+    return ScriptDirectory.from_config(config).get_current_head()
+
+def migration_status() -> Dict[str, Any]:
+    """Current and head revisions without changing anything."""
+    config = alembic_config()
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, future=True, poolclass=NullPool)
+    try:
+        with engine.connect() as connection:
+            current = current_revision(connection)
+    finally:
+        engine.dispose()
+    head = head_revision(config)
+    return {"current": current, "head": head, "up_to_date": current == head}
+
+def apply_migrations(reset: bool = False) -> Dict[str, Any]:
+    """Upgrade the database to the Alembic head if it is behind.
+
+    An up-to-date database is left untouched, so this is cheap on every boot.
+    The schema is only dropped first when ``reset`` is passed explicitly.
+    Returns the revision found, the head and the action taken.
+    """
+    if reset:
+        reset_migration_state()
+
+    config = alembic_config()
+    head = head_revision(config)
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, future=True, poolclass=NullPool)
     try:
         with engine.begin() as connection:
-            alembic_cfg.attributes["connection"] = connection
-            # Stamp first, then upgrade
-            command.stamp(alembic_cfg, "base")
-            command.upgrade(alembic_cfg, "head")
+            current = current_revision(connection)
+            if current == head:
+                logger.info(f"Database schema is at head revision {head}")
+                return {"current": current, "head": head, "action": "none"}
+
+            config.attributes["connection"] = connection
+            if current is None and inspect(connection).has_table("threats"):
+                # Tables were created by init_db (create_all) from the current
+                # models; replaying the migrations would fail on them
+                logger.warning(f"Unversioned schema found, stamping it at head revision {head}")
+                command.stamp(config, "head")
+                action = "stamp"
+            else:
+                logger.info(f"Upgrading database schema from {current or 'empty'} to {head}...")
+                command.upgrade(config, "head")
+                action = "upgrade"
     finally:
         engine.dispose()
 
-    MIGRATION_RESET_MARKER.touch()
-    print("Migrations complete")
+    logger.info("Migrations complete")
+    return {"current": current, "head": head, "action": action}
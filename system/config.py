@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -14,6 +15,76 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = "development"
     FRONTEND_URL: str = "http://localhost:5173"
 
+    # Shared database engines and connection pools
+    DB_ECHO: bool = False  # log every SQL statement
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 300
+    DB_POOL_PRE_PING: bool = True
+    DB_CONNECT_TIMEOUT: int = 30
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # 0 disables the server-side limit
+
+    # Schema migrations and demo data at startup
+    DB_MIGRATE_ON_STARTUP: bool = True  # upgrade to the Alembic head when behind
+    DB_RESET_ON_STARTUP: bool = False  # drop schema public first; destroys all data
+    DEMO_DATA_ON_STARTUP: bool = True  # development only, into an empty database
+
+    # Daily range partitions of security_logs / anomaly_detections (PostgreSQL)
+    PARTITIONING_ENABLED: bool = False
+    PARTITION_PREMAKE_DAYS: int = 7
+    PARTITION_RETENTION_DAYS: int = 90  # 0 keeps every partition
+    PARTITION_RETENTION_ACTION: str = "drop"  # "drop" or "archive"
+    PARTITION_ARCHIVE_SCHEMA: str = "archive"
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 3600.0
+
+    # In-memory counters behind /stats/network
+    NETWORK_STATS_STATE_PATH: str = "data/network_stats.hll"
+    NETWORK_STATS_RESEED_SECONDS: float = 300.0  # 0 loads them once, at startup
+
+    # Cache of the GET endpoints polled by the dashboard
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: float = 2.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+
+    # Server-sent event feed of new logs, anomalies and threats
+    EVENT_FEED_CLIENT_BUFFER: int = 1000  # queued events before a client is dropped
+    EVENT_FEED_MAX_CLIENTS: int = 1000
+    EVENT_FEED_KEEPALIVE_SECONDS: float = 15.0
+
+    # Online anomaly scoring micro-batches
+    DETECT_BATCH_MAX_ROWS: int = 256
+    DETECT_BATCH_MAX_LATENCY_MS: float = 5.0
+
+    # Sliding feature windows over ingested logs, scored by /detect/live
+    LIVE_FEATURES_ENABLED: bool = True
+    LIVE_FEATURES_WINDOW_MINUTES: int = 5
+
+    # "sklearn" or "flat" (vectorized walk over the exported forest)
+    ANOMALY_INFERENCE_BACKEND: str = "sklearn"
+
+    # Versioned model artifacts
+    MODEL_REGISTRY_DIR: str = "models/registry"
+    MODEL_REGISTRY_KEEP: int = 5
+
+    # Queued /ingest writes
+    INGEST_QUEUE_MAX_SIZE: int = 10000
+    INGEST_BATCH_SIZE: int = 500
+    INGEST_FLUSH_INTERVAL_MS: float = 50.0
+    INGEST_WRITERS: int = 1
+    INGEST_RETRY_AFTER_SECONDS: int = 1
+
+    # Write-ahead spool between /ingest and the database
+    INGEST_SPOOL_ENABLED: bool = True
+    INGEST_SPOOL_DIR: str = "data/ingest_spool"
+    INGEST_SPOOL_SEGMENT_MAX_BYTES: int = 64 * 1024 * 1024
+    INGEST_SPOOL_DRAIN_BATCH_SIZE: int = 5000
+
+    # Background model training
+    TRAINING_CHUNK_SIZE: int = 10000
+    TRAINING_MAX_SAMPLES: int = 100000
+    TRAINING_WORKERS: Optional[int] = None  # defaults to the CPU count
+
     class Config:
         env_file = ".env"  # Ensure the .env file is loaded
         extra = 'allow'  # Allow extra fields
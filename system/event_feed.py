@@ -0,0 +1,170 @@
+"""In-memory fan-out of newly written logs, anomalies and threats.
+
+``GET /events`` streams these to the dashboard as server-sent events, so
+clients no longer poll ``/logs`` and ``/threats`` for new rows. Write paths
+call ``publish`` after committing, from the event loop or from worker
+threads. Each subscriber has its own filter and a bounded buffer. A
+subscriber that falls more than ``EVENT_FEED_CLIENT_BUFFER`` events behind
+is dropped: it gets a final ``dropped`` event and can reconnect and catch
+up through ``/logs``. The feed is per process and keeps no history.
+"""
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from .config import settings
+from .serialization import encode_json
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = ("log", "anomaly", "threat")
+
+
+def log_event(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Feed payload of a security_logs row, shaped like a /logs entry."""
+    return {
+        "id": row["id"],
+        "timestamp": row["timestamp"],
+        "log_type": row["log_type"],
+        "source": row.get("source"),
+        "message": row["message"],
+        "threat_id": row.get("threat_id")
+    }
+
+
+def anomaly_event(anomaly) -> Dict[str, Any]:
+    """Feed payload of an AnomalyDetection."""
+    return {
+        "id": anomaly.id,
+        "timestamp": anomaly.timestamp,
+        "detection_type": anomaly.detection_type,
+        "confidence_score": anomaly.confidence_score,
+        "description": anomaly.description,
+        "impact_severity": anomaly.impact_severity
+    }
+
+
+class EventFilter:
+    """Per-subscriber filter; unset criteria match everything."""
+
+    def __init__(self, types: Optional[Iterable[str]] = None, source: Optional[str] = None,
+                 event_type: Optional[str] = None, severity: Optional[Iterable[str]] = None):
+        self.types = frozenset(types) if types else frozenset(EVENT_TYPES)
+        unknown = self.types - set(EVENT_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown event types: {', '.join(sorted(unknown))}")
+        self.source = source
+        self.event_type = event_type
+        self.severity = frozenset(severity) if severity else None
+
+    def matches(self, kind: str, payload: Dict[str, Any]) -> bool:
+        if kind not in self.types:
+            return False
+        if kind == "log":
+            return ((self.source is None or payload.get("source") == self.source) and
+                    (self.event_type is None or payload.get("log_type") == self.event_type))
+        severity = payload.get("severity" if kind == "threat" else "impact_severity")
+        return self.severity is None or severity in self.severity
+
+
+class Subscriber:
+    def __init__(self, event_filter: EventFilter, buffer_size: int):
+        self.filter = event_filter
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.dropped = False
+
+
+class EventHub:
+    """Fan newly written rows out to the connected subscribers."""
+
+    def __init__(self, buffer_size: int = 1000, max_clients: int = 1000):
+        self.buffer_size = buffer_size
+        self.max_clients = max_clients
+        self._subscribers: Set[Subscriber] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.published = 0
+        self.delivered = 0
+        self.dropped_clients = 0
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, event_filter: EventFilter) -> Subscriber:
+        """Register a subscriber; must be called on the event loop."""
+        if len(self._subscribers) >= self.max_clients:
+            raise OverflowError("Too many event feed subscribers")
+        self._loop = asyncio.get_running_loop()
+        subscriber = Subscriber(event_filter, self.buffer_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+
+    def publish(self, kind: str, payloads: List[Dict[str, Any]]):
+        """Queue ``payloads`` for every matching subscriber; callable from any thread."""
+        if not self._subscribers or not payloads:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._fan_out(kind, payloads)
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._fan_out, kind, payloads)
+
+    def _fan_out(self, kind: str, payloads: List[Dict[str, Any]]):
+        self.published += len(payloads)
+        for subscriber in list(self._subscribers):
+            for payload in payloads:
+                if not subscriber.filter.matches(kind, payload):
+                    continue
+                try:
+                    subscriber.queue.put_nowait((kind, payload))
+                except asyncio.QueueFull:
+                    # Slow consumer: stop feeding it rather than buffering without bound
+                    subscriber.dropped = True
+                    self._subscribers.discard(subscriber)
+                    self.dropped_clients += 1
+                    logger.warning("Dropped a slow event feed subscriber")
+                    break
+                self.delivered += 1
+
+    async def stream(self, subscriber: Subscriber, keepalive: float = 15.0) -> AsyncIterator[bytes]:
+        """Server-sent events for ``subscriber`` until it disconnects or is dropped."""
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                if subscriber.dropped and subscriber.queue.empty():
+                    yield b'event: dropped\ndata: {"reason": "buffer full"}\n\n'
+                    return
+                try:
+                    kind, payload = await asyncio.wait_for(subscriber.queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield b"event: " + kind.encode() + b"\ndata: " + encode_json(payload) + b"\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "clients": len(self._subscribers),
+            "buffer_size": self.buffer_size,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped_clients": self.dropped_clients
+        }
+
+
+_event_hub: Optional[EventHub] = None
+
+def get_event_hub() -> EventHub:
+    """Shared EventHub configured from settings."""
+    global _event_hub
+    if _event_hub is None:
+        _event_hub = EventHub(buffer_size=settings.EVENT_FEED_CLIENT_BUFFER,
+                              max_clients=settings.EVENT_FEED_MAX_CLIENTS)
+    return _event_hub
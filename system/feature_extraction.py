@@ -1,8 +1,93 @@
-from typing import List, Dict, Any
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional, Union
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import ipaddress
-from collections import defaultdict
+from collections import defaultdict, deque
+
+# Zeek connection states counted as errors
+ZEEK_ERROR_STATES = frozenset(['S0', 'REJ', 'RSTO', 'RSTOS0', 'RSTRH', 'SH', 'SHR'])
+
+# OSQuery event categories, in feature order
+OSQUERY_CATEGORIES = ['process', 'file', 'network', 'user', 'system']
+
+# Feature vector layouts per log source
+ZEEK_FEATURES = [
+    'bytes_per_second',
+    'packets_per_second',
+    'unique_ips',
+    'connection_duration',
+    'bytes_ratio',
+    'local_network_ratio',
+    'error_ratio'
+]
+
+SURICATA_FEATURES = [
+    'alert_severity_avg',
+    'unique_signatures',
+    'event_frequency',
+    'high_severity_ratio',
+    'source_ip_diversity',
+    'protocol_entropy'
+]
+
+OSQUERY_FEATURES = [
+    'process_events_frequency',
+    'file_events_frequency',
+    'network_events_frequency',
+    'user_events_frequency',
+    'system_events_frequency'
+]
+
+Columns = Dict[str, np.ndarray]
+
+def _factorize(values: List[Any], index: Optional[Dict[Any, int]] = None) -> np.ndarray:
+    """Dictionary-encode hashable values into dense integer codes.
+
+    Passing the same ``index`` for several columns gives them a shared code
+    space, so e.g. source and destination IPs can be counted together.
+    """
+    index = {} if index is None else index
+    return np.fromiter(
+        (index.setdefault(value, len(index)) for value in values),
+        dtype=np.int64,
+        count=len(values)
+    )
+
+def _distinct_count(codes: np.ndarray) -> int:
+    """Count distinct values of a factorized column."""
+    if not codes.size:
+        return 0
+    return int(np.count_nonzero(np.bincount(codes)))
+
+def _epoch_seconds(logs: List[Dict[str, Any]]) -> np.ndarray:
+    """Convert log timestamps to float epoch seconds.
+
+    Naive datetimes go through the same ``datetime.timestamp`` conversion as
+    the window bounds in _window_mask, so the comparison matches the
+    datetime-based filter of the dict extractors. This is several times
+    faster than building a ``datetime64`` array from Python objects.
+    """
+    return np.fromiter((log['timestamp'].timestamp() for log in logs), dtype=np.float64, count=len(logs))
+
+def _naive_utc(timestamp: datetime) -> datetime:
+    """Timezone-aware datetimes as naive UTC, the convention of datetime.utcnow."""
+    if timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+def _osquery_category(name: str) -> int:
+    """Map an OSQuery query name onto its OSQUERY_CATEGORIES index."""
+    name = name.lower()
+    if 'process' in name:
+        return 0
+    elif 'file' in name:
+        return 1
+    elif 'network' in name:
+        return 2
+    elif 'user' in name:
+        return 3
+    return 4
 
 class FeatureExtractor:
     def __init__(self):
@@ -11,32 +96,9 @@ class FeatureExtractor:
 
     def _initialize_features(self):
         """Initialize feature names for different log types."""
-        self.zeek_features = [
-            'bytes_per_second',
-            'packets_per_second',
-            'unique_ips',
-            'connection_duration',
-            'bytes_ratio',
-            'local_network_ratio',
-            'error_ratio'
-        ]
-        
-        self.suricata_features = [
-            'alert_severity_avg',
-            'unique_signatures',
-            'event_frequency',
-            'high_severity_ratio',
-            'source_ip_diversity',
-            'protocol_entropy'
-        ]
-        
-        self.osquery_features = [
-            'process_events_frequency',
-            'file_events_frequency',
-            'network_events_frequency',
-            'user_events_frequency',
-            'system_events_frequency'
-        ]
+        self.zeek_features = list(ZEEK_FEATURES)
+        self.suricata_features = list(SURICATA_FEATURES)
+        self.osquery_features = list(OSQUERY_FEATURES)
 
     def _calculate_entropy(self, values: List[Any]) -> float:
         """Calculate Shannon entropy for a list of values."""
@@ -56,13 +118,14 @@ class FeatureExtractor:
         
         return entropy
 
-    def extract_zeek_features(self, logs: List[Dict[str, Any]], window_minutes: int = 5) -> List[float]:
+    def extract_zeek_features(self, logs: List[Dict[str, Any]], window_minutes: int = 5,
+                              end_time: Optional[datetime] = None) -> List[float]:
         """Extract features from Zeek logs within a time window."""
         if not logs:
             return [0.0] * len(self.zeek_features)
 
         # Group logs by time window
-        end_time = datetime.utcnow()
+        end_time = end_time or datetime.utcnow()
         start_time = end_time - timedelta(minutes=window_minutes)
         window_logs = [log for log in logs if start_time <= log['timestamp'] <= end_time]
 
@@ -83,8 +146,7 @@ class FeatureExtractor:
         local_connections = sum(1 for log in window_logs if log.get('local_orig', False))
         local_ratio = local_connections / len(window_logs)
 
-        error_states = ['S0', 'REJ', 'RSTO', 'RSTOS0', 'RSTRH', 'SH', 'SHR']
-        error_ratio = sum(1 for log in window_logs if log.get('conn_state', '') in error_states) / len(window_logs)
+        error_ratio = sum(1 for log in window_logs if log.get('conn_state', '') in ZEEK_ERROR_STATES) / len(window_logs)
 
         return [
             total_bytes / (window_minutes * 60),  # bytes per second
@@ -96,12 +158,13 @@ class FeatureExtractor:
             error_ratio
         ]
 
-    def extract_suricata_features(self, logs: List[Dict[str, Any]], window_minutes: int = 5) -> List[float]:
+    def extract_suricata_features(self, logs: List[Dict[str, Any]], window_minutes: int = 5,
+                                  end_time: Optional[datetime] = None) -> List[float]:
         """Extract features from Suricata logs within a time window."""
         if not logs:
             return [0.0] * len(self.suricata_features)
 
-        end_time = datetime.utcnow()
+        end_time = end_time or datetime.utcnow()
         start_time = end_time - timedelta(minutes=window_minutes)
         window_logs = [log for log in logs if start_time <= log['timestamp'] <= end_time]
 
@@ -133,12 +196,13 @@ class FeatureExtractor:
             protocol_entropy
         ]
 
-    def extract_osquery_features(self, logs: List[Dict[str, Any]], window_minutes: int = 5) -> List[float]:
+    def extract_osquery_features(self, logs: List[Dict[str, Any]], window_minutes: int = 5,
+                                 end_time: Optional[datetime] = None) -> List[float]:
         """Extract features from OSQuery logs within a time window."""
         if not logs:
             return [0.0] * len(self.osquery_features)
 
-        end_time = datetime.utcnow()
+        end_time = end_time or datetime.utcnow()
         start_time = end_time - timedelta(minutes=window_minutes)
         window_logs = [log for log in logs if start_time <= log['timestamp'] <= end_time]
 
@@ -169,8 +233,162 @@ class FeatureExtractor:
             event_counts['system'] / total_time
         ]
 
-    def extract_features(self, source: str, logs: List[Dict[str, Any]], window_minutes: int = 5) -> List[float]:
-        """Extract features based on the log source."""
+    # Columnar mode: each field is turned into a NumPy array once per batch and
+    # every feature is computed with vectorized operations. Results match the
+    # dict-based extractors above. Building the columns from dicts costs about
+    # as much as one dict-based call, so this only pays off on columns that
+    # are built once and reused, shipped to other processes (training windows
+    # pickle far cheaper as arrays than as dicts), or read straight from Zeek
+    # TSV logs (zeek_reader.read_zeek_columns); extract_features stays on the
+    # dict path.
+
+    def zeek_columns(self, logs: List[Dict[str, Any]]) -> Columns:
+        """Build the column arrays used by extract_zeek_features_columnar."""
+        n = len(logs)
+        ip_index: Dict[Any, int] = {}
+        return {
+            'timestamp': _epoch_seconds(logs),
+            'orig_bytes': np.fromiter((log.get('orig_bytes', 0) for log in logs), dtype=np.int64, count=n),
+            'resp_bytes': np.fromiter((log.get('resp_bytes', 0) for log in logs), dtype=np.int64, count=n),
+            'orig_pkts': np.fromiter((log.get('orig_pkts', 0) for log in logs), dtype=np.int64, count=n),
+            'resp_pkts': np.fromiter((log.get('resp_pkts', 0) for log in logs), dtype=np.int64, count=n),
+            'duration': np.fromiter((log.get('duration', 0) for log in logs), dtype=np.float64, count=n),
+            'local_orig': np.fromiter((bool(log.get('local_orig', False)) for log in logs), dtype=bool, count=n),
+            'error_state': np.fromiter(
+                (log.get('conn_state', '') in ZEEK_ERROR_STATES for log in logs), dtype=bool, count=n
+            ),
+            'source_ip': _factorize([log['source_ip'] for log in logs], ip_index),
+            'dest_ip': _factorize([log['dest_ip'] for log in logs], ip_index)
+        }
+
+    def suricata_columns(self, logs: List[Dict[str, Any]]) -> Columns:
+        """Build the column arrays used by extract_suricata_features_columnar."""
+        n = len(logs)
+        return {
+            'timestamp': _epoch_seconds(logs),
+            'severity': np.fromiter(
+                (np.nan if log.get('severity') is None else log['severity'] for log in logs),
+                dtype=np.float64, count=n
+            ),
+            'signature': _factorize([log.get('signature', '') for log in logs]),
+            'src_ip': _factorize([log['src_ip'] for log in logs]),
+            'proto': _factorize([log['proto'] for log in logs])
+        }
+
+    def osquery_columns(self, logs: List[Dict[str, Any]]) -> Columns:
+        """Build the column arrays used by extract_osquery_features_columnar."""
+        return {
+            'timestamp': _epoch_seconds(logs),
+            'category': np.fromiter(
+                (_osquery_category(log['name']) for log in logs), dtype=np.int64, count=len(logs)
+            )
+        }
+
+    def _window_mask(self, timestamps: np.ndarray, window_minutes: int,
+                     end_time: Optional[datetime] = None) -> np.ndarray:
+        """Boolean mask of the rows that fall inside the time window."""
+        end_time = end_time or datetime.utcnow()
+        start_time = (end_time - timedelta(minutes=window_minutes)).timestamp()
+        return (timestamps >= start_time) & (timestamps <= end_time.timestamp())
+
+    def extract_zeek_features_columnar(self, logs: Union[List[Dict[str, Any]], Columns],
+                                       window_minutes: int = 5,
+                                       end_time: Optional[datetime] = None) -> List[float]:
+        """Vectorized equivalent of extract_zeek_features.
+
+        Accepts either raw log dicts or the output of zeek_columns, so columns
+        can be built once and reused across several calls.
+        """
+        columns = logs if isinstance(logs, dict) else self.zeek_columns(logs)
+        if not len(columns['timestamp']):
+            return [0.0] * len(self.zeek_features)
+
+        mask = self._window_mask(columns['timestamp'], window_minutes, end_time)
+        count = int(np.count_nonzero(mask))
+        if not count:
+            return [0.0] * len(self.zeek_features)
+
+        orig_bytes = columns['orig_bytes'][mask]
+        resp_bytes = columns['resp_bytes'][mask]
+        total_bytes = int(orig_bytes.sum()) + int(resp_bytes.sum())
+        total_packets = int(columns['orig_pkts'][mask].sum()) + int(columns['resp_pkts'][mask].sum())
+        unique_ips = _distinct_count(np.concatenate([columns['source_ip'][mask], columns['dest_ip'][mask]]))
+        avg_duration = columns['duration'][mask].mean()
+
+        has_response = resp_bytes > 0
+        bytes_ratio = np.mean(orig_bytes[has_response] / resp_bytes[has_response])
+
+        local_ratio = np.count_nonzero(columns['local_orig'][mask]) / count
+        error_ratio = np.count_nonzero(columns['error_state'][mask]) / count
+
+        return [
+            total_bytes / (window_minutes * 60),  # bytes per second
+            total_packets / (window_minutes * 60),  # packets per second
+            unique_ips,
+            float(avg_duration),
+            float(bytes_ratio),
+            local_ratio,
+            error_ratio
+        ]
+
+    def extract_suricata_features_columnar(self, logs: Union[List[Dict[str, Any]], Columns],
+                                           window_minutes: int = 5,
+                                           end_time: Optional[datetime] = None) -> List[float]:
+        """Vectorized equivalent of extract_suricata_features."""
+        columns = logs if isinstance(logs, dict) else self.suricata_columns(logs)
+        if not len(columns['timestamp']):
+            return [0.0] * len(self.suricata_features)
+
+        mask = self._window_mask(columns['timestamp'], window_minutes, end_time)
+        count = int(np.count_nonzero(mask))
+        if not count:
+            return [0.0] * len(self.suricata_features)
+
+        severity = columns['severity'][mask]
+        severity = severity[~np.isnan(severity)]
+        avg_severity = float(severity.mean()) if severity.size else 0
+
+        unique_sigs = _distinct_count(columns['signature'][mask])
+        event_freq = count / (window_minutes * 60)
+        high_sev_ratio = np.count_nonzero(severity >= 3) / count
+        ip_diversity = _distinct_count(columns['src_ip'][mask]) / count
+
+        protocol_counts = np.bincount(columns['proto'][mask])
+        probabilities = protocol_counts[protocol_counts > 0] / count
+        protocol_entropy = float(-np.sum(probabilities * np.log2(probabilities)))
+
+        return [
+            avg_severity,
+            unique_sigs,
+            event_freq,
+            high_sev_ratio,
+            ip_diversity,
+            protocol_entropy
+        ]
+
+    def extract_osquery_features_columnar(self, logs: Union[List[Dict[str, Any]], Columns],
+                                          window_minutes: int = 5,
+                                          end_time: Optional[datetime] = None) -> List[float]:
+        """Vectorized equivalent of extract_osquery_features."""
+        columns = logs if isinstance(logs, dict) else self.osquery_columns(logs)
+        if not len(columns['timestamp']):
+            return [0.0] * len(self.osquery_features)
+
+        mask = self._window_mask(columns['timestamp'], window_minutes, end_time)
+        if not np.any(mask):
+            return [0.0] * len(self.osquery_features)
+
+        event_counts = np.bincount(columns['category'][mask], minlength=len(OSQUERY_CATEGORIES))
+        total_time = window_minutes * 60  # convert to seconds
+        return [float(count) / total_time for count in event_counts]
+
+    def extract_features(self, source: str, logs: List[Dict[str, Any]], window_minutes: int = 5,
+                         end_time: Optional[datetime] = None) -> List[float]:
+        """Extract features based on the log source.
+
+        The window ends at ``end_time`` (default: now), which lets historical
+        windows be computed for training.
+        """
         extractors = {
             'zeek': self.extract_zeek_features,
             'suricata': self.extract_suricata_features,
@@ -180,4 +398,282 @@ class FeatureExtractor:
         if source not in extractors:
             raise ValueError(f"Unsupported log source: {source}")
         
-        return extractors[source](logs, window_minutes)
\ No newline at end of file
+        return extractors[source](logs, window_minutes, end_time)
+
+    def build_columns(self, source: str, logs: List[Dict[str, Any]]) -> Columns:
+        """Column arrays of a source's logs for extract_features_columnar."""
+        builders = {
+            'zeek': self.zeek_columns,
+            'suricata': self.suricata_columns,
+            'osquery': self.osquery_columns
+        }
+
+        if source not in builders:
+            raise ValueError(f"Unsupported log source: {source}")
+
+        return builders[source](logs)
+
+    def extract_features_columnar(self, source: str, columns: Columns, window_minutes: int = 5,
+                                  end_time: Optional[datetime] = None) -> List[float]:
+        """extract_features on columns prebuilt by build_columns."""
+        extractors = {
+            'zeek': self.extract_zeek_features_columnar,
+            'suricata': self.extract_suricata_features_columnar,
+            'osquery': self.extract_osquery_features_columnar
+        }
+
+        if source not in extractors:
+            raise ValueError(f"Unsupported log source: {source}")
+
+        return extractors[source](columns, window_minutes, end_time)
+
+
+class _SlidingWindowState(ABC):
+    """Running aggregates over the events of a sliding time window.
+
+    Every event is added once and evicted once, so maintaining the window is
+    O(1) amortized per event. Events are expected in roughly timestamp order:
+    eviction pops from the oldest end and stops at the first event that is
+    still inside the window. Like the ``start <= ts <= end`` filter of the
+    extract_*_features methods, events stamped later than ``now`` are left
+    out of the feature vector until ``now`` catches up with them.
+    """
+
+    feature_names: List[str] = []
+
+    def __init__(self, window_minutes: int = 5):
+        self.window_minutes = window_minutes
+        self.window = timedelta(minutes=window_minutes)
+        self.events = deque()
+        self._reset()
+
+    @abstractmethod
+    def _reset(self):
+        """Reset all running aggregates to an empty window."""
+
+    @abstractmethod
+    def _contribution(self, log: Dict[str, Any]) -> Any:
+        """What an event adds to the aggregates; raises before any state changes."""
+
+    @abstractmethod
+    def _apply(self, contribution: Any, sign: int):
+        """Fold a contribution into (sign 1) or out of (sign -1) the aggregates."""
+
+    @abstractmethod
+    def _features(self) -> List[float]:
+        """Feature vector of a non-empty window."""
+
+    def add(self, log: Dict[str, Any]):
+        """Add an event as it arrives; aware timestamps are kept as naive UTC."""
+        timestamp = _naive_utc(log['timestamp'])
+        contribution = self._contribution(log)
+        self._apply(contribution, 1)
+        self.events.append((timestamp, contribution))
+
+    def evict(self, now: Optional[datetime] = None):
+        """Drop every event that has fallen out of the window."""
+        start_time = _naive_utc(now or datetime.utcnow()) - self.window
+        events = self.events
+        while events and events[0][0] < start_time:
+            self._apply(events.popleft()[1], -1)
+        if not events:
+            # Start from exact zeros so float sums cannot drift
+            self._reset()
+
+    def features(self, now: Optional[datetime] = None) -> List[float]:
+        """Return the feature vector of the window ending at ``now``."""
+        now = _naive_utc(now or datetime.utcnow())
+        self.evict(now)
+
+        # Set events from the future aside for this read
+        events = self.events
+        future = []
+        while events and events[-1][0] > now:
+            future.append(events.pop())
+            self._apply(future[-1][1], -1)
+        try:
+            if not events:
+                return [0.0] * len(self.feature_names)
+            return self._features()
+        finally:
+            for event in reversed(future):
+                self._apply(event[1], 1)
+                events.append(event)
+
+
+def _increment(counts: Dict[Any, int], key: Any):
+    counts[key] = counts.get(key, 0) + 1
+
+def _decrement(counts: Dict[Any, int], key: Any):
+    remaining = counts[key] - 1
+    if remaining:
+        counts[key] = remaining
+    else:
+        del counts[key]
+
+
+class ZeekWindowState(_SlidingWindowState):
+    """Incremental equivalent of FeatureExtractor.extract_zeek_features."""
+
+    feature_names = ZEEK_FEATURES
+
+    def _reset(self):
+        self.total_bytes = 0
+        self.total_packets = 0
+        self.duration_sum = 0.0
+        self.ratio_sum = 0.0
+        self.ratio_count = 0
+        self.local_count = 0
+        self.error_count = 0
+        self.ip_counts: Dict[str, int] = {}
+
+    def _contribution(self, log):
+        orig_bytes = log.get('orig_bytes', 0)
+        resp_bytes = log.get('resp_bytes', 0)
+        return (
+            orig_bytes + resp_bytes,
+            log.get('orig_pkts', 0) + log.get('resp_pkts', 0),
+            log.get('duration', 0),
+            orig_bytes / resp_bytes if resp_bytes > 0 else None,
+            bool(log.get('local_orig', False)),
+            log.get('conn_state', '') in ZEEK_ERROR_STATES,
+            log['source_ip'],
+            log['dest_ip']
+        )
+
+    def _apply(self, contribution, sign):
+        total_bytes, total_packets, duration, ratio, local, error, source_ip, dest_ip = contribution
+        self.total_bytes += sign * total_bytes
+        self.total_packets += sign * total_packets
+        self.duration_sum += sign * duration
+        if ratio is not None:
+            self.ratio_sum += sign * ratio
+            self.ratio_count += sign
+        self.local_count += sign * local
+        self.error_count += sign * error
+        update = _increment if sign > 0 else _decrement
+        update(self.ip_counts, source_ip)
+        update(self.ip_counts, dest_ip)
+
+    def _features(self):
+        count = len(self.events)
+        seconds = self.window_minutes * 60
+        return [
+            self.total_bytes / seconds,  # bytes per second
+            self.total_packets / seconds,  # packets per second
+            len(self.ip_counts),
+            self.duration_sum / count,
+            self.ratio_sum / self.ratio_count if self.ratio_count else float('nan'),
+            self.local_count / count,
+            self.error_count / count
+        ]
+
+
+class SuricataWindowState(_SlidingWindowState):
+    """Incremental equivalent of FeatureExtractor.extract_suricata_features."""
+
+    feature_names = SURICATA_FEATURES
+
+    def _reset(self):
+        self.severity_sum = 0
+        self.severity_count = 0
+        self.high_severity_count = 0
+        self.signature_counts: Dict[Any, int] = {}
+        self.source_ip_counts: Dict[str, int] = {}
+        self.protocol_counts: Dict[str, int] = {}
+
+    def _contribution(self, log):
+        return (log.get('severity'), log.get('signature', ''), log['src_ip'], log['proto'])
+
+    def _apply(self, contribution, sign):
+        severity, signature, source_ip, protocol = contribution
+        if severity is not None:
+            self.severity_sum += sign * severity
+            self.severity_count += sign
+            self.high_severity_count += sign * (severity >= 3)
+        update = _increment if sign > 0 else _decrement
+        update(self.signature_counts, signature)
+        update(self.source_ip_counts, source_ip)
+        update(self.protocol_counts, protocol)
+
+    def _features(self):
+        count = len(self.events)
+        # Entropy is O(number of distinct protocols), not O(events)
+        entropy = 0.0
+        for protocol_count in self.protocol_counts.values():
+            probability = protocol_count / count
+            entropy -= probability * np.log2(probability)
+
+        return [
+            self.severity_sum / self.severity_count if self.severity_count else 0,
+            len(self.signature_counts),
+            count / (self.window_minutes * 60),
+            self.high_severity_count / count,
+            len(self.source_ip_counts) / count,
+            entropy
+        ]
+
+
+class OSQueryWindowState(_SlidingWindowState):
+    """Incremental equivalent of FeatureExtractor.extract_osquery_features."""
+
+    feature_names = OSQUERY_FEATURES
+
+    def _reset(self):
+        self.category_counts = [0] * len(OSQUERY_CATEGORIES)
+
+    def _contribution(self, log):
+        return _osquery_category(log['name'])
+
+    def _apply(self, category, sign):
+        self.category_counts[category] += sign
+
+    def _features(self):
+        total_time = self.window_minutes * 60  # convert to seconds
+        return [count / total_time for count in self.category_counts]
+
+
+class WindowedFeatureAggregator:
+    """Stateful per-source feature windows for continuous scoring.
+
+    Instead of re-filtering the full log history on every tick like the
+    extract_*_features methods, events are pushed in as they arrive and the
+    current feature vector is read back in O(1) amortized time per event.
+    """
+
+    state_classes = {
+        'zeek': ZeekWindowState,
+        'suricata': SuricataWindowState,
+        'osquery': OSQueryWindowState
+    }
+
+    def __init__(self, window_minutes: int = 5):
+        self.window_minutes = window_minutes
+        self.states: Dict[str, _SlidingWindowState] = {}
+
+    def _state(self, source: str) -> _SlidingWindowState:
+        state = self.states.get(source)
+        if state is None:
+            if source not in self.state_classes:
+                raise ValueError(f"Unsupported log source: {source}")
+            state = self.states[source] = self.state_classes[source](self.window_minutes)
+        return state
+
+    def add(self, source: str, log: Dict[str, Any]):
+        """Add one event for the given source."""
+        self._state(source).add(log)
+
+    def add_many(self, source: str, logs: List[Dict[str, Any]]):
+        """Add several events for the given source, oldest first."""
+        add = self._state(source).add
+        for log in logs:
+            add(log)
+
+    def evict(self, now: Optional[datetime] = None):
+        """Drop expired events of every source, bounding memory between reads."""
+        for state in self.states.values():
+            state.evict(now)
+
+    def features(self, source: str, now: Optional[datetime] = None) -> List[float]:
+        """Return the current feature vector for the given source."""
+        return self._state(source).features(now)
@@ -0,0 +1,474 @@
+"""Batch ingestion helpers for the security_logs table."""
+import csv
+import io
+import json
+import logging
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from .config import settings
+from .event_feed import get_event_hub, log_event
+from .live_features import get_live_features
+from .log_parsers import LogParser, LogRecord, decode_json
+from .models import SecurityLog
+from .network_stats import get_stats
+from .response_cache import invalidate_responses
+from .schemas_consolidated import LogData
+
+try:
+    import zstandard
+except ImportError:  # zstd uploads are optional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Number of rows written per multi-row INSERT / COPY
+INGEST_CHUNK_SIZE = 5000
+
+# Maximum number of per-record errors echoed back to the client
+MAX_REPORTED_ERRORS = 100
+
+# Rows buffered by a streaming upload before they are flushed to the database
+STREAM_BATCH_SIZE = 5000
+
+# Longest NDJSON line accepted by a streaming upload; longer lines are rejected
+STREAM_MAX_LINE_BYTES = 1024 * 1024
+
+# Number of finished streaming uploads whose progress is kept around
+STREAM_PROGRESS_HISTORY = 100
+
+SUPPORTED_STREAM_ENCODINGS = ("identity", "gzip") + (("zstd",) if zstandard is not None else ())
+
+# Raised by iter_decompressed for corrupt or truncated compressed bodies
+DECOMPRESSION_ERRORS = (zlib.error, EOFError) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+SECURITY_LOG_COLUMNS = [
+    'id',
+    'timestamp',
+    'log_type',
+    'source',
+    'message',
+    'additional_info',
+    'threat_id'
+]
+
+
+def log_data_to_row(log_data: LogData) -> Dict[str, Any]:
+    """Map a validated LogData record onto a security_logs row."""
+    return {
+        "id": str(uuid.uuid4()),
+        "timestamp": log_data.timestamp,
+        "log_type": log_data.event_type,
+        "source": log_data.source,
+        "message": json.dumps(log_data.data, default=str),
+        "additional_info": log_data.data,
+        "threat_id": None
+    }
+
+
+def iter_batch_records(body: bytes, content_type: str = "") -> Iterator[Any]:
+    """Yield raw records from a JSON array or NDJSON request body.
+
+    Lines that fail to decode are yielded as ``ValueError`` instances so the
+    caller can count them as rejected without aborting the whole batch.
+    """
+    text = body.decode("utf-8")
+    stripped = text.lstrip()
+
+    if "ndjson" not in content_type and stripped.startswith("["):
+        try:
+            records = json.loads(stripped)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON array body: {str(e)}")
+        for record in records:
+            yield record
+        return
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON line: {str(e)}")
+
+
+def validate_batch(records: Iterator[Any]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], int]:
+    """Validate raw records against LogData.
+
+    Returns the accepted rows, a (truncated) list of per-record errors and the
+    total number of rejected records.
+    """
+    rows = []
+    errors = []
+    rejected = 0
+
+    for index, record in enumerate(records):
+        try:
+            if isinstance(record, Exception):
+                raise record
+            if not isinstance(record, dict):
+                raise ValueError("Record must be a JSON object")
+            rows.append(log_data_to_row(LogData(**record)))
+        except (ValidationError, ValueError, TypeError) as e:
+            rejected += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"index": index, "error": str(e)})
+
+    return rows, errors, rejected
+
+
+def _copy_security_logs(db: Session, rows: List[Dict[str, Any]], skip_existing: bool = False) -> int:
+    """Stream rows into security_logs with PostgreSQL COPY.
+
+    COPY cannot skip conflicting rows, so with ``skip_existing`` the rows are
+    copied into a temporary table first and moved over with
+    ``INSERT ... ON CONFLICT DO NOTHING``. Returns the number of rows written.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            row["id"],
+            row["timestamp"].isoformat(),
+            row["log_type"],
+            row["source"] if row["source"] is not None else "",
+            row["message"],
+            json.dumps(row["additional_info"], default=str) if row["additional_info"] is not None else "",
+            row["threat_id"] or ""
+        ])
+    buffer.seek(0)
+
+    table = SecurityLog.__tablename__
+    columns = ', '.join(SECURITY_LOG_COLUMNS)
+    # COPY needs the raw psycopg2 cursor of the session's connection
+    cursor = db.connection().connection.cursor()
+    try:
+        if not skip_existing:
+            cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+            return len(rows)
+        cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS {table}_load "
+                       f"(LIKE {table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS")
+        cursor.copy_expert(f"COPY {table}_load ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        cursor.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_load "
+                       "ON CONFLICT DO NOTHING")
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+
+def record_committed_logs(rows: List[Dict[str, Any]]):
+    """API-side effects of newly committed security_logs rows.
+
+    Updates the network counters and live feature windows, invalidates the
+    cached responses and publishes the rows on the event feed. Passed as
+    ``on_commit`` by the API write paths only; the rows are already stored,
+    so a failure here is logged and never reaches the caller.
+    """
+    try:
+        get_stats().record_logs(rows)
+    except Exception as e:
+        logger.error(f"Failed to count committed logs: {str(e)}")
+    if settings.LIVE_FEATURES_ENABLED:
+        get_live_features().record_logs(rows)
+    invalidate_responses("logs")
+    hub = get_event_hub()
+    if hub.has_subscribers:
+        try:
+            hub.publish("log", [log_event(row) for row in rows])
+        except Exception as e:
+            logger.error(f"Failed to publish committed logs: {str(e)}")
+
+
+def bulk_insert_security_logs(db: Session, rows: List[Dict[str, Any]],
+                              chunk_size: int = INGEST_CHUNK_SIZE, skip_existing: bool = False,
+                              on_commit: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> int:
+    """Write rows to security_logs, one multi-row statement per chunk.
+
+    PostgreSQL connections use COPY; every other dialect falls back to an
+    executemany INSERT. Each chunk is committed on its own so a failure only
+    loses the chunk in flight, and ``on_commit`` (e.g. record_committed_logs)
+    is called with every committed chunk. With ``skip_existing``, rows whose
+    id is already stored are skipped instead of failing the chunk; the return
+    value then only counts the rows actually written, and ``on_commit`` is
+    only called for chunks that had no duplicates, since the skipped rows
+    cannot be told apart.
+    """
+    if not rows:
+        return 0
+
+    dialect = db.get_bind().dialect.name
+    use_copy = dialect == "postgresql"
+    insert = SecurityLog.__table__.insert()
+    if skip_existing and dialect == "sqlite":
+        insert = insert.prefix_with("OR IGNORE")
+    written = 0
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            if use_copy:
+                inserted = _copy_security_logs(db, chunk, skip_existing)
+            else:
+                inserted = db.execute(insert, chunk).rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        if not skip_existing:
+            inserted = len(chunk)
+        if on_commit is not None and inserted == len(chunk):
+            on_commit(chunk)
+        written += inserted
+
+    return written
+
+
+def parsed_log_to_row(source: str, parsed: LogRecord, line: str,
+                      content: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Map a LogParser result onto a security_logs row.
+
+    The original line is kept as the message and its decoded form as
+    additional_info so nothing from the export is lost. Pass ``content`` when
+    the line was already decoded and not modified by the parser.
+    """
+    if source == 'suricata':
+        log_type = parsed.event_type
+    elif source == 'osquery':
+        log_type = parsed.name
+    else:
+        log_type = 'conn'
+
+    return {
+        "id": str(uuid.uuid4()),
+        "timestamp": parsed.timestamp,
+        "log_type": log_type,
+        "source": source,
+        "message": line,
+        "additional_info": content if content is not None else json.loads(line),
+        "threat_id": None
+    }
+
+
+def ndjson_line_to_row(source: str, line: str, strict: bool = True) -> Dict[str, Any]:
+    """Parse one NDJSON log line into a security_logs row.
+
+    ``strict`` validates the record with the pydantic models; otherwise the
+    fast parsing mode is used and the line is decoded only once. Raises
+    ValueError for lines that cannot be parsed.
+    """
+    if strict:
+        parsed = LogParser.parse_log(source, json.loads(line))
+        return parsed_log_to_row(source, parsed, line)
+
+    content = decode_json(line)
+    if not isinstance(content, dict):
+        raise ValueError("Log record must be a JSON object")
+    return parsed_log_to_row(source, LogParser.parse_fast(source, content), line, content)
+
+
+class StreamIngestProgress:
+    """Progress and throughput of a single streaming upload."""
+
+    def __init__(self, upload_id: str, source: str, encoding: str):
+        self.upload_id = upload_id
+        self.source = source
+        self.encoding = encoding
+        self.status = "running"
+        self.bytes_received = 0
+        self.lines = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.batches = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    def reject(self, line_number: int, error: str):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line_number, "error": error})
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return {
+            "upload_id": self.upload_id,
+            "source": self.source,
+            "encoding": self.encoding,
+            "status": self.status,
+            "bytes_received": self.bytes_received,
+            "lines": self.lines,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "elapsed_seconds": round(elapsed, 3),
+            "lines_per_second": round(self.lines / elapsed, 1) if elapsed > 0 else 0.0,
+            "mb_per_second": round(self.bytes_received / elapsed / 1e6, 3) if elapsed > 0 else 0.0,
+            "errors": self.errors
+        }
+
+
+_stream_progress: "OrderedDict[str, StreamIngestProgress]" = OrderedDict()
+
+
+def start_stream_progress(source: str, encoding: str, upload_id: Optional[str] = None) -> StreamIngestProgress:
+    """Register a new streaming upload, evicting the oldest finished ones."""
+    progress = StreamIngestProgress(upload_id or str(uuid.uuid4()), source, encoding)
+    _stream_progress[progress.upload_id] = progress
+    while len(_stream_progress) > STREAM_PROGRESS_HISTORY:
+        oldest_id, oldest = next(iter(_stream_progress.items()))
+        if oldest.status == "running":
+            break
+        del _stream_progress[oldest_id]
+    return progress
+
+
+def get_stream_progress(upload_id: str) -> Optional[StreamIngestProgress]:
+    """Look up the progress of a running or recently finished upload."""
+    return _stream_progress.get(upload_id)
+
+
+def _make_decompressor(encoding: str):
+    """Return an incremental decompressor for the given content encoding."""
+    if encoding == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd uploads require the 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompressobj()
+    if encoding == "identity":
+        return None
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+async def iter_decompressed(chunks: AsyncIterator[bytes], encoding: str,
+                            progress: Optional[StreamIngestProgress] = None) -> AsyncIterator[bytes]:
+    """Decompress a chunked request body incrementally.
+
+    Corrupt data raises one of ``DECOMPRESSION_ERRORS``; a gzip body that
+    ends before its end-of-stream marker raises EOFError.
+    """
+    decompressor = _make_decompressor(encoding)
+
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        if progress is not None:
+            progress.bytes_received += len(chunk)
+        if decompressor is None:
+            yield chunk
+            continue
+
+        data = decompressor.decompress(chunk)
+        # Concatenated gzip members (e.g. `cat a.gz b.gz`) start a new stream
+        while encoding == "gzip" and decompressor.eof and decompressor.unused_data:
+            leftover = decompressor.unused_data
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            data += decompressor.decompress(leftover)
+        if data:
+            yield data
+
+    if encoding == "gzip":
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+        if not decompressor.eof and (progress is None or progress.bytes_received):
+            raise EOFError("Compressed body ended before the end-of-stream marker")
+
+
+async def iter_lines(chunks: AsyncIterator[bytes],
+                     max_line_bytes: int = STREAM_MAX_LINE_BYTES) -> AsyncIterator[Optional[bytes]]:
+    """Split a byte stream into lines without buffering more than one line.
+
+    Lines longer than ``max_line_bytes`` are skipped and reported as ``None``.
+    """
+    pending = b""
+    oversized = False
+
+    async for chunk in chunks:
+        pending += chunk
+        start = 0
+        while True:
+            end = pending.find(b"\n", start)
+            if end < 0:
+                break
+            if oversized:
+                oversized = False
+                yield None
+            else:
+                yield pending[start:end]
+            start = end + 1
+        pending = pending[start:]
+
+        if len(pending) > max_line_bytes:
+            oversized = True
+            pending = b""
+
+    if oversized:
+        yield None
+    elif pending.strip():
+        yield pending
+
+
+async def ingest_ndjson_stream(db: Session, source: str, chunks: AsyncIterator[bytes],
+                               progress: StreamIngestProgress,
+                               batch_size: int = STREAM_BATCH_SIZE,
+                               strict: bool = True,
+                               on_commit: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+                               ) -> StreamIngestProgress:
+    """Parse an NDJSON stream with LogParser and write it in bounded batches.
+
+    ``strict=False`` skips pydantic validation and uses the fast parsing mode,
+    meant for trusted sensors whose output is known to be well formed.
+    ``on_commit`` is passed on to bulk_insert_security_logs.
+    """
+    rows: List[Dict[str, Any]] = []
+
+    async def flush():
+        written = await run_in_threadpool(bulk_insert_security_logs, db, rows, on_commit=on_commit)
+        progress.accepted += written
+        progress.batches += 1
+        rows.clear()
+        logger.info(
+            "Stream upload %s: %d lines, %d accepted, %d rejected (%.0f lines/sec)",
+            progress.upload_id, progress.lines, progress.accepted, progress.rejected,
+            progress.to_dict()["lines_per_second"]
+        )
+
+    try:
+        async for raw_line in iter_lines(iter_decompressed(chunks, progress.encoding, progress)):
+            progress.lines += 1
+            if raw_line is None:
+                progress.reject(progress.lines, "Line exceeds maximum length")
+                continue
+
+            line = raw_line.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            try:
+                rows.append(ndjson_line_to_row(source, line, strict))
+            except ValueError as e:
+                progress.reject(progress.lines, str(e))
+                continue
+
+            if len(rows) >= batch_size:
+                await flush()
+
+        if rows:
+            await flush()
+        progress.status = "completed"
+    except Exception:
+        progress.status = "failed"
+        raise
+    finally:
+        progress.finished_at = time.time()
+
+    return progress
@@ -0,0 +1,262 @@
+"""Bounded in-process ingest pipeline.
+
+``POST /ingest`` only validates an event and puts its row on a bounded
+asyncio queue. Background writer tasks drain the queue in batches and
+write each batch with ``bulk_insert_security_logs`` in a worker thread. A
+slow database therefore no longer ties up the request threadpool. Once the
+queue is full, new events are refused and the client is told to retry.
+
+With a spool attached, batches are appended to the durable write-ahead
+spool instead (one fsync per batch) and ``enqueue`` futures resolve once
+they are on disk; ``SpoolDrainer`` moves them on into the database.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import settings
+from .database import SessionLocal
+from .ingest import bulk_insert_security_logs, record_committed_logs
+from .spool import IngestSpool, SpoolDrainer
+
+logger = logging.getLogger(__name__)
+
+# Number of recent flushes kept for the latency percentiles
+FLUSH_LATENCY_HISTORY = 1000
+
+
+def write_rows(rows: List[Dict[str, Any]]) -> int:
+    """Write one batch of rows in its own session (runs in a worker thread)."""
+    db = SessionLocal()
+    try:
+        return bulk_insert_security_logs(db, rows, on_commit=record_committed_logs)
+    finally:
+        db.close()
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))]
+
+
+class IngestQueue:
+    """Bounded queue of security_logs rows with background batch writers.
+
+    Writers take up to ``batch_size`` rows, or whatever arrived within
+    ``flush_interval_ms`` of the first one, and write them in one statement.
+    ``enqueue`` raises ``asyncio.QueueFull`` when ``max_size`` rows are
+    waiting.
+    """
+
+    def __init__(self, max_size: int = 10000, batch_size: int = 500,
+                 flush_interval_ms: float = 50.0, writers: int = 1,
+                 spool: Optional[IngestSpool] = None, drainer: Optional[SpoolDrainer] = None):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.writers = writers
+        self.spool = spool
+        self.drainer = drainer
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._inflight: set = set()
+        # Rows a cancelled writer had already taken off the queue
+        self._leftover: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+
+        self.enqueued = 0
+        self.rejected = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.max_depth = 0
+        self._flush_latencies: deque = deque(maxlen=FLUSH_LATENCY_HISTORY)
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    @property
+    def durable(self) -> bool:
+        """Whether enqueued rows are acknowledged only once spooled to disk."""
+        return self.spool is not None
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        """Start the background writer tasks (and the spool drainer)."""
+        if self.drainer is not None:
+            await self.drainer.start()
+        if self.running:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"ingest-writer-{i}") for i in range(self.writers)
+        ]
+        logger.info(
+            f"Ingest queue started ({self.writers} writer(s), max {self.max_size} queued, "
+            f"batches of {self.batch_size} / {self.flush_interval * 1000:.0f} ms)"
+        )
+
+    async def stop(self):
+        """Stop the writers and flush whatever is still queued."""
+        if not self._tasks:
+            return
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+        items, self._leftover = self._leftover, []
+        while not self._queue.empty():
+            items.append(self._queue.get_nowait())
+        try:
+            if items:
+                logger.info(f"Flushing {len(items)} queued log rows before shutdown")
+                await self._flush(items)
+        finally:
+            # Never leave a caller waiting, even if the final flush is cancelled
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(RuntimeError("Ingest queue stopped before the row was written"))
+                    future.exception()
+        if self.drainer is not None:
+            await self.drainer.stop()
+
+    def enqueue(self, row: Dict[str, Any]) -> asyncio.Future:
+        """Queue one row for writing; raises asyncio.QueueFull when saturated.
+
+        The returned future resolves once the row's batch was spooled (or
+        written, without a spool).
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((row, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return future
+
+    async def _collect(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """Wait for the first row, then gather more into ``batch`` until full or timed out.
+
+        Rows are appended as they are taken off the queue, so the caller still
+        holds them if the wait is cancelled.
+        """
+        batch.append(await self._queue.get())
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _flush(self, items: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        loop = asyncio.get_running_loop()
+        rows = [row for row, _ in items]
+        start = time.perf_counter()
+        error: Optional[Exception] = None
+        try:
+            if self.spool is not None:
+                await loop.run_in_executor(None, self.spool.append, rows)
+                if self.drainer is not None:
+                    self.drainer.notify()
+                self.written += len(rows)
+            else:
+                self.written += await loop.run_in_executor(None, write_rows, rows)
+        except Exception as e:
+            error = e
+            self.failed += len(rows)
+            logger.error(f"Error writing {len(rows)} queued log rows: {str(e)}")
+        finally:
+            self._flush_latencies.append(time.perf_counter() - start)
+            self.batches += 1
+
+        for _, future in items:
+            if not future.done():
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+                    # Already logged above; callers that do not await are fine
+                    future.exception()
+
+    async def _run(self):
+        while True:
+            items: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+            try:
+                await self._collect(items)
+            except asyncio.CancelledError:
+                # stop() flushes these together with the rest of the queue
+                self._leftover.extend(items)
+                raise
+            # Shield the write so a shutdown cancel does not drop a batch in
+            # flight; stop() waits for it instead
+            flush = asyncio.ensure_future(self._flush(items))
+            self._inflight.add(flush)
+            flush.add_done_callback(self._inflight.discard)
+            await asyncio.shield(flush)
+
+    def metrics(self) -> Dict[str, Any]:
+        latencies = list(self._flush_latencies)
+        return {
+            "running": self.running,
+            "durable": self.durable,
+            "queue_depth": self.depth,
+            "queue_max_size": self.max_size,
+            "queue_max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "rejected": self.rejected,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+            "flush_latency_ms": {
+                "last": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+                "p50": round(_percentile(latencies, 0.5) * 1000, 3),
+                "p99": round(_percentile(latencies, 0.99) * 1000, 3),
+                "max": round(max(latencies) * 1000, 3) if latencies else 0.0
+            },
+            "spool": self.drainer.metrics() if self.drainer is not None else None
+        }
+
+
+_ingest_queue: Optional[IngestQueue] = None
+
+def get_ingest_queue() -> IngestQueue:
+    """Shared IngestQueue configured from settings."""
+    global _ingest_queue
+    if _ingest_queue is None:
+        spool, drainer = None, None
+        if settings.INGEST_SPOOL_ENABLED:
+            from .spool import get_spool, get_spool_drainer
+            spool, drainer = get_spool(), get_spool_drainer()
+        _ingest_queue = IngestQueue(
+            max_size=settings.INGEST_QUEUE_MAX_SIZE,
+            batch_size=settings.INGEST_BATCH_SIZE,
+            flush_interval_ms=settings.INGEST_FLUSH_INTERVAL_MS,
+            writers=settings.INGEST_WRITERS,
+            spool=spool,
+            drainer=drainer
+        )
+    return _ingest_queue
@@ -0,0 +1,68 @@
+"""Sliding feature windows over freshly ingested logs.
+
+Every chunk committed by the API's ingest paths is pushed into a ``WindowedFeatureAggregator``,
+so ``GET /detect/live`` can score the current window of a source without
+re-reading the log history. Rows are turned into feature logs the same way
+the training pipeline does it: the decoded record plus the row timestamp.
+Windows are per process; with several API workers each one sees the rows
+it ingested itself.
+"""
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .config import settings
+from .feature_extraction import WindowedFeatureAggregator
+
+logger = logging.getLogger(__name__)
+
+
+class LiveFeatures:
+    """Thread-safe WindowedFeatureAggregator fed from the ingest write path."""
+
+    def __init__(self, window_minutes: int = 5):
+        self.window_minutes = window_minutes
+        self._aggregator = WindowedFeatureAggregator(window_minutes)
+        self._lock = threading.Lock()
+        self.skipped = 0
+
+    def record_logs(self, rows: List[Dict[str, Any]]):
+        """Add committed security_logs rows of the supported sources.
+
+        The rows are already stored, so errors are logged, never raised.
+        """
+        skipped = 0
+        with self._lock:
+            try:
+                for row in rows:
+                    source = row.get("source")
+                    info = row.get("additional_info")
+                    if source not in WindowedFeatureAggregator.state_classes or not isinstance(info, dict):
+                        continue
+                    try:
+                        self._aggregator.add(source, dict(info, timestamp=row["timestamp"]))
+                    except (KeyError, TypeError, ValueError):
+                        # Record without the fields the features are computed from
+                        skipped += 1
+                self._aggregator.evict(datetime.utcnow())
+            except Exception as e:
+                logger.error(f"Failed to update live feature windows: {str(e)}")
+            self.skipped += skipped
+
+    def features(self, source: str, now: Optional[datetime] = None) -> List[float]:
+        with self._lock:
+            return self._aggregator.features(source, now)
+
+    def feature_names(self, source: str) -> List[str]:
+        return list(WindowedFeatureAggregator.state_classes[source].feature_names)
+
+
+_live_features: Optional[LiveFeatures] = None
+
+def get_live_features() -> LiveFeatures:
+    """Shared LiveFeatures configured from settings."""
+    global _live_features
+    if _live_features is None:
+        _live_features = LiveFeatures(window_minutes=settings.LIVE_FEATURES_WINDOW_MINUTES)
+    return _live_features
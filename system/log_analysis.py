@@ -1,9 +1,9 @@
 from typing import Dict, Any, Optional
 import logging
 import os
-from openai import AsyncOpenAI
-from transformers import AutoTokenizer, AutoModelForCausalLM
-import torch
+
+# openai, transformers and torch are imported on first use: torch alone
+# takes seconds and hundreds of MB to import
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -11,13 +11,22 @@ logger = logging.getLogger(__name__)
 
 class LogAnalyzer:
     def __init__(self):
-        self.openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self._openai_client = None
         self.mistral_tokenizer = None
         self.mistral_model = None
         
+    @property
+    def openai_client(self):
+        if self._openai_client is None:
+            from openai import AsyncOpenAI
+            self._openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self._openai_client
+
     async def init_mistral(self):
         """Initialize Mistral model if not already loaded."""
         if self.mistral_model is None:
+            import torch
+            from transformers import AutoTokenizer, AutoModelForCausalLM
             self.mistral_tokenizer = AutoTokenizer.from_pretrained("mistralai/Mistral-7B-v0.1")
             self.mistral_model = AutoModelForCausalLM.from_pretrained(
                 "mistralai/Mistral-7B-v0.1",
@@ -59,6 +68,7 @@ class LogAnalyzer:
                 truncation=True
             ).to("cuda")
             
+            import torch
             with torch.no_grad():
                 outputs = self.mistral_model.generate(
                     **inputs,
@@ -1,11 +1,17 @@
 import os
+import time
+import asyncio
 import datetime
 import logging
 import traceback
+from contextlib import contextmanager
 from typing import Dict, Any, List, Optional
-from sqlalchemy import create_engine, text
-from fastapi import FastAPI, HTTPException, Depends
+from sqlalchemy import select, text
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 # Configure logging first
@@ -16,7 +22,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Internal imports
-from .database import get_db, init_db
+from .database import (
+    engine, get_db, get_async_db, get_pool_metrics, dispose_async_engine
+)
 from .routers import threat_management
 from .models import (
     Threat, SecurityLog, AnomalyDetection,
@@ -24,8 +32,19 @@ from .models import (
 )
 from .schemas_consolidated import (
     NetworkStatsResponse, ThreatResponse, LogData,
-    AnalysisRequest, AnomalyData, ResponseAction
+    AnalysisRequest, AnomalyData, ResponseAction,
+    BatchIngestResponse, BatchScoringRequest, BatchScoringResponse,
+    ScoringRequest, ScoringResult, TrainingRequest, ModelMetrics, LogPage
+)
+from .ingest import (
+    log_data_to_row, iter_batch_records, validate_batch,
+    bulk_insert_security_logs, ingest_ndjson_stream, record_committed_logs,
+    start_stream_progress, get_stream_progress,
+    SUPPORTED_STREAM_ENCODINGS, DECOMPRESSION_ERRORS
 )
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page, split_page
+from .event_feed import EventFilter, anomaly_event, get_event_hub
+from .response_cache import ResponseCacheMiddleware, get_response_cache, invalidate_responses
 from .config import settings
 
 # Create FastAPI app
@@ -52,6 +71,10 @@ allowed_origins = [
     "http://127.0.0.1:8000"
 ]
 
+# Cache the polled GET endpoints; added before CORS so cached responses get CORS headers too
+if settings.RESPONSE_CACHE_ENABLED:
+    app.add_middleware(ResponseCacheMiddleware, cache=get_response_cache())
+
 # Add CORS middleware early in the chain
 app.add_middleware(
     CORSMiddleware,
@@ -62,39 +85,12 @@ app.add_middleware(
     max_age=3600
 )
 
-# Initialize database
-logger.info("Initializing database...")
-try:
-    init_db()
-    logger.info("Database initialized successfully")
-except Exception as e:
-    logger.error(f"Database initialization error: {str(e)}")
-    logger.error("Will attempt to initialize during startup")
-
 # Database configuration
 DATABASE_RETRY_INTERVAL = 2  # seconds between retries
 DATABASE_MAX_RETRIES = 3    # maximum number of retry attempts
-DATABASE_TIMEOUT = 30       # database connection timeout in seconds
-DATABASE_TABLES = [
-    'threats',
-    'security_logs',
-    'anomaly_detections',
-    'response_action_logs'
-]
-
-# Engine configuration
-ENGINE_CONFIG = {
-    "pool_pre_ping": True,
-    "pool_recycle": 300,
-    "connect_args": {
-        "connect_timeout": DATABASE_TIMEOUT
-    }
-}
 
 def verify_database_connection():
     """Test database connection"""
-    from sqlalchemy import create_engine, text
-    engine = create_engine(settings.SQLALCHEMY_DATABASE_URL, **ENGINE_CONFIG)
     try:
         with engine.connect() as conn:
             conn.execution_options(timeout=10)
@@ -104,47 +100,29 @@ def verify_database_connection():
         logger.error(f"Database connection error: {str(e)}")
         return False
 
-# API Server Configuration
-import socket
-
-# Initialize the application
-def initialize_database():
-    """Initialize database and verify connection"""
+def wait_for_database():
+    """Retry the connection check while the database comes up"""
+    for attempt in range(1, DATABASE_MAX_RETRIES + 1):
+        if verify_database_connection():
+            return
+        if attempt < DATABASE_MAX_RETRIES:
+            time.sleep(DATABASE_RETRY_INTERVAL)
+    raise RuntimeError(f"Database unreachable after {DATABASE_MAX_RETRIES} attempts")
+
+def database_is_empty() -> bool:
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT 1 FROM threats LIMIT 1")).first() is None
+
+# Seconds spent in each startup phase, reported at GET /startup/metrics
+startup_timings: Dict[str, float] = {}
+
+@contextmanager
+def startup_phase(name: str):
+    start = time.perf_counter()
     try:
-        # Initialize database schema
-        logger.info("Initializing database schema...")
-        init_db()
-        logger.info("Database schema initialized")
-
-        # Test database connection
-        engine = create_engine(settings.SQLALCHEMY_DATABASE_URL, **ENGINE_CONFIG)
-        try:
-            with engine.connect() as conn:
-                conn.execution_options(timeout=10)
-                conn.execute(text("SELECT 1"))
-                for table in DATABASE_TABLES:
-                    try:
-                        conn.execute(text(f"SELECT 1 FROM {table} LIMIT 1"))
-                    except Exception as e:
-                        logger.error(f"Error checking table {table}: {str(e)}")
-                        raise
-        except Exception as e:
-            logger.error(f"Database verification failed: {str(e)}")
-            raise
-    #                 logger.warning(f"Table {table} not found - will be created on first use")
-    #     logger.info("Database connection verified")
-    #     return True
-    except Exception as e:
-        logger.error(f"Database initialization failed: {str(e)}")
-        logger.error(traceback.format_exc())
-        return False
-
-# Initialize database on first load
-try:
-    initialize_database()
-except Exception as e:
-    logger.error(f"Failed to initialize database: {str(e)}")
-    logger.info("Will retry database initialization during startup")
+        yield
+    finally:
+        startup_timings[name] = round(time.perf_counter() - start, 3)
 
 @app.on_event("startup")
 def startup():
@@ -154,18 +132,22 @@ def startup():
         import atexit
         atexit.register(lambda: logger.info("Server shutting down..."))
 
-        # Clean migration state first
-        logger.info("Cleaning database and migration state...")
-
-        
-        # Run migrations on clean state
-        logger.info("Running database migrations...")
-        from .apply_migrations import apply_migrations, reset_migration_state
-        reset_migration_state()
-        apply_migrations()
-
-        # Log loaded routes
-        logger.info("Checking routes are loaded correctly...")
+        with startup_phase("database_connection"):
+            wait_for_database()
+
+        # Upgrade only when the schema is behind; the schema is only dropped
+        # when DB_RESET_ON_STARTUP is set explicitly
+        from .apply_migrations import apply_migrations, migration_status
+        with startup_phase("migrations"):
+            if settings.DB_RESET_ON_STARTUP:
+                logger.warning("DB_RESET_ON_STARTUP is set: all data will be dropped")
+            if settings.DB_MIGRATE_ON_STARTUP or settings.DB_RESET_ON_STARTUP:
+                apply_migrations(reset=settings.DB_RESET_ON_STARTUP)
+            else:
+                status = migration_status()
+                if not status["up_to_date"]:
+                    logger.warning(f"Database schema is at {status['current']}, head is {status['head']}; "
+                                   "run the migrations before serving traffic")
 
         # Ensure data directory exists
         from pathlib import Path
@@ -173,12 +155,14 @@ def startup():
         data_dir.mkdir(exist_ok=True)
         data_dir.chmod(0o777)
         
-        # Populate demo data if in development mode
-        if os.getenv('ENVIRONMENT', 'development') == 'development':
-            logger.info("Populating database with demo data...")
-            from .generate_demo_data import populate_demo_data
-            populate_demo_data()
-            logger.info("Demo data population complete")
+        # Populate demo data into an empty database in development mode
+        if os.getenv('ENVIRONMENT', 'development') == 'development' and settings.DEMO_DATA_ON_STARTUP:
+            with startup_phase("demo_data"):
+                if database_is_empty():
+                    logger.info("Populating database with demo data...")
+                    from .generate_demo_data import populate_demo_data
+                    populate_demo_data()
+                    logger.info("Demo data population complete")
         
         # Log server configuration
         host = os.getenv('HOST', '0.0.0.0')
@@ -201,70 +185,220 @@ def startup():
         logger.error(f"Stack trace: {traceback.format_exc()}")
         raise RuntimeError("Failed to start server")
 
+@app.on_event("startup")
+async def start_background_tasks():
+    """Start background tasks that live on the event loop"""
+    from .ingest_queue import get_ingest_queue
+    from .micro_batching import get_micro_batcher
+    from .network_stats import get_stats
+    with startup_phase("network_stats_seed"):
+        try:
+            # Seed before the ingest queue starts writing, so no row is counted twice
+            await asyncio.get_running_loop().run_in_executor(None, get_stats().seed)
+        except Exception as e:
+            logger.error(f"Failed to seed network stats: {str(e)}")
+    with startup_phase("background_tasks"):
+        await get_stats().start()
+        await get_micro_batcher().start()
+        await get_ingest_queue().start()
+        if settings.PARTITIONING_ENABLED:
+            from .partitioning import get_partition_maintainer
+            await get_partition_maintainer().start()
+    logger.info("Startup took %.2fs: %s", sum(startup_timings.values()),
+                ", ".join(f"{name} {seconds:.2f}s" for name, seconds in startup_timings.items()))
+
 @app.on_event("shutdown")
 def shutdown_event():
     """Cleanup when shutting down the API server"""
     logger.info("API server shutting down...")
 
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    """Stop background tasks started on the event loop"""
+    from .ingest_queue import get_ingest_queue
+    from .micro_batching import get_micro_batcher
+    await get_micro_batcher().stop()
+    await get_ingest_queue().stop()
+    if settings.PARTITIONING_ENABLED:
+        from .partitioning import get_partition_maintainer
+        await get_partition_maintainer().stop()
+    from .network_stats import get_stats
+    await get_stats().stop()
+    try:
+        get_stats().save()
+    except OSError as e:
+        logger.error(f"Failed to save network stats: {str(e)}")
+    await dispose_async_engine()
+
 # API endpoints
 
 @app.get("/stats/network", response_model=NetworkStatsResponse)
-def get_network_stats(db: Session = Depends(get_db)):
+def get_network_stats():
     """
-    Get network statistics with fallback for database issues
+    Get network statistics from the rolling counters kept up to date on ingest
     """
-    try:
-        try:
-            total_logs = db.query(SecurityLog).count()
-            recent_anomalies = db.query(AnomalyDetection).filter(
-                AnomalyDetection.timestamp >= datetime.datetime.utcnow() - datetime.timedelta(hours=24)
-            ).count()
-        except Exception as db_error:
-            logger.warning(f"Database query failed: {str(db_error)}")
-            return {
-                "total_connections": 0,
-                "unique_ips": 0,
-                "last_hour_connections": 0,
-                "timestamp": datetime.datetime.utcnow(),
-                "status": "degraded",
-                "message": "Database currently unavailable"
-            }
-
-        return {
-            "total_connections": total_logs,
-            "unique_ips": 0,
-            "last_hour_connections": recent_anomalies,
-            "timestamp": datetime.datetime.utcnow(),
-            "status": "healthy"
-        }
-    except Exception as e:
-        logger.error(f"Error in network stats endpoint: {str(e)}")
-        return {
-            "status": "error",
-            "message": "Internal server error",
-            "timestamp": datetime.datetime.utcnow()
-        }
+    from .network_stats import get_stats
+    return get_stats().snapshot()
 
-@app.post("/ingest")
-def ingest_log(log_data: LogData, db: Session = Depends(get_db)):
+@app.post("/ingest", status_code=202)
+async def ingest_log(log_data: LogData):
     """
-    Ingest a log entry into the system
+    Queue a log entry for ingestion; it is spooled to disk and written to the
+    database by background tasks, so ingest keeps working during outages
     """
+    from .ingest_queue import get_ingest_queue
+
+    ingest_queue = get_ingest_queue()
+    if not ingest_queue.running:
+        await ingest_queue.start()
     try:
-        log_entry = SecurityLog(
-            timestamp=log_data.timestamp,
-            source=log_data.source,
-            event_type=log_data.event_type,
-            raw_data=str(log_data.data)
-        )
-        db.add(log_entry)
-        db.commit()
-        
-        return {"status": "success", "message": "Log ingested successfully"}
+        written = ingest_queue.enqueue(log_data_to_row(log_data))
+        if ingest_queue.durable:
+            # Acknowledge only once the event is fsynced to the spool
+            await written
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Ingest queue is full",
+                            headers={"Retry-After": str(settings.INGEST_RETRY_AFTER_SECONDS)})
     except Exception as e:
         logger.error(f"Error ingesting log: {str(e)}")
         raise HTTPException(status_code=500, detail="Error ingesting log")
 
+    return {"status": "accepted", "message": "Log queued for ingestion"}
+
+@app.get("/ingest/metrics")
+def get_ingest_metrics():
+    """
+    Queue depth, throughput and flush latency of the ingest pipeline
+    """
+    from .ingest_queue import get_ingest_queue
+    return get_ingest_queue().metrics()
+
+@app.get("/db/metrics")
+def get_database_metrics():
+    """
+    Connection pool checkout wait and in-use connections of the shared engines
+    """
+    return get_pool_metrics()
+
+@app.get("/db/partitions")
+def get_partition_metrics():
+    """
+    Partition maintenance runs, created and expired partitions
+    """
+    from .partitioning import get_partition_maintainer
+    return get_partition_maintainer().metrics()
+
+@app.get("/startup/metrics")
+def get_startup_metrics():
+    """
+    Seconds spent in each phase of the last startup
+    """
+    return startup_timings
+
+@app.get("/cache/metrics")
+def get_cache_metrics():
+    """
+    Hits, misses and 304 answers of the response cache for polled endpoints
+    """
+    return get_response_cache().metrics()
+
+@app.get("/events")
+async def stream_events(
+    types: Optional[List[str]] = Query(None, description="log, anomaly and/or threat"),
+    source: Optional[str] = Query(None, description="Only logs from this source"),
+    event_type: Optional[str] = Query(None, description="Only logs of this type"),
+    severity: Optional[List[str]] = Query(None, description="Only anomalies/threats of these severities")
+):
+    """
+    Server-sent events for newly written logs, anomalies and threats
+    """
+    try:
+        event_filter = EventFilter(types=types, source=source, event_type=event_type, severity=severity)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    hub = get_event_hub()
+    try:
+        subscriber = hub.subscribe(event_filter)
+    except OverflowError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return StreamingResponse(
+        hub.stream(subscriber, settings.EVENT_FEED_KEEPALIVE_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/events/metrics")
+def get_event_metrics():
+    """
+    Connected clients, delivered events and dropped slow clients of the event feed
+    """
+    return get_event_hub().metrics()
+
+@app.post("/ingest/batch", response_model=BatchIngestResponse)
+async def ingest_batch(request: Request, db: Session = Depends(get_db)):
+    """
+    Ingest a batch of log entries sent as a JSON array or NDJSON body
+    """
+    body = await request.body()
+    try:
+        records = iter_batch_records(body, request.headers.get("content-type", ""))
+        rows, errors, rejected = validate_batch(records)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        accepted = await run_in_threadpool(bulk_insert_security_logs, db, rows,
+                                           on_commit=record_committed_logs)
+    except Exception as e:
+        logger.error(f"Error ingesting log batch: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error ingesting log batch")
+
+    return {
+        "status": "success" if not rejected else "partial",
+        "accepted": accepted,
+        "rejected": rejected,
+        "errors": errors
+    }
+
+@app.post("/ingest/stream")
+async def ingest_stream(request: Request, source: str, upload_id: Optional[str] = None,
+                        strict: bool = True, db: Session = Depends(get_db)):
+    """
+    Stream a (optionally gzip/zstd compressed) NDJSON export line by line.
+    Progress can be polled at /ingest/stream/{upload_id} while the upload runs.
+    Trusted sources can pass strict=false to skip per-record validation.
+    """
+    if source not in ('zeek', 'suricata', 'osquery'):
+        raise HTTPException(status_code=400, detail=f"Unsupported log source: {source}")
+
+    encoding = request.headers.get("content-encoding", "identity").lower()
+    if encoding not in SUPPORTED_STREAM_ENCODINGS:
+        raise HTTPException(status_code=415, detail=f"Unsupported content encoding: {encoding}")
+
+    progress = start_stream_progress(source, encoding, upload_id)
+    try:
+        await ingest_ndjson_stream(db, source, request.stream(), progress, strict=strict,
+                                   on_commit=record_committed_logs)
+    except DECOMPRESSION_ERRORS as e:
+        raise HTTPException(status_code=400, detail=f"Corrupt {encoding} body: {str(e)}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in streaming ingest {progress.upload_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error ingesting log stream")
+
+    return progress.to_dict()
+
+@app.get("/ingest/stream/{upload_id}")
+def get_ingest_stream_progress(upload_id: str):
+    """
+    Get progress and throughput of a streaming upload
+    """
+    progress = get_stream_progress(upload_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return progress.to_dict()
+
 @app.post("/analyze")
 def analyze_log(analysis_request: AnalysisRequest):
     """
@@ -278,39 +412,202 @@ def analyze_log(analysis_request: AnalysisRequest):
         raise HTTPException(status_code=500, detail="Error analyzing log")
 
 @app.post("/detect")
-def detect_anomaly(anomaly_data: AnomalyData, db: Session = Depends(get_db)):
+async def detect_anomaly(anomaly_data: AnomalyData, db: AsyncSession = Depends(get_async_db)):
     """
     Process potential anomaly detection
     """
     try:
         anomaly = AnomalyDetection(
             timestamp=anomaly_data.timestamp,
-            source=anomaly_data.source,
-            metrics=str(anomaly_data.metrics),
-            alert_level=anomaly_data.alert_level
+            detection_type=anomaly_data.source,
+            source_data=anomaly_data.metrics,
+            impact_severity=anomaly_data.alert_level
         )
         db.add(anomaly)
-        db.commit()
+        await db.commit()
+        from .network_stats import get_stats
+        get_stats().record_anomalies([anomaly.timestamp])
+        invalidate_responses("anomalies")
+        get_event_hub().publish("anomaly", [anomaly_event(anomaly)])
         
         return {"status": "success", "alert_level": anomaly_data.alert_level}
     except Exception as e:
         logger.error(f"Error in anomaly detection: {str(e)}")
         raise HTTPException(status_code=500, detail="Error processing anomaly")
 
+@app.post("/detect/score", response_model=ScoringResult)
+async def detect_score(request: ScoringRequest):
+    """
+    Score one feature vector; concurrent requests are micro-batched together
+    """
+    from .anomaly_detection import get_detector
+    from .micro_batching import get_micro_batcher
+
+    if not get_detector().is_trained:
+        raise HTTPException(status_code=503, detail="Anomaly detection model is not trained")
+
+    try:
+        return await get_micro_batcher().submit(request.features)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Scoring queue is full",
+                            headers={"Retry-After": "1"})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in anomaly scoring: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error scoring features")
+
+@app.get("/detect/live")
+async def detect_live(source: str = Query("zeek", description="zeek, suricata or osquery")):
+    """
+    Features of the sliding window of freshly ingested logs of a source, scored
+    by the anomaly model when it was trained on that source's features
+    """
+    from .anomaly_detection import get_detector
+    from .feature_extraction import WindowedFeatureAggregator
+    from .live_features import get_live_features
+    from .micro_batching import get_micro_batcher
+
+    if source not in WindowedFeatureAggregator.state_classes:
+        raise HTTPException(status_code=400, detail=f"Unsupported log source: {source}")
+    live = get_live_features()
+    features = live.features(source)
+
+    score = None
+    if get_detector().is_trained:
+        try:
+            score = await get_micro_batcher().submit(features)
+        except ValueError:
+            # Model trained on another source's feature layout, or NaN features
+            score = None
+        except asyncio.QueueFull:
+            raise HTTPException(status_code=503, detail="Scoring queue is full",
+                                headers={"Retry-After": "1"})
+    return {
+        "source": source,
+        "window_minutes": live.window_minutes,
+        "features": {name: None if value != value else value
+                     for name, value in zip(live.feature_names(source), features)},
+        "score": score
+    }
+
+@app.post("/detect/batch", response_model=BatchScoringResponse)
+def detect_batch(request: BatchScoringRequest):
+    """
+    Score a matrix of feature vectors with the anomaly detection model
+    """
+    from .anomaly_detection import get_detector
+
+    detector = get_detector()
+    if not detector.is_trained:
+        raise HTTPException(status_code=503, detail="Anomaly detection model is not trained")
+    if not request.features:
+        return {"results": [], "rows": 0, "elapsed_ms": 0.0, "rows_per_second": 0.0}
+
+    start = time.perf_counter()
+    try:
+        results = detector.bulk_detect(request.features)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in batch anomaly scoring: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error scoring feature batch")
+    elapsed = time.perf_counter() - start
+
+    return {
+        "results": results,
+        "rows": len(results),
+        "elapsed_ms": round(elapsed * 1000, 3),
+        "rows_per_second": round(len(results) / elapsed, 1) if elapsed > 0 else 0.0
+    }
+
+@app.post("/model/train", status_code=202)
+def train_model(request: TrainingRequest):
+    """
+    Start a background training job over historical security logs
+    """
+    from .training import start_training_job
+
+    if request.source not in ('zeek', 'suricata', 'osquery'):
+        raise HTTPException(status_code=400, detail=f"Unsupported log source: {request.source}")
+    if request.window_minutes <= 0:
+        raise HTTPException(status_code=400, detail="window_minutes must be positive")
+
+    job = start_training_job(
+        source=request.source,
+        window_minutes=request.window_minutes,
+        max_samples=request.max_samples or settings.TRAINING_MAX_SAMPLES,
+        since=request.since,
+        until=request.until
+    )
+    return job.to_dict()
+
+@app.get("/model/train/{job_id}")
+def get_training_progress(job_id: str):
+    """
+    Get progress of a background training job
+    """
+    from .training import get_training_job
+
+    job = get_training_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Training job not found")
+    return job.to_dict()
+
+@app.get("/model", response_model=ModelMetrics)
+def get_model_metrics():
+    """
+    Get metadata of the active anomaly detection model
+    """
+    from .anomaly_detection import get_detector
+
+    detector = get_detector()
+    detector.reload_if_changed()
+    if not detector.is_trained:
+        raise HTTPException(status_code=503, detail="Anomaly detection model is not trained")
+    return detector.metrics()
+
+@app.get("/model/versions")
+def list_model_versions():
+    """
+    List stored model versions, newest first
+    """
+    from .anomaly_detection import get_detector
+
+    registry = get_detector().registry
+    return {
+        "current": registry.current_version() if registry else None,
+        "versions": registry.list_versions() if registry else []
+    }
+
+@app.post("/model/versions/{version}/activate")
+def activate_model_version(version: str):
+    """
+    Hot-swap the active model to a stored version
+    """
+    from .anomaly_detection import get_detector
+
+    try:
+        get_detector().activate(version)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"status": "success", "version": version}
+
 @app.post("/respond")
-def trigger_response(response: ResponseAction, db: Session = Depends(get_db)):
+async def trigger_response(response: ResponseAction, db: AsyncSession = Depends(get_async_db)):
     """
     Trigger a response action
     """
     try:
         action_log = DBResponseAction(
             action_type=response.action_type,
-            target=response.target,
-            parameters=str(response.parameters) if response.parameters else None,
+            target_system=response.target,
+            action_details=response.parameters,
             timestamp=datetime.datetime.utcnow()
         )
         db.add(action_log)
-        db.commit()
+        await db.commit()
+        invalidate_responses("threats")
         
         return {"status": "success", "action": "Response action triggered"}
     except Exception as e:
@@ -342,14 +639,37 @@ def system_health():
 
 # Removed duplicate /stats/network endpoint
 
-@app.get("/logs")
-def get_logs(db: Session = Depends(get_db)):
+@app.get("/logs", response_model=LogPage)
+async def get_logs(source: Optional[str] = None, event_type: Optional[str] = None,
+                   since: Optional[datetime.datetime] = None, until: Optional[datetime.datetime] = None,
+                   limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                   cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
     """
-    Get recent security logs
+    Page through security logs, newest first; pass next_cursor back as cursor
+    to get the following page
     """
+    statement = select(
+        SecurityLog.id, SecurityLog.timestamp, SecurityLog.log_type,
+        SecurityLog.source, SecurityLog.message, SecurityLog.threat_id
+    )
+    if source is not None:
+        statement = statement.filter(SecurityLog.source == source)
+    if event_type is not None:
+        statement = statement.filter(SecurityLog.log_type == event_type)
+    if since is not None:
+        statement = statement.filter(SecurityLog.timestamp >= since)
+    if until is not None:
+        statement = statement.filter(SecurityLog.timestamp < until)
+
+    try:
+        statement = keyset_page(statement, SecurityLog.timestamp, SecurityLog.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
-        logs = db.query(SecurityLog).order_by(SecurityLog.timestamp.desc()).limit(100).all()
-        return {"logs": logs}
+        result = await db.execute(statement)
+        rows, next_cursor = split_page(result.all(), limit)
+        return {"logs": [dict(row._mapping) for row in rows], "next_cursor": next_cursor}
     except Exception as e:
         logger.error(f"Error fetching logs: {str(e)}")
         raise HTTPException(status_code=500, detail="Error retrieving logs")
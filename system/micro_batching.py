@@ -0,0 +1,179 @@
+"""Async micro-batching in front of AnomalyDetector."""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .anomaly_detection import AnomalyDetector, get_detector
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Collect single feature vectors and score them together.
+
+    Callers await ``submit``; vectors are gathered until ``max_batch_size``
+    rows are pending or the oldest one has waited ``max_latency_ms``, then the
+    whole batch is scored with one ``score_samples`` call in a worker thread so
+    the event loop is never blocked by the model. Vectors are validated on
+    submit, so a malformed one fails only its own request; should a batch
+    still fail, its rows are scored one by one.
+    """
+
+    def __init__(self, detector: Optional[AnomalyDetector] = None,
+                 max_batch_size: int = 256, max_latency_ms: float = 5.0,
+                 max_pending: int = 10000):
+        self.detector = detector
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000.0
+        self.max_pending = max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.batches_scored = 0
+        self.rows_scored = 0
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self):
+        """Start the background batching task."""
+        if self.running:
+            return
+        if self.detector is None:
+            self.detector = get_detector()
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            f"Micro-batcher started (max {self.max_batch_size} rows / {self.max_latency * 1000:.1f} ms)"
+        )
+
+    async def stop(self):
+        """Stop the batching task, failing any requests still queued."""
+        if not self.running:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher stopped"))
+        self._worker = None
+
+    def _validate(self, features: List[float]) -> np.ndarray:
+        """Feature vector as a float row, or ValueError if the model cannot score it."""
+        try:
+            row = np.asarray(features, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError("Features must be a list of numbers")
+        if row.ndim != 1:
+            raise ValueError("Features must be a flat list of numbers")
+        n_features = getattr(self.detector.model, "n_features_in_", None)
+        if n_features is not None and len(row) != n_features:
+            raise ValueError(f"Expected {n_features} features, got {len(row)}")
+        if not np.isfinite(row).all():
+            raise ValueError("Features must be finite numbers")
+        return row
+
+    async def submit(self, features: List[float]) -> Dict[str, Any]:
+        """Queue one feature vector and wait for its score.
+
+        Raises ValueError for a vector the model cannot score, without
+        queueing it.
+        """
+        if not self.running:
+            await self.start()
+        row = self._validate(features)
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((row, future))
+        return await future
+
+    async def _collect(self, batch: List[Tuple[np.ndarray, asyncio.Future]]):
+        """Wait for the first request, then gather more into ``batch`` until full or timed out."""
+        batch.append(await self._queue.get())
+        deadline = time.monotonic() + self.max_latency
+
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[Tuple[np.ndarray, asyncio.Future]] = []
+            try:
+                await self._collect(batch)
+                await self._score(loop, batch)
+            except asyncio.CancelledError:
+                # Requests already taken off the queue would otherwise wait forever
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("Micro-batcher stopped"))
+                raise
+
+    async def _score(self, loop: asyncio.AbstractEventLoop, batch: List[Tuple[np.ndarray, asyncio.Future]]):
+        """Score a collected batch and resolve its futures."""
+        # Rows of different widths cannot share a matrix (the model may have
+        # been swapped for one of another width since they were validated)
+        groups: Dict[int, List[Tuple[np.ndarray, asyncio.Future]]] = {}
+        for item in batch:
+            groups.setdefault(len(item[0]), []).append(item)
+
+        for items in groups.values():
+            await self._score_group(loop, items)
+
+    async def _score_group(self, loop: asyncio.AbstractEventLoop, items: List[Tuple[np.ndarray, asyncio.Future]]):
+        """Score rows of one width together, falling back to one by one on failure."""
+        try:
+            matrix = np.vstack([row for row, _ in items])
+            result = await loop.run_in_executor(None, self.detector.score_batch, matrix)
+        except Exception as e:
+            if len(items) > 1:
+                logger.warning(f"Micro-batch of {len(items)} rows failed ({str(e)}), scoring rows one by one")
+                for item in items:
+                    await self._score_group(loop, [item])
+                return
+            logger.error(f"Error scoring micro-batch: {str(e)}")
+            _, future = items[0]
+            if not future.done():
+                future.set_exception(e)
+            return
+
+        for i, (_, future) in enumerate(items):
+            if not future.done():
+                future.set_result({
+                    "is_anomaly": bool(result["is_anomaly"][i]),
+                    "anomaly_score": float(result["anomaly_score"][i]),
+                    "raw_score": float(result["raw_score"][i])
+                })
+        self.batches_scored += 1
+        self.rows_scored += len(items)
+
+
+_micro_batcher: Optional[MicroBatcher] = None
+
+def get_micro_batcher() -> MicroBatcher:
+    """Shared MicroBatcher configured from settings."""
+    global _micro_batcher
+    if _micro_batcher is None:
+        _micro_batcher = MicroBatcher(
+            max_batch_size=settings.DETECT_BATCH_MAX_ROWS,
+            max_latency_ms=settings.DETECT_BATCH_MAX_LATENCY_MS
+        )
+    return _micro_batcher
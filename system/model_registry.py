@@ -0,0 +1,141 @@
+"""Versioned on-disk registry for anomaly detection models.
+
+Layout::
+
+    <root>/
+        CURRENT                    # name of the active version
+        versions/
+            <version>/
+                model.joblib       # uncompressed, so arrays can be memory-mapped
+                metadata.json
+
+Version directories are written under a temporary name and renamed into
+place, and the CURRENT pointer is replaced atomically, so readers never see
+a half-written model. Artifacts are loaded with joblib ``mmap_mode`` so the
+NumPy arrays inside them (notably the flattened forest used by the "flat"
+inference backend) are shared between worker processes through the page
+cache instead of being copied into every process.
+"""
+import json
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FILENAME = "model.joblib"
+METADATA_FILENAME = "metadata.json"
+CURRENT_POINTER = "CURRENT"
+
+
+class ModelRegistry:
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or settings.MODEL_REGISTRY_DIR
+        self.versions_dir = os.path.join(self.root, "versions")
+
+    def _version_dir(self, version: str) -> str:
+        if not version or os.sep in version or version.startswith("."):
+            raise ValueError(f"Invalid model version: {version}")
+        return os.path.join(self.versions_dir, version)
+
+    def current_version(self) -> Optional[str]:
+        """Name of the active version, or None if nothing was activated yet."""
+        try:
+            with open(os.path.join(self.root, CURRENT_POINTER)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def exists(self, version: str) -> bool:
+        return os.path.isfile(os.path.join(self._version_dir(version), ARTIFACT_FILENAME))
+
+    def activate(self, version: str):
+        """Atomically point CURRENT at an existing version."""
+        if not self.exists(version):
+            raise ValueError(f"Unknown model version: {version}")
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".current-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(version)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, os.path.join(self.root, CURRENT_POINTER))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        logger.info(f"Activated model version {version}")
+
+    def save(self, artifact: Dict[str, Any], metadata: Dict[str, Any], activate: bool = True) -> str:
+        """Write a new immutable version and optionally make it current."""
+        os.makedirs(self.versions_dir, exist_ok=True)
+        version = datetime.utcnow().strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:8]
+        metadata = dict(metadata, version=version)
+
+        import joblib
+        staging = tempfile.mkdtemp(dir=self.versions_dir, prefix=".staging-")
+        try:
+            # No compression: compressed arrays cannot be memory-mapped
+            joblib.dump(artifact, os.path.join(staging, ARTIFACT_FILENAME))
+            with open(os.path.join(staging, METADATA_FILENAME), "w") as f:
+                json.dump(metadata, f, indent=2, default=str)
+            os.rename(staging, self._version_dir(version))
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        logger.info(f"Saved model version {version}")
+        if activate:
+            self.activate(version)
+        return version
+
+    def metadata(self, version: str) -> Dict[str, Any]:
+        with open(os.path.join(self._version_dir(version), METADATA_FILENAME)) as f:
+            return json.load(f)
+
+    def load(self, version: Optional[str] = None,
+             mmap_mode: Optional[str] = "r") -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Load the artifact and metadata of a version (default: current)."""
+        version = version or self.current_version()
+        if version is None:
+            raise ValueError("No model version has been activated")
+        import joblib
+        artifact = joblib.load(os.path.join(self._version_dir(version), ARTIFACT_FILENAME),
+                               mmap_mode=mmap_mode)
+        return artifact, self.metadata(version)
+
+    def list_versions(self) -> List[Dict[str, Any]]:
+        """Metadata of every stored version, newest first."""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        current = self.current_version()
+        versions = []
+        for name in sorted(os.listdir(self.versions_dir), reverse=True):
+            if name.startswith(".") or not self.exists(name):
+                continue
+            metadata = self.metadata(name)
+            metadata["current"] = name == current
+            versions.append(metadata)
+        return versions
+
+    def prune(self, keep: int = 5) -> List[str]:
+        """Delete all but the newest ``keep`` versions; never the current one.
+
+        Processes that still have a removed version memory-mapped keep
+        working, the pages stay alive until they are unmapped.
+        """
+        current = self.current_version()
+        removed = []
+        for metadata in self.list_versions()[keep:]:
+            if metadata["version"] == current:
+                continue
+            shutil.rmtree(self._version_dir(metadata["version"]), ignore_errors=True)
+            removed.append(metadata["version"])
+        return removed
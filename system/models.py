@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Integer, JSON
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Integer, JSON, Index, text
 import uuid
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -42,6 +42,11 @@ class SecurityLog(Base):
     threat_id = Column(String, ForeignKey('threats.id', ondelete='CASCADE'))
     threat = relationship("Threat", back_populates="logs")
 
+    __table_args__ = (
+        # /logs: keyset pages ordered by (timestamp, id) DESC
+        Index("ix_security_logs_timestamp_id", "timestamp", "id"),
+    )
+
 class AnomalyDetection(Base):
     __tablename__ = "anomaly_detections"
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -55,6 +60,11 @@ class AnomalyDetection(Base):
     false_positive = Column(Integer, default=0)
     additional_info = Column(JSON)  # Renamed 'metadata' to 'additional_info'
 
+    __table_args__ = (
+        # Trailing 24h window counted when the network stats are seeded
+        Index("ix_anomaly_detections_timestamp", "timestamp"),
+    )
+
 class ResponseActionLog(Base):
     __tablename__ = "response_action_logs"
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -81,6 +91,15 @@ class Threat(Base):
     source_ip = Column(String)
     target_system = Column(String)
     
+    __table_args__ = (
+        # /threats: keyset pages of one status ordered by (timestamp, id) DESC
+        Index("ix_threats_status_timestamp_id", "status", "timestamp", "id"),
+        # /threats only reads active threats, a small share of the table
+        Index("ix_threats_active_timestamp", "timestamp",
+              postgresql_where=text("status = 'active'"),
+              sqlite_where=text("status = 'active'")),
+    )
+
     # Relationships
     logs = relationship(
         "SecurityLog",
@@ -0,0 +1,294 @@
+"""Rolling network counters maintained as events are written.
+
+``/stats/network`` and ``/threats`` used to count ``security_logs`` and
+``anomaly_detections`` on every request. ``NetworkStats`` keeps the same
+numbers in memory instead:
+
+* total connections;
+* connections in the last hour and anomalies in the last 24 hours, as
+  per-bucket counts keyed on the event timestamp;
+* distinct IP addresses, estimated with a HyperLogLog sketch whose
+  registers are saved to ``NETWORK_STATS_STATE_PATH`` on shutdown.
+
+``record_committed_logs`` (run by the API write paths) and the anomaly
+writers update it after each commit, so reads are O(1). The counters are per process and only see this
+process's writes: rows written by other API workers, ``backfill.py`` or
+partition retention are picked up when the first three counters are
+reloaded from the database every ``NETWORK_STATS_RESEED_SECONDS``. A failed
+load is retried after ``RETRY_SECONDS``. The distinct-IP sketch cannot be
+rebuilt that cheaply, so it only counts addresses this process has seen
+(plus the saved registers).
+"""
+import asyncio
+import calendar
+import hashlib
+import logging
+import math
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import Integer, cast, extract, func, select
+
+from .config import settings
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# additional_info keys holding IP addresses, across the supported sources
+IP_FIELDS = ("source_ip", "dest_ip", "src_ip", "id.orig_h", "id.resp_h")
+
+LAST_HOUR_BUCKET_SECONDS = 60
+ANOMALY_BUCKET_SECONDS = 300
+RETRY_SECONDS = 30.0
+
+
+def _epoch(timestamp: datetime) -> int:
+    """Seconds since the epoch of a naive UTC datetime."""
+    return calendar.timegm(timestamp.utctimetuple())
+
+
+class HyperLogLog:
+    """Distinct-count sketch with 2**precision one-byte registers.
+
+    The harmonic sum and the number of empty registers are kept up to date
+    as registers grow, so ``count`` does not walk the registers.
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+        self._alpha = 0.7213 / (1 + 1.079 / self.size)
+        self._reset_sums()
+
+    def _reset_sums(self):
+        self._inverse_sum = sum(2.0 ** -register for register in self.registers)
+        self._zeros = self.registers.count(0)
+
+    def add(self, value: str):
+        digest = int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+        index = digest >> (64 - self.precision)
+        remaining = digest & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        current = self.registers[index]
+        if rank > current:
+            self._inverse_sum += 2.0 ** -rank - 2.0 ** -current
+            if current == 0:
+                self._zeros -= 1
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        estimate = self._alpha * self.size * self.size / self._inverse_sum
+        if estimate <= 2.5 * self.size and self._zeros:
+            # Linear counting is more accurate while many registers are empty
+            estimate = self.size * math.log(self.size / self._zeros)
+        return int(round(estimate))
+
+    def merge(self, registers: bytes):
+        """Fold in the registers of another sketch of the same precision."""
+        if len(registers) != self.size:
+            raise ValueError(f"Expected {self.size} HyperLogLog registers, got {len(registers)}")
+        self.registers = bytearray(max(pair) for pair in zip(self.registers, registers))
+        self._reset_sums()
+
+
+class RollingCounter:
+    """Event count over the trailing ``window_seconds``, in fixed-width buckets."""
+
+    def __init__(self, window_seconds: int, bucket_seconds: int):
+        self.window_buckets = window_seconds // bucket_seconds
+        self.bucket_seconds = bucket_seconds
+        self._buckets: Dict[int, int] = {}
+        self._total = 0
+        self._oldest = 0
+
+    def _expire(self, now: int):
+        oldest = now // self.bucket_seconds - self.window_buckets + 1
+        if oldest <= self._oldest:
+            return
+        self._oldest = oldest
+        for bucket in [bucket for bucket in self._buckets if bucket < oldest]:
+            self._total -= self._buckets.pop(bucket)
+
+    def add(self, epoch: int, count: int = 1, now: Optional[int] = None):
+        self._expire(now if now is not None else _epoch(datetime.utcnow()))
+        bucket = epoch // self.bucket_seconds
+        if bucket < self._oldest:
+            return
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + count
+        self._total += count
+
+    def total(self, now: Optional[int] = None) -> int:
+        self._expire(now if now is not None else _epoch(datetime.utcnow()))
+        return self._total
+
+
+class NetworkStats:
+    """Counters behind /stats/network and the /threats threat level."""
+
+    def __init__(self, state_path: Optional[str] = None, reseed_interval: float = 300.0):
+        self.state_path = state_path
+        self.reseed_interval = reseed_interval
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.total_connections = 0
+        self.last_hour = RollingCounter(3600, LAST_HOUR_BUCKET_SECONDS)
+        self.anomalies = RollingCounter(24 * 3600, ANOMALY_BUCKET_SECONDS)
+        self.unique_ips = HyperLogLog()
+        self.seeded = False
+        self.sketch_loaded = False
+        self.seed_errors = 0
+        self.last_seeded: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Reload the counters from the database in the background."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self.reseed_interval > 0 or not self.seeded:
+            await asyncio.sleep(self.reseed_interval if self.seeded else RETRY_SECONDS)
+            try:
+                await loop.run_in_executor(None, self.seed)
+            except Exception as e:
+                logger.error(f"Failed to reload network stats: {str(e)}")
+                self.seed_errors += 1
+                self.last_error = str(e)
+
+    def record_logs(self, rows: Iterable[Dict[str, Any]]):
+        """Count security_logs rows that were just committed."""
+        now = _epoch(datetime.utcnow())
+        with self._lock:
+            for row in rows:
+                self.total_connections += 1
+                self.last_hour.add(_epoch(row["timestamp"]), now=now)
+                info = row.get("additional_info")
+                if isinstance(info, dict):
+                    for field in IP_FIELDS:
+                        ip = info.get(field)
+                        if ip:
+                            self.unique_ips.add(str(ip))
+
+    def record_anomalies(self, timestamps: Iterable[datetime]):
+        """Count anomaly_detections rows that were just committed."""
+        now = _epoch(datetime.utcnow())
+        with self._lock:
+            for timestamp in timestamps:
+                self.anomalies.add(_epoch(timestamp), now=now)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "total_connections": self.total_connections,
+                "unique_ips": self.unique_ips.count(),
+                "last_hour_connections": self.last_hour.total(),
+                "recent_anomalies": self.anomalies.total()
+            }
+
+    def seed(self):
+        """Load the counters from the database, replacing the current values.
+
+        Rows are grouped into the counters' buckets by the database, so only
+        a few hundred bucket counts come back. Rows committed while the
+        queries run may be missed until the next reload. The distinct-IP
+        sketch is restored from ``state_path`` on the first load only.
+        """
+        from .models import AnomalyDetection, SecurityLog
+
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            total = db.query(func.count(SecurityLog.id)).scalar() or 0
+            last_hour = _bucket_counts(db, SecurityLog.timestamp, now, 3600, LAST_HOUR_BUCKET_SECONDS)
+            anomalies = _bucket_counts(db, AnomalyDetection.timestamp, now, 24 * 3600, ANOMALY_BUCKET_SECONDS)
+        finally:
+            db.close()
+
+        registers = None
+        if not self.sketch_loaded and self.state_path and os.path.exists(self.state_path):
+            with open(self.state_path, "rb") as f:
+                registers = f.read()
+
+        epoch_now = _epoch(now)
+        last_hour_counter = RollingCounter(3600, LAST_HOUR_BUCKET_SECONDS)
+        for bucket_start, count in last_hour:
+            last_hour_counter.add(bucket_start, count, now=epoch_now)
+        anomaly_counter = RollingCounter(24 * 3600, ANOMALY_BUCKET_SECONDS)
+        for bucket_start, count in anomalies:
+            anomaly_counter.add(bucket_start, count, now=epoch_now)
+
+        with self._lock:
+            self.total_connections = total
+            self.last_hour = last_hour_counter
+            self.anomalies = anomaly_counter
+            if registers is not None:
+                try:
+                    self.unique_ips.merge(registers)
+                except ValueError as e:
+                    logger.warning(f"Ignoring unique IP sketch in {self.state_path}: {str(e)}")
+            self.sketch_loaded = True
+            first_load = not self.seeded
+            self.seeded = True
+            self.last_seeded = now
+        if first_load:
+            logger.info(f"Network stats seeded: {total} connections")
+
+    def save(self):
+        """Persist the distinct-IP sketch so a restart keeps the estimate."""
+        if not self.state_path:
+            return
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            registers = bytes(self.unique_ips.registers)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(registers)
+        os.replace(tmp_path, self.state_path)
+
+
+def bucket_count_query(column, since: datetime, bucket_seconds: int):
+    """Rows per ``bucket_seconds`` bucket (by epoch of ``column``) since ``since``."""
+    epoch = cast(extract('epoch', column), Integer)
+    bucket = (epoch - epoch % bucket_seconds).label("bucket")
+    return select(bucket, func.count()).filter(column >= since).group_by(bucket)
+
+
+def _bucket_counts(db, column, now: datetime, window_seconds: int, bucket_seconds: int) -> List:
+    """(bucket start epoch, row count) pairs for rows in the trailing window."""
+    since = now - timedelta(seconds=window_seconds)
+    rows = db.execute(bucket_count_query(column, since, bucket_seconds)).all()
+    return [(int(bucket_start), count) for bucket_start, count in rows]
+
+
+_network_stats: Optional[NetworkStats] = None
+
+def get_stats() -> NetworkStats:
+    """Shared NetworkStats configured from settings."""
+    global _network_stats
+    if _network_stats is None:
+        _network_stats = NetworkStats(state_path=settings.NETWORK_STATS_STATE_PATH,
+                                      reseed_interval=settings.NETWORK_STATS_RESEED_SECONDS)
+    return _network_stats
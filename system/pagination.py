@@ -0,0 +1,58 @@
+"""Keyset (cursor) pagination on (timestamp, id), newest first.
+
+A page is fetched with ``WHERE (timestamp, id) < (cursor) ORDER BY timestamp
+DESC, id DESC LIMIT n`` instead of an OFFSET, so the database seeks straight
+into the ``(timestamp, id)`` index and page 1000 costs the same as page 1.
+The cursor handed to clients is the opaque, URL-safe encoding of the last
+row's timestamp and id.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+
+# Page size limits of the paginated endpoints
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(timestamp: datetime, row_id: str) -> str:
+    payload = json.dumps([timestamp.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of ``encode_cursor``; raises ValueError for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(timestamp), str(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor}") from e
+
+
+def keyset_page(statement, timestamp_column, id_column, cursor: Optional[str], limit: int):
+    """Restrict ``statement`` to the page after ``cursor``.
+
+    One extra row is fetched so ``split_page`` can tell whether another page
+    follows. The leading ``timestamp <=`` bound keeps the predicate usable by
+    a plain timestamp index as well as by the composite one.
+    """
+    if cursor is not None:
+        after_timestamp, after_id = decode_cursor(cursor)
+        statement = statement.filter(and_(
+            timestamp_column <= after_timestamp,
+            or_(timestamp_column < after_timestamp, id_column < after_id)
+        ))
+    return statement.order_by(timestamp_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def split_page(rows: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Rows of the page and the cursor of the next one (None on the last page)."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].timestamp, rows[-1].id)
@@ -0,0 +1,354 @@
+"""Daily range partitions for the time-series tables (PostgreSQL only).
+
+With ``PARTITIONING_ENABLED`` the ``d4e8a1b7c9f2`` migration turns
+``security_logs`` and ``anomaly_detections`` into tables partitioned by
+range on ``timestamp``, one partition per day::
+
+    security_logs
+        security_logs_p20240314   FOR VALUES FROM ('2024-03-14') TO ('2024-03-15')
+        security_logs_p20240315   ...
+        security_logs_default     rows outside every daily partition
+
+``PartitionMaintainer`` runs in the API process. It keeps
+``PARTITION_PREMAKE_DAYS`` of future partitions in place so inserts never
+land in the default partition. It also expires partitions older than
+``PARTITION_RETENTION_DAYS``: with the ``drop`` action they are dropped;
+with ``archive`` they are detached and moved into
+``PARTITION_ARCHIVE_SCHEMA``. Tables that are not partitioned are left
+alone, so the job is a no-op on SQLite or on an unpartitioned database.
+When ``PARTITIONING_ENABLED`` is set but the tables are not partitioned
+(the flag was turned on after the migration ran), every pass logs an error.
+Convert them explicitly with::
+
+    python -m system.partitioning partition     # or: unpartition, status
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from .config import settings
+from .database import engine
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("security_logs", "anomaly_detections")
+RETENTION_ACTIONS = ("drop", "archive")
+
+PARTITION_SUFFIX = "_p"
+PARTITION_DATE_FORMAT = "%Y%m%d"
+
+SECURITY_LOGS_THREAT_FK = (
+    "ALTER TABLE security_logs ADD CONSTRAINT security_logs_threat_id_fkey "
+    "FOREIGN KEY (threat_id) REFERENCES threats (id) ON DELETE CASCADE"
+)
+
+
+def partition_name(table: str, day: date) -> str:
+    return f"{table}{PARTITION_SUFFIX}{day.strftime(PARTITION_DATE_FORMAT)}"
+
+
+def partition_day(table: str, name: str) -> Optional[date]:
+    """Day covered by a daily partition of ``table``, None for any other child."""
+    prefix = f"{table}{PARTITION_SUFFIX}"
+    if not name.startswith(prefix):
+        return None
+    try:
+        return datetime.strptime(name[len(prefix):], PARTITION_DATE_FORMAT).date()
+    except ValueError:
+        return None
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(conn.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"),
+        {"table": table}
+    ).scalar())
+
+
+def list_partitions(conn: Connection, table: str) -> List[str]:
+    rows = conn.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = to_regclass(:table)
+        ORDER BY child.relname
+    """), {"table": table})
+    return [row[0] for row in rows]
+
+
+def create_partitions(conn: Connection, table: str, start: date, end: date) -> List[str]:
+    """Create the missing daily partitions of ``table`` for start..end (inclusive)."""
+    existing = set(list_partitions(conn, table))
+    created = []
+    day = start
+    while day <= end:
+        name = partition_name(table, day)
+        if name not in existing:
+            conn.execute(text(
+                f'CREATE TABLE {name} PARTITION OF {table} '
+                f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+            ))
+            created.append(name)
+        day += timedelta(days=1)
+    return created
+
+
+def expire_partitions(conn: Connection, table: str, cutoff: date, action: str = "drop",
+                      archive_schema: str = "archive") -> List[str]:
+    """Drop or archive the daily partitions of ``table`` that end on or before ``cutoff``.
+
+    Rows older than ``cutoff`` that ended up in the default partition are
+    deleted too (after being copied to ``<archive_schema>.<table>_expired``
+    when archiving).
+    """
+    if action not in RETENTION_ACTIONS:
+        raise ValueError(f"Unknown partition retention action: {action}")
+
+    if action == "archive":
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+
+    expired = []
+    for name in list_partitions(conn, table):
+        day = partition_day(table, name)
+        if day is None or day >= cutoff:
+            continue
+        if action == "drop":
+            conn.execute(text(f"DROP TABLE {name}"))
+        else:
+            conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+        expired.append(name)
+
+    default = f"{table}_default"
+    if default in list_partitions(conn, table):
+        if action == "archive":
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {archive_schema}.{table}_expired (LIKE {table})"
+            ))
+            conn.execute(text(
+                f'INSERT INTO {archive_schema}.{table}_expired '
+                f'SELECT * FROM {default} WHERE "timestamp" < :cutoff'
+            ), {"cutoff": cutoff})
+        conn.execute(text(f'DELETE FROM {default} WHERE "timestamp" < :cutoff'), {"cutoff": cutoff})
+    return expired
+
+
+def partition_table(conn: Connection, table: str, premake_days: int = 7,
+                    retention_days: int = 0):
+    """Rebuild ``table`` as a table range-partitioned by day on timestamp.
+
+    Existing rows are copied over. Daily partitions are created from the
+    oldest row (or the start of the retention window, if later) up to
+    ``premake_days`` ahead; older rows go to the default partition.
+    """
+    old = f"{table}_unpartitioned"
+    conn.execute(text(f"ALTER TABLE {table} RENAME TO {old}"))
+    conn.execute(text(f"ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey"))
+    # The partition key has to be part of the primary key
+    conn.execute(text(
+        f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS, '
+        f'CONSTRAINT {table}_pkey PRIMARY KEY (id, "timestamp")) '
+        f'PARTITION BY RANGE ("timestamp")'
+    ))
+    conn.execute(text(f'CREATE INDEX ix_{table}_timestamp ON {table} ("timestamp")'))
+    conn.execute(text(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT"))
+
+    today = datetime.utcnow().date()
+    oldest = conn.execute(text(f'SELECT min("timestamp") FROM {old}')).scalar()
+    start = oldest.date() if oldest is not None else today
+    if retention_days:
+        start = max(start, today - timedelta(days=retention_days))
+    create_partitions(conn, table, min(start, today), today + timedelta(days=premake_days))
+
+    conn.execute(text(f"INSERT INTO {table} SELECT * FROM {old}"))
+    conn.execute(text(f"DROP TABLE {old}"))
+
+
+def unpartition_table(conn: Connection, table: str):
+    """Rebuild a partitioned ``table`` as a plain table, keeping its rows."""
+    new = f"{table}_unpartitioned"
+    conn.execute(text(f"CREATE TABLE {new} (LIKE {table} INCLUDING DEFAULTS)"))
+    conn.execute(text(f"INSERT INTO {new} SELECT * FROM {table}"))
+    conn.execute(text(f"DROP TABLE {table}"))
+    conn.execute(text(f"ALTER TABLE {new} RENAME TO {table}"))
+    conn.execute(text(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)"))
+
+
+def partition_tables(conn: Connection, premake_days: int = 7, retention_days: int = 0) -> List[str]:
+    """Partition every table of PARTITIONED_TABLES that is not partitioned yet."""
+    converted = []
+    for table in PARTITIONED_TABLES:
+        if is_partitioned(conn, table):
+            continue
+        partition_table(conn, table, premake_days=premake_days, retention_days=retention_days)
+        if table == "security_logs":
+            conn.execute(text(SECURITY_LOGS_THREAT_FK))
+        converted.append(table)
+    return converted
+
+
+def unpartition_tables(conn: Connection) -> List[str]:
+    """Fold every partitioned table of PARTITIONED_TABLES back into a plain table."""
+    converted = []
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(conn, table):
+            continue
+        unpartition_table(conn, table)
+        if table == "security_logs":
+            conn.execute(text(SECURITY_LOGS_THREAT_FK))
+        converted.append(table)
+    return converted
+
+
+class PartitionMaintainer:
+    """Background task creating future partitions and expiring old ones."""
+
+    def __init__(self, tables=PARTITIONED_TABLES, premake_days: int = 7, retention_days: int = 90,
+                 action: str = "drop", archive_schema: str = "archive", interval: float = 3600.0):
+        if action not in RETENTION_ACTIONS:
+            raise ValueError(f"Unknown partition retention action: {action}")
+        self.tables = tuple(tables)
+        self.premake_days = premake_days
+        self.retention_days = retention_days
+        self.action = action
+        self.archive_schema = archive_schema
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.created = 0
+        self.expired = 0
+        self.errors = 0
+        self.last_run: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.unpartitioned: List[str] = []
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Partition maintenance started (every {self.interval:.0f}s)")
+
+    async def stop(self):
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, self.run_once)
+            except Exception as e:
+                logger.error(f"Partition maintenance failed: {str(e)}")
+                self.errors += 1
+                self.last_error = str(e)
+            await asyncio.sleep(self.interval)
+
+    def run_once(self, today: Optional[date] = None) -> Dict[str, List[str]]:
+        """One maintenance pass over every partitioned table; returns what changed."""
+        today = today or datetime.utcnow().date()
+        changes: Dict[str, List[str]] = {"created": [], "expired": []}
+        unpartitioned = []
+        for table in self.tables:
+            with engine.begin() as conn:
+                if not is_partitioned(conn, table):
+                    if conn.dialect.name == "postgresql":
+                        unpartitioned.append(table)
+                    continue
+                changes["created"] += create_partitions(
+                    conn, table, today, today + timedelta(days=self.premake_days)
+                )
+                if self.retention_days:
+                    changes["expired"] += expire_partitions(
+                        conn, table, today - timedelta(days=self.retention_days),
+                        self.action, self.archive_schema
+                    )
+        self.unpartitioned = unpartitioned
+        if unpartitioned:
+            # Nothing is created or expired for these; retention silently not applying is worse
+            logger.error(f"PARTITIONING_ENABLED is set but {', '.join(unpartitioned)} are not partitioned; "
+                         "run 'python -m system.partitioning partition'")
+        for name in changes["created"]:
+            logger.info(f"Created partition {name}")
+        for name in changes["expired"]:
+            logger.info(f"Expired partition {name} ({self.action})")
+        self.runs += 1
+        self.created += len(changes["created"])
+        self.expired += len(changes["expired"])
+        self.last_run = datetime.utcnow()
+        return changes
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "tables": list(self.tables),
+            "premake_days": self.premake_days,
+            "retention_days": self.retention_days,
+            "action": self.action,
+            "unpartitioned_tables": self.unpartitioned,
+            "runs": self.runs,
+            "created": self.created,
+            "expired": self.expired,
+            "errors": self.errors,
+            "last_run": self.last_run,
+            "last_error": self.last_error
+        }
+
+
+_maintainer: Optional[PartitionMaintainer] = None
+
+def get_partition_maintainer() -> PartitionMaintainer:
+    """Shared PartitionMaintainer configured from settings."""
+    global _maintainer
+    if _maintainer is None:
+        _maintainer = PartitionMaintainer(
+            premake_days=settings.PARTITION_PREMAKE_DAYS,
+            retention_days=settings.PARTITION_RETENTION_DAYS,
+            action=settings.PARTITION_RETENTION_ACTION,
+            archive_schema=settings.PARTITION_ARCHIVE_SCHEMA,
+            interval=settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS
+        )
+    return _maintainer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the time-series tables to or from daily partitions")
+    parser.add_argument("action", choices=["partition", "unpartition", "status"],
+                        help="partition or unpartition takes exclusive locks and copies every row")
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        if conn.dialect.name != "postgresql":
+            parser.error("Partitioning is only supported on PostgreSQL")
+        if args.action == "partition":
+            converted = partition_tables(conn, premake_days=settings.PARTITION_PREMAKE_DAYS,
+                                         retention_days=settings.PARTITION_RETENTION_DAYS)
+        elif args.action == "unpartition":
+            converted = unpartition_tables(conn)
+        else:
+            converted = []
+            for table in PARTITIONED_TABLES:
+                partitions = list_partitions(conn, table) if is_partitioned(conn, table) else []
+                print(f"{table}: {f'{len(partitions)} partitions' if partitions else 'not partitioned'}")
+    for table in converted:
+        print(f"{args.action}ed {table}")
+
+
+if __name__ == "__main__":
+    main()
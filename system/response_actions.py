@@ -1,6 +1,5 @@
 import logging
 from typing import Dict, Any, List
-import aiohttp
 import asyncio
 
 # Configure logging
@@ -14,6 +13,12 @@ class SecurityResponder:
         self.firewall_api = self.config.get("firewall_api", "")
         self.quarantine_api = self.config.get("quarantine_api", "")
 
+    @staticmethod
+    def _session():
+        """New HTTP client session; aiohttp is only imported once an action runs."""
+        import aiohttp
+        return aiohttp.ClientSession()
+
     async def quarantine_system(self, target: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Quarantine a compromised system."""
         try:
@@ -22,7 +27,7 @@ class SecurityResponder:
             if not self.quarantine_api:
                 raise ValueError("Quarantine API endpoint not configured")
             
-            async with aiohttp.ClientSession() as session:
+            async with self._session() as session:
                 async with session.post(
                     self.quarantine_api,
                     json={
@@ -52,7 +57,7 @@ class SecurityResponder:
                 raise ValueError("No alert endpoints configured")
             
             results = []
-            async with aiohttp.ClientSession() as session:
+            async with self._session() as session:
                 for endpoint in self.alert_endpoints:
                     try:
                         async with session.post(endpoint, json=alert_data) as response:
@@ -81,7 +86,7 @@ class SecurityResponder:
             if not self.firewall_api:
                 raise ValueError("Firewall API endpoint not configured")
             
-            async with aiohttp.ClientSession() as session:
+            async with self._session() as session:
                 async with session.post(
                     self.firewall_api,
                     json={"rules": rules}
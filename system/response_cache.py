@@ -0,0 +1,222 @@
+"""Short-lived cache for the GET endpoints the dashboard polls.
+
+Cached routes are listed in ``CACHED_ROUTES`` together with the data they
+depend on ("logs", "anomalies", "threats"). Writers call
+``invalidate(tag)`` after committing, which makes every cached response
+depending on that tag stale at once. Independently of writes, entries
+expire after ``RESPONSE_CACHE_TTL_SECONDS``, bounding the staleness of
+time-windowed numbers such as last-hour connections.
+
+Every cached response carries an ``ETag`` (a hash of the body) and a
+``Last-Modified`` (the last invalidation of its tags). Conditional requests
+that still match get ``304 Not Modified`` without a body. HTTP dates have
+one-second resolution, so ``If-Modified-Since`` is not trusted for a second
+that saw more than one invalidation of any of the route's tags: a client may
+hold the response from between them. Concurrent misses for the same URL
+wait for a single computation. The cache is per process.
+"""
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .config import settings
+
+# Cached GET routes and the data tags they depend on
+CACHED_ROUTES = {
+    "/threats": ("threats", "anomalies"),
+    "/stats/network": ("logs", "anomalies"),
+    "/logs": ("logs",),
+}
+
+# Response headers kept on cached entries
+CACHED_HEADERS = ("content-type",)
+
+
+class CachedResponse:
+    __slots__ = ("body", "headers", "etag", "last_modified", "date_exact", "versions", "expires")
+
+    def __init__(self, body: bytes, headers: Dict[str, str], last_modified: datetime,
+                 versions: Tuple[int, ...], expires: float, date_exact: bool = True):
+        self.body = body
+        self.headers = headers
+        self.etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self.last_modified = last_modified
+        # False when last_modified names a second with several invalidations
+        self.date_exact = date_exact
+        self.versions = versions
+        self.expires = expires
+
+
+class ResponseCache:
+    """LRU of rendered GET responses, invalidated per data tag."""
+
+    def __init__(self, ttl_seconds: float = 2.0, max_entries: int = 1024):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        started = datetime.now(timezone.utc).replace(microsecond=0)
+        self._versions: Dict[str, int] = {tag: 0 for tags in CACHED_ROUTES.values() for tag in tags}
+        self._modified: Dict[str, datetime] = {tag: started for tag in self._versions}
+        # Tags whose last invalidation shared its second with an earlier one
+        # of any tag; a route's date is ambiguous when one of its tags did
+        self._collided: Dict[str, bool] = {tag: False for tag in self._versions}
+        self._latest = started
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    def invalidate(self, tag: str):
+        """Mark responses depending on ``tag`` stale; safe to call from any thread."""
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        with self._lock:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+            self._collided[tag] = self._latest == now
+            self._modified[tag] = now
+            self._latest = now
+            self.invalidations += 1
+
+    def _state(self, tags: Tuple[str, ...]) -> Tuple[Tuple[int, ...], datetime, bool]:
+        """Versions, Last-Modified and whether that date identifies the versions."""
+        with self._lock:
+            last_modified = max(self._modified[tag] for tag in tags)
+            date_exact = not any(self._collided[tag] for tag in tags if self._modified[tag] == last_modified)
+            return tuple(self._versions[tag] for tag in tags), last_modified, date_exact
+
+    def get(self, key: str, tags: Tuple[str, ...]) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires < time.monotonic() or entry.versions != self._state(tags)[0]:
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CachedResponse):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def fetch(self, key: str, tags: Tuple[str, ...], compute) -> Tuple[Optional[CachedResponse], Optional[Response]]:
+        """Cached entry for ``key``, computing it once for concurrent callers.
+
+        Returns ``(entry, None)``, or ``(None, response)`` when the computed
+        response is not cacheable (anything but a 200).
+        """
+        entry = self.get(key, tags)
+        if entry is not None:
+            self.hits += 1
+            return entry, None
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            entry = await asyncio.shield(inflight)
+            if entry is not None:
+                self.hits += 1
+                return entry, None
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        entry = None
+        try:
+            # Versions are read before computing, so a write racing the
+            # computation leaves the entry stale rather than hiding the write
+            versions, last_modified, date_exact = self._state(tags)
+            response = await compute()
+            if response.status_code != 200:
+                return None, response
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+            entry = CachedResponse(body, headers, last_modified, versions, time.monotonic() + self.ttl,
+                                   date_exact)
+            self.put(key, entry)
+            return entry, None
+        finally:
+            del self._inflight[key]
+            future.set_result(entry)
+
+    def metrics(self):
+        return {
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations
+        }
+
+
+def _not_modified(request: Request, entry: CachedResponse) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return entry.etag in tags or "*" in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and entry.date_exact:
+        try:
+            return entry.last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """Serve CACHED_ROUTES from a ResponseCache, answering 304 where possible."""
+
+    def __init__(self, app, cache: "ResponseCache"):
+        super().__init__(app)
+        self.cache = cache
+
+    async def dispatch(self, request: Request, call_next):
+        tags = CACHED_ROUTES.get(request.url.path)
+        if request.method != "GET" or tags is None:
+            return await call_next(request)
+
+        key = f"{request.url.path}?{'&'.join(sorted(request.url.query.split('&')))}"
+        entry, uncached = await self.cache.fetch(key, tags, lambda: call_next(request))
+        if uncached is not None:
+            return uncached
+
+        headers = {
+            "ETag": entry.etag,
+            "Last-Modified": format_datetime(entry.last_modified, usegmt=True),
+            "Cache-Control": "no-cache"
+        }
+        if _not_modified(request, entry):
+            self.cache.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, status_code=200, headers={**entry.headers, **headers})
+
+
+_response_cache: Optional[ResponseCache] = None
+
+def get_response_cache() -> ResponseCache:
+    """Shared ResponseCache configured from settings."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+            max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES
+        )
+    return _response_cache
+
+
+def invalidate_responses(*tags: str):
+    """Invalidate cached responses after a committed write."""
+    cache = get_response_cache()
+    for tag in tags:
+        cache.invalidate(tag)
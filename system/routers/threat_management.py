@@ -1,38 +1,97 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from fastapi.responses import JSONResponse
-from ..database import get_db
-from ..models import AnomalyDetection, Threat, ThreatStatus, ThreatSeverity
-from sqlalchemy.orm import Session
+from ..database import get_async_db
+from ..event_feed import get_event_hub
+from ..models import Threat, ThreatStatus, ThreatSeverity
+from ..network_stats import get_stats
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page, split_page
+from ..response_cache import invalidate_responses
+from ..serialization import FastJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import datetime
 import logging
 import traceback
-from ..schemas_consolidated import ThreatResponse, ThreatListResponse
+from typing import Any, Dict, List, Optional
+from ..schemas_consolidated import ThreatListResponse
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/threats", tags=["threats"])
 
+THREAT_SEVERITIES = frozenset(severity.value for severity in ThreatSeverity)
+THREAT_STATUSES = frozenset(status.value for status in ThreatStatus)
+
+
+def threat_row_to_dict(threat) -> Optional[Dict[str, Any]]:
+    """ThreatResponse-shaped dict for a selected threats row, None if the row is invalid."""
+    # Ensure required fields are present
+    if not threat.id or not threat.threat_type or not threat.title:
+        logger.error("Missing required field for threat %s", threat.id)
+        return None
+
+    severity = threat.severity or ThreatSeverity.low.value
+    status = threat.status or ThreatStatus.active.value
+    if severity not in THREAT_SEVERITIES or status not in THREAT_STATUSES:
+        logger.error("Invalid severity/status for threat %s: %s/%s", threat.id, severity, status)
+        return None
+
+    return {
+        "id": threat.id,
+        "threat_type": threat.threat_type,
+        "title": threat.title,
+        "description": threat.description or None,
+        "severity": severity,
+        "status": status,
+        "timestamp": threat.timestamp,
+        "source_ip": threat.source_ip or None,
+        "target_system": threat.target_system or None
+    }
+
+
 @router.get("", response_model=ThreatListResponse)
-async def get_threats(db: Session = Depends(get_db)):
-    """Get current threat information, including active threats with full details."""
+async def get_threats(status: str = ThreatStatus.active.value,
+                      severity: Optional[List[str]] = Query(None),
+                      source_ip: Optional[str] = None,
+                      since: Optional[datetime.datetime] = None,
+                      until: Optional[datetime.datetime] = None,
+                      limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                      cursor: Optional[str] = None,
+                      db: AsyncSession = Depends(get_async_db)):
+    """Get the threat level and one page of threats (active ones by default), newest first."""
     logger.debug("Processing get_threats request")
+    statement = select(
+        Threat.id, Threat.threat_type, Threat.title, Threat.description, Threat.severity,
+        Threat.status, Threat.timestamp, Threat.source_ip, Threat.target_system
+    ).filter(Threat.status == status, Threat.timestamp.isnot(None))
+    if severity:
+        statement = statement.filter(Threat.severity.in_(severity))
+    if source_ip is not None:
+        statement = statement.filter(Threat.source_ip == source_ip)
+    if since is not None:
+        statement = statement.filter(Threat.timestamp >= since)
+    if until is not None:
+        statement = statement.filter(Threat.timestamp < until)
     try:
-        # Get recent anomalies for threat level calculation
-        recent_anomalies = db.query(AnomalyDetection).filter(
-            AnomalyDetection.timestamp >= datetime.datetime.utcnow() - datetime.timedelta(hours=24)
-        ).all() or []
+        statement = keyset_page(statement, Threat.timestamp, Threat.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        # Anomalies of the last 24 hours, from the rolling counters
+        anomaly_count = get_stats().snapshot()["recent_anomalies"]
 
         # Calculate threat level
         threat_level = "low"
-        if len(recent_anomalies) > 10:
+        if anomaly_count > 10:
             threat_level = "high"
-        elif len(recent_anomalies) > 5:
+        elif anomaly_count > 5:
             threat_level = "medium"
         
         try:
-            # Get active threats only
-            # Query active threats by string value
-            threats = db.query(Threat).filter(Threat.status == 'active').all() or []
-            logger.debug(f"Found {len(threats)} active threats")
+            # Only the columns of the response, one page at a time
+            result = await db.execute(statement)
+            threats, next_cursor = split_page(result.all(), limit)
+            logger.debug("Found %d %s threats", len(threats), status)
         except Exception as e:
             logger.error(f"Error querying threats: {str(e)}")
             logger.error(traceback.format_exc())
@@ -40,52 +99,17 @@ async def get_threats(db: Session = Depends(get_db)):
                 status_code=500,
                 detail=f"Database error: {str(e)}"
             )
-        
-        # Convert threats to response format
-        threat_responses = []
-        for threat in threats:
-            try:
-                # Ensure required fields are present and properly formatted
-                if not threat.id or not threat.threat_type or not threat.title:
-                    logger.error(f"Missing required field for threat {threat.id}")
-                    continue
 
-                # Safe enum conversion
-                try:
-                    # Convert string values to enums for validation, then back to strings
-                    severity = ThreatSeverity(threat.severity) if threat.severity else ThreatSeverity.low
-                    status = ThreatStatus(threat.status) if threat.status else ThreatStatus.active
-                    
-                    threat_data = {
-                        "id": str(threat.id),
-                        "threat_type": str(threat.threat_type),
-                        "title": str(threat.title),
-                        "description": str(threat.description) if threat.description else None,
-                        "severity": severity.value,
-                        "status": status.value,
-                        "timestamp": threat.timestamp,
-                        "source_ip": str(threat.source_ip) if threat.source_ip else None,
-                        "target_system": str(threat.target_system) if threat.target_system else None
-                    }
-                except ValueError as ve:
-                    logger.error(f"Invalid enum value for threat {threat.id}: {ve}")
-                    continue
-                logger.debug(f"Converting threat data: {threat_data}")
-                response = ThreatResponse(**threat_data)
-                threat_responses.append(response)
-            except Exception as e:
-                logger.error(f"Error converting threat {threat.id}: {str(e)}")
-                logger.error(f"Threat data that failed: {vars(threat)}")
-                logger.error(traceback.format_exc())
-                continue
-        
-        response_data = ThreatListResponse(
-            threats=threat_responses,
-            threat_level=threat_level,
-            anomaly_count=len(recent_anomalies)
-        )
-        
-        return response_data
+        # Rows go straight to JSON bytes; the response model is documentation only
+        threat_responses = [
+            threat_data for threat_data in map(threat_row_to_dict, threats) if threat_data is not None
+        ]
+        return FastJSONResponse({
+            "threats": threat_responses,
+            "threat_level": threat_level,
+            "anomaly_count": anomaly_count,
+            "next_cursor": next_cursor
+        })
 
     except Exception as e:
         error_msg = str(e)
@@ -108,15 +132,20 @@ async def get_threats(db: Session = Depends(get_db)):
         )
 
 @router.post("/{threat_id}/resolve")
-async def resolve_threat(threat_id: str, db: Session = Depends(get_db)):
+async def resolve_threat(threat_id: str, db: AsyncSession = Depends(get_async_db)):
     """Resolve a threat by its ID."""
     try:
-        threat = db.query(Threat).filter(Threat.id == threat_id).first()
+        result = await db.execute(select(Threat).filter(Threat.id == threat_id))
+        threat = result.scalars().first()
         if not threat:
             raise HTTPException(status_code=404, detail="Threat not found")
             
         threat.status = ThreatStatus.resolved.value
-        db.commit()
+        await db.commit()
+        invalidate_responses("threats")
+        payload = threat_row_to_dict(threat)
+        if payload is not None:
+            get_event_hub().publish("threat", [payload])
         return {"status": "success", "message": f"Threat {threat_id} resolved"}
         
     except HTTPException:
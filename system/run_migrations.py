@@ -16,4 +16,9 @@ if base_schema.exists():
         shutil.copy2(base_schema, versions_dir / "1a2b3c4d5e6f_base_schema.py")
 
 if __name__ == "__main__":
-    apply_migrations()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Upgrade the database to the latest migration")
+    parser.add_argument("--reset", action="store_true",
+                        help="drop schema public and all data before migrating")
+    args = parser.parse_args()
+    apply_migrations(reset=args.reset)
\ No newline at end of file
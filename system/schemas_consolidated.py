@@ -29,11 +29,13 @@ class ThreatListResponse(BaseModel):
     threats: List[ThreatResponse]
     threat_level: str
     anomaly_count: int
+    next_cursor: Optional[str] = None
 
 class NetworkStatsResponse(BaseModel):
     total_connections: int
     unique_ips: int
     last_hour_connections: int
+    recent_anomalies: int = 0
 
 # Models from main.py
 class LogData(BaseModel):
@@ -42,6 +44,24 @@ class LogData(BaseModel):
     event_type: str
     data: Dict[str, Any]
 
+class LogEntry(BaseModel):
+    id: str
+    timestamp: datetime
+    log_type: str
+    source: Optional[str] = None
+    message: str
+    threat_id: Optional[str] = None
+
+class LogPage(BaseModel):
+    logs: List[LogEntry]
+    next_cursor: Optional[str] = None
+
+class BatchIngestResponse(BaseModel):
+    status: str
+    accepted: int
+    rejected: int
+    errors: List[Dict[str, Any]] = []
+
 class AnalysisRequest(BaseModel):
     data: Dict[str, Any]
     analysis_type: str
@@ -52,6 +72,30 @@ class AnomalyData(BaseModel):
     metrics: Dict[str, Any]
     alert_level: Optional[str] = "low"
 
+class ScoringRequest(BaseModel):
+    features: List[float]
+
+class BatchScoringRequest(BaseModel):
+    features: List[List[float]]
+
+class ScoringResult(BaseModel):
+    is_anomaly: bool
+    anomaly_score: float
+    raw_score: float
+
+class BatchScoringResponse(BaseModel):
+    results: List[ScoringResult]
+    rows: int
+    elapsed_ms: float
+    rows_per_second: float
+
+class TrainingRequest(BaseModel):
+    source: str = "zeek"
+    window_minutes: int = 5
+    max_samples: Optional[int] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
 class ResponseAction(BaseModel):
     action_type: str
     target: str
@@ -76,4 +120,7 @@ class ModelMetrics(BaseModel):
     n_estimators: int
     feature_importances: Optional[Dict[str, float]] = None
     last_training_date: Optional[datetime] = None
-    total_samples_trained: Optional[int] = None
\ No newline at end of file
+    total_samples_trained: Optional[int] = None
+    version: Optional[str] = None
+    score_min: Optional[float] = None
+    score_max: Optional[float] = None
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""JSON responses encoded straight to bytes.
+
+Handlers that build their payload from selected columns can return
+``FastJSONResponse`` instead of a pydantic model, which skips FastAPI's
+``response_model`` validation and ``jsonable_encoder`` walk. orjson is used
+when installed; otherwise the stdlib encoder is used.
+"""
+import json
+from datetime import date, datetime
+from typing import Any
+
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(content: Any) -> bytes:
+    """Encode ``content`` to compact JSON bytes with the fastest available encoder."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
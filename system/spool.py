@@ -0,0 +1,478 @@
+"""Durable write-ahead spool for ingested events.
+
+Layout::
+
+    <root>/
+        LOCK                                  # held by the process owning this spool
+        segment-00000000000000000001.ndjson   # one JSON row per line
+        segment-00000000000000000002.ndjson   # active segment, appended to
+        CONFIRMED                             # "<segment> <offset>" replayed so far
+        quarantine.ndjson                     # rows the database rejected
+        worker-1/                             # spool of a second API worker
+
+Accepted rows are appended to the active segment and fsynced in batches
+before ``/ingest`` acknowledges them, so an event survives a database
+outage or a process crash. ``SpoolDrainer`` replays segments into
+``security_logs`` in order, backing off while the database is unavailable,
+and records the confirmed position after every committed batch. Segments
+that were completely replayed are deleted.
+
+Only connectivity errors are retried. Rows the database rejects (integrity
+or data errors) are isolated by bisecting the batch and moved to the
+quarantine file with the error, so one bad record cannot block the spool.
+
+Each process locks the spool directory it writes to. With several uvicorn
+workers sharing ``INGEST_SPOOL_DIR``, the first claims the directory
+itself and the others claim ``worker-<n>`` slots below it, so no segment
+is replayed twice. Slots are reclaimed, and their backlog replayed, when
+workers restart.
+"""
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from .config import settings
+from .database import SessionLocal
+from .ingest import bulk_insert_security_logs, record_committed_logs
+from .models import SecurityLog
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".ndjson"
+CONFIRMED_POINTER = "CONFIRMED"
+QUARANTINE_FILE = "quarantine.ndjson"
+LOCK_FILE = "LOCK"
+WORKER_SLOT_PREFIX = "worker-"
+
+# DB-API error classes meaning the database could not be reached
+CONNECTIVITY_ERROR_NAMES = frozenset(["OperationalError", "InterfaceError"])
+
+# Spool directories tried per INGEST_SPOOL_DIR before giving up
+MAX_SPOOL_SLOTS = 64
+
+# Longest wait between replay attempts while the database is down
+MAX_DRAIN_BACKOFF_SECONDS = 30.0
+
+
+def _segment_name(sequence: int) -> str:
+    return f"{SEGMENT_PREFIX}{sequence:020d}{SEGMENT_SUFFIX}"
+
+
+def _encode_row(row: Dict[str, Any]) -> bytes:
+    row = dict(row)
+    if isinstance(row.get("timestamp"), datetime):
+        row["timestamp"] = row["timestamp"].isoformat()
+    return json.dumps(row, default=str).encode("utf-8") + b"\n"
+
+
+def _decode_row(line: bytes) -> Dict[str, Any]:
+    row = json.loads(line)
+    if isinstance(row.get("timestamp"), str):
+        row["timestamp"] = datetime.fromisoformat(row["timestamp"])
+    return row
+
+
+def _lock_directory(path: str):
+    """Exclusive lock on a spool directory; the open file, or None if another process holds it."""
+    os.makedirs(path, exist_ok=True)
+    lock_file = open(os.path.join(path, LOCK_FILE), "a")
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def _slot_path(root: str, slot: int) -> str:
+    return root if slot == 0 else os.path.join(root, f"{WORKER_SLOT_PREFIX}{slot}")
+
+
+def _fsync_directory(path: str):
+    """Persist directory entries (new or removed segments)."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class IngestSpool:
+    """Append-only segmented log of rows waiting to reach the database."""
+
+    def __init__(self, root: Optional[str] = None, segment_max_bytes: Optional[int] = None):
+        self.root = root or settings.INGEST_SPOOL_DIR
+        self.segment_max_bytes = segment_max_bytes or settings.INGEST_SPOOL_SEGMENT_MAX_BYTES
+        self._lock = threading.Lock()
+        self._file = None
+        self.active_sequence = 0
+        self.appended = 0
+        self.fsyncs = 0
+        self.quarantined = 0
+        self._dir_lock = _lock_directory(self.root)
+        if self._dir_lock is None:
+            raise RuntimeError(f"Ingest spool {self.root} is in use by another process")
+        self._open_active()
+
+    @classmethod
+    def claim(cls, root: Optional[str] = None, **kwargs) -> "IngestSpool":
+        """Open the first spool slot under ``root`` that no other process holds."""
+        root = root or settings.INGEST_SPOOL_DIR
+        for slot in range(MAX_SPOOL_SLOTS):
+            try:
+                spool = cls(_slot_path(root, slot), **kwargs)
+            except RuntimeError:
+                continue
+            spool._warn_orphaned_slots(root, slot)
+            return spool
+        raise RuntimeError(f"All {MAX_SPOOL_SLOTS} ingest spool slots under {root} are in use")
+
+    def _warn_orphaned_slots(self, root: str, claimed: int):
+        """Point out backlogs of slots no running worker owns (e.g. after scaling down)."""
+        for slot in range(claimed + 1, MAX_SPOOL_SLOTS):
+            path = _slot_path(root, slot)
+            if not os.path.isdir(path):
+                continue
+            lock_file = _lock_directory(path)
+            if lock_file is None:
+                continue
+            try:
+                if any(name.startswith(SEGMENT_PREFIX) and os.path.getsize(os.path.join(path, name))
+                       for name in os.listdir(path)):
+                    logger.warning(f"Ingest spool {path} has rows no worker is replaying; "
+                                   "they are replayed once a worker claims that slot again")
+            finally:
+                lock_file.close()
+
+    def segments(self) -> List[int]:
+        """Sequence numbers of the segments on disk, oldest first."""
+        sequences = []
+        for name in os.listdir(self.root):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                sequences.append(int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+        return sorted(sequences)
+
+    def segment_path(self, sequence: int) -> str:
+        return os.path.join(self.root, _segment_name(sequence))
+
+    def _open_active(self):
+        """Reopen the newest segment, dropping a torn record left by a crash."""
+        sequences = self.segments()
+        if not sequences:
+            self._roll(1)
+            return
+
+        self.active_sequence = sequences[-1]
+        path = self.segment_path(self.active_sequence)
+        with open(path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end != len(data):
+                logger.warning(f"Truncating torn record at the end of {path}")
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+        self._file = open(path, "ab")
+
+    def _roll(self, sequence: int):
+        if self._file is not None:
+            self._file.close()
+        self.active_sequence = sequence
+        self._file = open(self.segment_path(sequence), "ab")
+        _fsync_directory(self.root)
+
+    def append(self, rows: List[Dict[str, Any]]):
+        """Durably append a batch of rows: one write and one fsync per batch."""
+        data = b"".join(_encode_row(row) for row in rows)
+        with self._lock:
+            if self._file.tell() and self._file.tell() + len(data) > self.segment_max_bytes:
+                self._roll(self.active_sequence + 1)
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.appended += len(rows)
+            self.fsyncs += 1
+
+    def confirmed(self) -> Tuple[int, int]:
+        """(segment, offset) up to which rows have reached the database."""
+        try:
+            with open(os.path.join(self.root, CONFIRMED_POINTER)) as f:
+                sequence, offset = f.read().split()
+                return int(sequence), int(offset)
+        except FileNotFoundError:
+            sequences = self.segments()
+            return (sequences[0] if sequences else self.active_sequence), 0
+
+    def confirm(self, sequence: int, offset: int):
+        """Atomically record the replay position."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".confirmed-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(f"{sequence} {offset}")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, os.path.join(self.root, CONFIRMED_POINTER))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def compact(self) -> List[int]:
+        """Delete segments that were replayed completely."""
+        confirmed_sequence, _ = self.confirmed()
+        removed = []
+        for sequence in self.segments():
+            if sequence >= confirmed_sequence or sequence == self.active_sequence:
+                break
+            os.unlink(self.segment_path(sequence))
+            removed.append(sequence)
+        if removed:
+            _fsync_directory(self.root)
+        return removed
+
+    def read_batch(self, max_rows: int) -> Tuple[List[Dict[str, Any]], int, int]:
+        """Read up to ``max_rows`` unconfirmed rows.
+
+        Returns the rows and the (segment, offset) position after them. Only
+        complete lines are returned, so a batch being appended concurrently is
+        never read half-written. Moves on to the next segment once the
+        confirmed one is exhausted and no longer active.
+        """
+        sequence, offset = self.confirmed()
+        while True:
+            path = self.segment_path(sequence)
+            rows: List[Dict[str, Any]] = []
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            break
+                        offset += len(line)
+                        try:
+                            rows.append(_decode_row(line))
+                        except ValueError as e:
+                            logger.error(f"Skipping corrupt spool record in {path}: {str(e)}")
+                        if len(rows) >= max_rows:
+                            break
+            if rows or sequence >= self.active_sequence:
+                return rows, sequence, offset
+
+            # Segment exhausted and closed: continue with the next one on disk
+            later = [s for s in self.segments() if s > sequence]
+            if not later:
+                return rows, sequence, offset
+            sequence, offset = later[0], 0
+            self.confirm(sequence, offset)
+
+    def backlog_bytes(self) -> int:
+        """Bytes written to the spool but not yet confirmed."""
+        confirmed_sequence, confirmed_offset = self.confirmed()
+        total = 0
+        for sequence in self.segments():
+            if sequence < confirmed_sequence:
+                continue
+            try:
+                size = os.path.getsize(self.segment_path(sequence))
+            except FileNotFoundError:
+                continue
+            total += size - (confirmed_offset if sequence == confirmed_sequence else 0)
+        return max(total, 0)
+
+    def quarantine(self, rejected: List[Tuple[Dict[str, Any], str]]):
+        """Durably set aside rows the database rejected, with the error."""
+        data = b"".join(
+            json.dumps({"error": error, "row": json.loads(_encode_row(row))}, default=str).encode("utf-8") + b"\n"
+            for row, error in rejected
+        )
+        with open(os.path.join(self.root, QUARANTINE_FILE), "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.quarantined += len(rejected)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._dir_lock is not None:
+                self._dir_lock.close()
+                self._dir_lock = None
+
+
+def _insert_new_rows(rows: List[Dict[str, Any]], deduplicate: bool) -> int:
+    """Write replayed rows, skipping ids that already reached the database.
+
+    A batch committed right before a crash is replayed again because its
+    confirmation was never recorded; ``deduplicate`` filters those rows out.
+    """
+    db = SessionLocal()
+    try:
+        if deduplicate:
+            ids = [row["id"] for row in rows]
+            existing = {
+                row_id for (row_id,) in db.query(SecurityLog.id).filter(SecurityLog.id.in_(ids))
+            }
+            rows = [row for row in rows if row["id"] not in existing]
+        return bulk_insert_security_logs(db, rows, on_commit=record_committed_logs)
+    finally:
+        db.close()
+
+
+def _is_connectivity_error(error: Exception) -> bool:
+    """Whether an insert failed because the database is unreachable, not because of the rows."""
+    if isinstance(error, DBAPIError) and error.connection_invalidated:
+        return True
+    if isinstance(error, (PoolTimeoutError, ConnectionError)):
+        return True
+    # Matched by the standard DB-API class names, so raw driver errors
+    # raised outside SQLAlchemy (the COPY path) are recognized too
+    return any(cls.__name__ in CONNECTIVITY_ERROR_NAMES for cls in type(error).__mro__)
+
+
+def _replay_rows(rows: List[Dict[str, Any]], deduplicate: bool) -> Tuple[int, List[Tuple[Dict[str, Any], str]]]:
+    """Write replayed rows, isolating the ones the database rejects.
+
+    Returns the number of rows written and the rejected rows with their
+    error. A rejected batch is bisected until the offending rows are found;
+    halves are written with deduplication, since part of the batch may have
+    been committed before the error. Connectivity errors are raised.
+    """
+    try:
+        return _insert_new_rows(rows, deduplicate), []
+    except Exception as e:
+        if _is_connectivity_error(e):
+            raise
+        if len(rows) == 1:
+            logger.error(f"Database rejected spooled row {rows[0].get('id')}: {str(e)}")
+            return 0, [(rows[0], str(e))]
+        middle = len(rows) // 2
+        written_first, rejected_first = _replay_rows(rows[:middle], True)
+        written_second, rejected_second = _replay_rows(rows[middle:], True)
+        return written_first + written_second, rejected_first + rejected_second
+
+
+class SpoolDrainer:
+    """Background task replaying the spool into security_logs."""
+
+    def __init__(self, spool: IngestSpool, batch_size: int = 5000, poll_interval: float = 0.2):
+        self.spool = spool
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.drained = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.database_available = True
+        self.compacted_segments = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Spool drainer started ({self.spool.root})")
+
+    async def stop(self):
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def notify(self):
+        """Wake the drainer up after new rows were spooled."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        backoff = self.poll_interval
+        # Rows replayed first after a (re)start may already be in the database
+        deduplicate = True
+        while True:
+            rows, sequence, offset = await loop.run_in_executor(None, self.spool.read_batch, self.batch_size)
+            if not rows:
+                removed = await loop.run_in_executor(None, self.spool.compact)
+                self.compacted_segments += len(removed)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                _, rejected = await loop.run_in_executor(None, _replay_rows, rows, deduplicate)
+            except Exception as e:
+                if self.database_available:
+                    logger.error(f"Database unavailable, spooling ingested logs: {str(e)}")
+                self.database_available = False
+                self.errors += 1
+                self.last_error = str(e)
+                deduplicate = True
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, MAX_DRAIN_BACKOFF_SECONDS)
+                continue
+
+            if rejected:
+                await loop.run_in_executor(None, self.spool.quarantine, rejected)
+            await loop.run_in_executor(None, self.spool.confirm, sequence, offset)
+            if not self.database_available:
+                logger.info("Database available again, replaying spooled logs")
+            self.database_available = True
+            self.drained += len(rows) - len(rejected)
+            deduplicate = False
+            backoff = self.poll_interval
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "database_available": self.database_available,
+            "segments": len(self.spool.segments()),
+            "backlog_bytes": self.spool.backlog_bytes(),
+            "appended": self.spool.appended,
+            "fsyncs": self.spool.fsyncs,
+            "drained": self.drained,
+            "quarantined": self.spool.quarantined,
+            "compacted_segments": self.compacted_segments,
+            "errors": self.errors,
+            "last_error": self.last_error
+        }
+
+
+_spool: Optional[IngestSpool] = None
+_drainer: Optional[SpoolDrainer] = None
+
+def get_spool() -> IngestSpool:
+    """Shared IngestSpool: this process's slot under INGEST_SPOOL_DIR."""
+    global _spool
+    if _spool is None:
+        _spool = IngestSpool.claim()
+    return _spool
+
+def get_spool_drainer() -> SpoolDrainer:
+    """Shared SpoolDrainer for the shared spool."""
+    global _drainer
+    if _drainer is None:
+        _drainer = SpoolDrainer(get_spool(), batch_size=settings.INGEST_SPOOL_DRAIN_BATCH_SIZE)
+    return _drainer
@@ -0,0 +1,254 @@
+"""Chunked, parallel training pipeline for the anomaly detection model.
+
+Historical ``security_logs`` rows are streamed out of the database in
+chunks and grouped into tumbling time windows. Each window is converted to
+NumPy columns, which are much cheaper to send to a worker process than the
+log dicts, and turned into a feature vector by the columnar
+``FeatureExtractor`` in a process pool. A bounded reservoir sample of the
+vectors is kept and used to fit the model, so memory does not grow with the
+amount of history being trained on.
+"""
+import logging
+import multiprocessing
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .database import SessionLocal
+from .feature_extraction import Columns, FeatureExtractor
+from .models import SecurityLog
+
+logger = logging.getLogger(__name__)
+
+# Number of finished training jobs whose progress is kept around
+TRAINING_JOB_HISTORY = 20
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class ReservoirSampler:
+    """Uniform fixed-size sample of a stream (Algorithm R)."""
+
+    def __init__(self, capacity: int, seed: Optional[int] = None):
+        self.capacity = capacity
+        self.seen = 0
+        self.items: List[Any] = []
+        self._random = random.Random(seed)
+
+    def add(self, item: Any):
+        self.seen += 1
+        if len(self.items) < self.capacity:
+            self.items.append(item)
+            return
+        index = self._random.randrange(self.seen)
+        if index < self.capacity:
+            self.items[index] = item
+
+
+def iter_log_windows(db: Session, source: str, window_minutes: int,
+                     chunk_size: int = 10000, since: Optional[datetime] = None,
+                     until: Optional[datetime] = None,
+                     on_row: Optional[Callable[[], None]] = None) -> Iterator[Tuple[datetime, List[Dict[str, Any]]]]:
+    """Yield ``(window_end, logs)`` tumbling windows of one source, oldest first.
+
+    Rows are fetched ``chunk_size`` at a time, so only the window being
+    assembled is held in memory.
+    """
+    query = db.query(SecurityLog.timestamp, SecurityLog.additional_info).filter(
+        SecurityLog.source == source
+    )
+    if since is not None:
+        query = query.filter(SecurityLog.timestamp >= since)
+    if until is not None:
+        query = query.filter(SecurityLog.timestamp < until)
+    query = query.order_by(SecurityLog.timestamp).yield_per(chunk_size)
+
+    window = timedelta(minutes=window_minutes)
+    current_index = None
+    logs: List[Dict[str, Any]] = []
+
+    for timestamp, additional_info in query:
+        if on_row is not None:
+            on_row()
+        index = (timestamp - EPOCH) // window
+        if index != current_index:
+            if logs:
+                yield EPOCH + (current_index + 1) * window, logs
+            current_index = index
+            logs = []
+
+        log = dict(additional_info) if isinstance(additional_info, dict) else {}
+        log['timestamp'] = timestamp
+        logs.append(log)
+
+    if logs:
+        yield EPOCH + (current_index + 1) * window, logs
+
+
+def extract_window_features(source: str, window_end: datetime, columns: Columns,
+                            window_minutes: int) -> List[float]:
+    """Process-pool task: feature vector of one historical window's columns."""
+    return FeatureExtractor().extract_features_columnar(source, columns, window_minutes, end_time=window_end)
+
+
+class TrainingJob:
+    """Background training run with progress reporting."""
+
+    def __init__(self, source: str, window_minutes: int, max_samples: int,
+                 since: Optional[datetime] = None, until: Optional[datetime] = None,
+                 workers: Optional[int] = None, chunk_size: Optional[int] = None):
+        self.job_id = str(uuid.uuid4())
+        self.source = source
+        self.window_minutes = window_minutes
+        self.max_samples = max_samples
+        self.since = since
+        self.until = until
+        self.workers = workers or settings.TRAINING_WORKERS or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size or settings.TRAINING_CHUNK_SIZE
+
+        self.status = "pending"
+        self.phase = "queued"
+        self.logs_read = 0
+        self.windows_submitted = 0
+        self.windows_completed = 0
+        self.windows_failed = 0
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.reservoir = ReservoirSampler(max_samples)
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = 0.0
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+        return {
+            "job_id": self.job_id,
+            "source": self.source,
+            "status": self.status,
+            "phase": self.phase,
+            "window_minutes": self.window_minutes,
+            "logs_read": self.logs_read,
+            "windows_submitted": self.windows_submitted,
+            "windows_completed": self.windows_completed,
+            "windows_failed": self.windows_failed,
+            "samples": len(self.reservoir.items),
+            "max_samples": self.max_samples,
+            "elapsed_seconds": round(elapsed, 3),
+            "logs_per_second": round(self.logs_read / elapsed, 1) if elapsed > 0 else 0.0,
+            "error": self.error
+        }
+
+    def _count_row(self):
+        self.logs_read += 1
+
+    def _collect(self, futures: set, return_when: str) -> set:
+        """Move finished feature vectors from the pool into the reservoir."""
+        done, pending = wait(futures, return_when=return_when)
+        for future in done:
+            try:
+                self.reservoir.add(future.result())
+                self.windows_completed += 1
+            except Exception as e:
+                self.windows_failed += 1
+                logger.warning(f"Training job {self.job_id}: window failed: {str(e)}")
+        return pending
+
+    def build_sample(self) -> np.ndarray:
+        """Stream windows from the database through the process pool."""
+        self.phase = "extracting"
+        max_in_flight = self.workers * 2
+        context = multiprocessing.get_context("spawn")
+        extractor = FeatureExtractor()
+        db = SessionLocal()
+        windows = iter_log_windows(
+            db, self.source, self.window_minutes, self.chunk_size,
+            self.since, self.until, on_row=self._count_row
+        )
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+                futures = set()
+                for window_end, logs in windows:
+                    try:
+                        columns = extractor.build_columns(self.source, logs)
+                    except Exception as e:
+                        self.windows_failed += 1
+                        logger.warning(f"Training job {self.job_id}: window failed: {str(e)}")
+                        continue
+                    if len(futures) >= max_in_flight:
+                        futures = self._collect(futures, FIRST_COMPLETED)
+                    futures.add(pool.submit(
+                        extract_window_features, self.source, window_end, columns, self.window_minutes
+                    ))
+                    self.windows_submitted += 1
+                if futures:
+                    self._collect(futures, ALL_COMPLETED)
+        finally:
+            # Release the server-side cursor before the session goes away
+            windows.close()
+            db.close()
+
+        return np.array(self.reservoir.items, dtype=np.float64)
+
+    def run(self):
+        """Extract features, fit a fresh model and swap it into the detector."""
+        from .anomaly_detection import get_detector
+
+        self.status = "running"
+        self.started_at = time.time()
+        try:
+            sample = self.build_sample()
+            if not len(sample):
+                raise ValueError(f"No {self.source} logs found to train on")
+            logger.info(
+                f"Training job {self.job_id}: fitting on {len(sample)} of "
+                f"{self.reservoir.seen} windows ({self.logs_read} logs)"
+            )
+
+            self.phase = "fitting"
+            get_detector().train(sample, metadata={
+                "source": self.source,
+                "window_minutes": self.window_minutes,
+                "windows_seen": self.reservoir.seen,
+                "logs_read": self.logs_read,
+                "training_job_id": self.job_id
+            })
+
+            self.phase = "done"
+            self.status = "completed"
+        except Exception as e:
+            logger.error(f"Training job {self.job_id} failed: {str(e)}")
+            self.status = "failed"
+            self.error = str(e)
+        finally:
+            self.finished_at = time.time()
+
+
+_training_jobs: "OrderedDict[str, TrainingJob]" = OrderedDict()
+
+
+def start_training_job(**kwargs) -> TrainingJob:
+    """Run a TrainingJob in a background thread and register it for polling."""
+    job = TrainingJob(**kwargs)
+    _training_jobs[job.job_id] = job
+    while len(_training_jobs) > TRAINING_JOB_HISTORY:
+        oldest_id, oldest = next(iter(_training_jobs.items()))
+        if oldest.status in ("pending", "running"):
+            break
+        del _training_jobs[oldest_id]
+
+    threading.Thread(target=job.run, name=f"training-{job.job_id}", daemon=True).start()
+    return job
+
+
+def get_training_job(job_id: str) -> Optional[TrainingJob]:
+    """Look up a running or recently finished training job."""
+    return _training_jobs.get(job_id)
@@ -0,0 +1,368 @@
+"""Reader for Zeek's native tab-separated log format.
+
+Zeek writes every log file with a header block describing its layout::
+
+    #separator \\x09
+    #set_separator	,
+    #empty_field	(empty)
+    #unset_field	-
+    #path	conn
+    #fields	ts	uid	id.orig_h	id.orig_p	...
+    #types	time	string	addr	port	...
+
+The header is read once per file (or whenever a new block starts), a typed
+converter is built for every column and rows are streamed straight into
+``ZeekRecord`` tuples or into the column arrays consumed by
+``FeatureExtractor.extract_zeek_features_columnar``, without going through
+JSON. Rotated and gzip-compressed files are supported.
+"""
+import glob
+import gzip
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .feature_extraction import ZEEK_ERROR_STATES, Columns, _factorize
+from .log_parsers import ZeekRecord
+
+logger = logging.getLogger(__name__)
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Default rows per chunk for iter_zeek_column_chunks
+COLUMN_CHUNK_ROWS = 100000
+
+# conn.log field names mapped onto ZeekLog/ZeekRecord fields
+ZEEK_CONN_FIELD_MAP = {
+    'ts': 'timestamp',
+    'uid': 'uid',
+    'id.orig_h': 'source_ip',
+    'id.orig_p': 'source_port',
+    'id.resp_h': 'dest_ip',
+    'id.resp_p': 'dest_port',
+    'proto': 'protocol',
+    'service': 'service',
+    'duration': 'duration',
+    'orig_bytes': 'orig_bytes',
+    'resp_bytes': 'resp_bytes',
+    'conn_state': 'conn_state',
+    'local_orig': 'local_orig',
+    'local_resp': 'local_resp',
+    'missed_bytes': 'missed_bytes',
+    'history': 'history',
+    'orig_pkts': 'orig_pkts',
+    'orig_ip_bytes': 'orig_ip_bytes',
+    'resp_pkts': 'resp_pkts',
+    'resp_ip_bytes': 'resp_ip_bytes'
+}
+
+# conn.log fields behind the required ZeekLog fields
+ZEEK_CONN_REQUIRED_FIELDS = ('ts', 'uid', 'id.orig_h', 'id.orig_p', 'id.resp_h', 'id.resp_p', 'proto')
+
+_ESCAPE = re.compile(r'\\x([0-9a-fA-F]{2})')
+
+PathSpec = Union[str, os.PathLike]
+
+
+def _unescape(value: str) -> str:
+    """Decode Zeek's \\xNN escapes (used for separators inside values)."""
+    if '\\x' not in value:
+        return value
+    return _ESCAPE.sub(lambda match: chr(int(match.group(1), 16)), value)
+
+
+def _to_bool(value: str) -> bool:
+    return value == 'T'
+
+
+def _to_time(value: str) -> datetime:
+    # Same conversion as LogParser.parse_zeek for numeric timestamps
+    return datetime.fromtimestamp(float(value))
+
+
+_SCALAR_CONVERTERS: Dict[str, Callable[[str], Any]] = {
+    'time': _to_time,
+    'interval': float,
+    'double': float,
+    'count': int,
+    'int': int,
+    'port': int,
+    'bool': _to_bool,
+    'string': _unescape,
+    'addr': str,
+    'subnet': str,
+    'enum': str,
+    'pattern': _unescape
+}
+
+
+class ZeekHeader:
+    """Layout of one Zeek log file, as described by its ``#`` header block."""
+
+    def __init__(self):
+        self.separator = '\t'
+        self.set_separator = ','
+        self.empty_field = '(empty)'
+        self.unset_field = '-'
+        self.path: Optional[str] = None
+        self.fields: List[str] = []
+        self.types: List[str] = []
+
+    def update(self, line: str):
+        """Apply one ``#key value`` header line."""
+        if line.startswith('#separator'):
+            # The separator line is always space separated and escaped
+            self.separator = _unescape(line[len('#separator'):].strip())
+            return
+        key, _, value = line[1:].partition(self.separator)
+        if key == 'set_separator':
+            self.set_separator = _unescape(value)
+        elif key == 'empty_field':
+            self.empty_field = value
+        elif key == 'unset_field':
+            self.unset_field = value
+        elif key == 'path':
+            self.path = value
+        elif key == 'fields':
+            self.fields = value.split(self.separator)
+        elif key == 'types':
+            self.types = value.split(self.separator)
+
+    def converter(self, zeek_type: str) -> Callable[[str], Any]:
+        """Build the str -> value converter of a column type."""
+        if zeek_type.startswith(('set[', 'vector[', 'table[')):
+            inner = self.converter(zeek_type[zeek_type.index('[') + 1:-1])
+            empty, set_separator = self.empty_field, self.set_separator
+
+            def convert_container(value: str) -> List[Any]:
+                if value == empty:
+                    return []
+                return [inner(item) for item in value.split(set_separator)]
+            return convert_container
+
+        convert = _SCALAR_CONVERTERS.get(zeek_type, _unescape)
+        if convert is _unescape:
+            empty = self.empty_field
+
+            def convert_string(value: str) -> str:
+                return '' if value == empty else _unescape(value)
+            return convert_string
+        return convert
+
+    def column_index(self) -> Dict[str, int]:
+        return {name: i for i, name in enumerate(self.fields)}
+
+
+def expand_log_paths(paths: Iterable[PathSpec], patterns: Sequence[str] = ('*.log*',)) -> List[str]:
+    """Expand files, directories and glob patterns into an ordered file list.
+
+    Directories are searched recursively for ``patterns``. Files are ordered
+    by modification time so rotated archives come before the live log they
+    were rotated out of.
+    """
+    found = set()
+    for path in paths:
+        path = os.fspath(path)
+        if os.path.isdir(path):
+            for pattern in patterns:
+                found.update(glob.glob(os.path.join(path, '**', pattern), recursive=True))
+        elif glob.has_magic(path):
+            found.update(glob.glob(path, recursive=True))
+        else:
+            found.add(path)
+    return sorted((p for p in found if os.path.isfile(p)), key=lambda p: (os.path.getmtime(p), p))
+
+
+def open_log(path: PathSpec, binary: bool = False):
+    """Open a possibly gzip-compressed log file as text (or bytes).
+
+    Compression is detected from the file contents, not the extension, since
+    rotation scripts do not always name archives consistently. Binary handles
+    report ``tell()`` offsets in the decompressed stream and can ``seek()``
+    back to them.
+    """
+    with open(path, 'rb') as f:
+        magic = f.read(2)
+    if magic == GZIP_MAGIC:
+        if binary:
+            return gzip.open(path, 'rb')
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace', newline='\n')
+    if binary:
+        return open(path, 'rb')
+    return open(path, 'r', encoding='utf-8', errors='replace', newline='\n')
+
+
+def iter_zeek_rows(path: PathSpec) -> Iterator[Tuple[ZeekHeader, List[str]]]:
+    """Yield ``(header, raw_values)`` for every data row of one file.
+
+    A new header object is started whenever a header block begins, so files
+    that were concatenated during rotation are handled too.
+    """
+    header = ZeekHeader()
+    in_header = False
+    with open_log(path) as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            if line[0] == '#':
+                if not in_header:
+                    header = ZeekHeader()
+                    in_header = True
+                if not line.startswith(('#open', '#close')):
+                    header.update(line)
+                continue
+            in_header = False
+            if not header.fields:
+                raise ValueError(f"{path}: data row before #fields header")
+            yield header, line.split(header.separator)
+
+
+def check_conn_header(path: PathSpec, header: ZeekHeader,
+                      required: Sequence[str] = ZEEK_CONN_REQUIRED_FIELDS) -> bool:
+    """Check that a header block describes a conn log before its rows are read.
+
+    Returns False, with a warning, for blocks whose ``#path`` names another
+    log (dns, http, ...) so the caller can skip them. Raises ValueError for
+    a conn log missing any of the ``required`` fields.
+    """
+    if header.path is not None and header.path != 'conn':
+        logger.warning(f"{path}: skipping {header.path} log, only conn logs are read")
+        return False
+    index = header.column_index()
+    missing = [name for name in required if name not in index]
+    if missing:
+        raise ValueError(f"{path}: not a conn log, missing fields {missing}")
+    return True
+
+
+def record_converter(header: ZeekHeader) -> Callable[[List[str]], ZeekRecord]:
+    """Build a raw values -> ZeekRecord converter for one header layout.
+
+    Unset (``-``) values become None; columns that are not part of ZeekRecord
+    are skipped.
+    """
+    positions = {name: i for i, name in enumerate(ZeekRecord._fields)}
+    plan = []
+    for column, (name, zeek_type) in enumerate(zip(header.fields, header.types)):
+        field = ZEEK_CONN_FIELD_MAP.get(name)
+        if field is not None:
+            plan.append((positions[field], column, header.converter(zeek_type)))
+    n_fields = len(ZeekRecord._fields)
+    unset = header.unset_field
+
+    def convert(values: List[str]) -> ZeekRecord:
+        record = [None] * n_fields
+        for position, column, convert_value in plan:
+            value = values[column]
+            if value != unset:
+                record[position] = convert_value(value)
+        return ZeekRecord._make(record)
+    return convert
+
+
+def read_zeek_records(paths: Iterable[PathSpec]) -> Iterator[ZeekRecord]:
+    """Stream conn.log rows of one or more files as ZeekRecord tuples.
+
+    Header blocks of other logs are skipped with a warning.
+    """
+    header, convert = None, None
+    for path in expand_log_paths(paths):
+        for row_header, values in iter_zeek_rows(path):
+            if row_header is not header:
+                header = row_header
+                convert = record_converter(header) if check_conn_header(path, header) else None
+            if convert is not None:
+                yield convert(values)
+
+
+def _numeric_column(values: List[str], unset: str, dtype) -> np.ndarray:
+    """Convert raw strings to numbers in one pass, unset values become 0."""
+    raw = np.array(values)
+    if raw.size:
+        raw[raw == unset] = '0'
+    return raw.astype(dtype) if raw.size else np.zeros(0, dtype=dtype)
+
+
+def iter_zeek_column_chunks(paths: Iterable[PathSpec], chunk_rows: int = COLUMN_CHUNK_ROWS,
+                            ip_index: Optional[Dict[Any, int]] = None) -> Iterator[Columns]:
+    """Stream conn.log rows as chunks of ``FeatureExtractor.zeek_columns`` arrays.
+
+    Numeric columns are converted with NumPy instead of per value. Pass a
+    shared ``ip_index`` to keep IP codes consistent across chunks. Header
+    blocks of other logs are skipped with a warning.
+    """
+    ip_index = {} if ip_index is None else ip_index
+    names = ['ts', 'orig_bytes', 'resp_bytes', 'orig_pkts', 'resp_pkts', 'duration',
+             'local_orig', 'conn_state', 'id.orig_h', 'id.resp_h']
+    raw: Dict[str, List[str]] = {name: [] for name in names}
+    header, columns = None, None
+
+    def flush() -> Columns:
+        unset = header.unset_field if header is not None else '-'
+        chunk = {
+            'timestamp': _numeric_column(raw['ts'], unset, np.float64),
+            'orig_bytes': _numeric_column(raw['orig_bytes'], unset, np.int64),
+            'resp_bytes': _numeric_column(raw['resp_bytes'], unset, np.int64),
+            'orig_pkts': _numeric_column(raw['orig_pkts'], unset, np.int64),
+            'resp_pkts': _numeric_column(raw['resp_pkts'], unset, np.int64),
+            'duration': _numeric_column(raw['duration'], unset, np.float64),
+            'local_orig': np.array(raw['local_orig'], dtype=object) == 'T',
+            'error_state': np.fromiter(
+                (state in ZEEK_ERROR_STATES for state in raw['conn_state']),
+                dtype=bool, count=len(raw['conn_state'])
+            ),
+            'source_ip': _factorize(raw['id.orig_h'], ip_index),
+            'dest_ip': _factorize(raw['id.resp_h'], ip_index)
+        }
+        for values in raw.values():
+            values.clear()
+        return chunk
+
+    rows = 0
+    for path in expand_log_paths(paths):
+        for row_header, values in iter_zeek_rows(path):
+            if row_header is not header:
+                # Unset markers are normalized per chunk, so flush on layout change
+                if rows:
+                    yield flush()
+                    rows = 0
+                header = row_header
+                if check_conn_header(path, header, names):
+                    index = header.column_index()
+                    columns = [(raw[name], index[name]) for name in names]
+                else:
+                    columns = None
+            if columns is None:
+                continue
+            for target, column in columns:
+                target.append(values[column])
+            rows += 1
+            if rows >= chunk_rows:
+                yield flush()
+                rows = 0
+    if rows:
+        yield flush()
+
+
+def read_zeek_columns(paths: Iterable[PathSpec]) -> Columns:
+    """Read whole conn.log files into ``FeatureExtractor.zeek_columns`` arrays."""
+    chunks = list(iter_zeek_column_chunks(paths))
+    if not chunks:
+        return {
+            'timestamp': np.zeros(0, dtype=np.float64),
+            'orig_bytes': np.zeros(0, dtype=np.int64),
+            'resp_bytes': np.zeros(0, dtype=np.int64),
+            'orig_pkts': np.zeros(0, dtype=np.int64),
+            'resp_pkts': np.zeros(0, dtype=np.int64),
+            'duration': np.zeros(0, dtype=np.float64),
+            'local_orig': np.zeros(0, dtype=bool),
+            'error_state': np.zeros(0, dtype=bool),
+            'source_ip': np.zeros(0, dtype=np.int64),
+            'dest_ip': np.zeros(0, dtype=np.int64)
+        }
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
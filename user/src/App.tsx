@@ -19,6 +19,7 @@ import {
   fetchThreats,
   fetchSystemHealth,
   fetchStats,
+  followEvents,
   resolveThreat
 } from './api/mockApi';
 import type { Threat, SystemHealth, NetworkStats } from './types';
@@ -28,7 +29,6 @@ function App() {
   const [threats, setThreats] = useState<Threat[]>([]);
   const [health, setHealth] = useState<SystemHealth | null>(null);
   const [networkStats, setNetworkStats] = useState<NetworkStats[]>([]);
-  const [logs, setLogs] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [selectedThreat, setSelectedThreat] = useState<Threat | null>(null);
@@ -42,7 +42,7 @@ function App() {
           fetchSystemHealth(),
           fetchStats()
         ]);
-        setThreats(threatsData);
+        setThreats(threatsData.threats);
         setHealth(healthData);
         setNetworkStats([statsData]); // Ensure this is in the correct format
       } catch (err) {
@@ -54,21 +54,41 @@ function App() {
 
     loadInitialData();
 
-    // Set up polling for real-time updates
+    // New and resolved threats are pushed over the event feed; health only changes with them
+    const reloadThreats = async () => {
+      const [threatsData, healthData] = await Promise.all([fetchThreats(), fetchSystemHealth()]);
+      setThreats(threatsData.threats);
+      setHealth(healthData);
+    };
+    const unsubscribe = followEvents(
+      { types: ['threat'] },
+      event => {
+        if (event.type !== 'threat') return;
+        const threat = event.data;
+        setThreats(prev => prev.some(t => t.id === threat.id)
+          ? prev.map(t => (t.id === threat.id ? threat : t))
+          : [threat, ...prev]);
+        fetchSystemHealth()
+          .then(setHealth)
+          .catch(err => console.error('Failed to update system health:', err));
+      },
+      reloadThreats
+    );
+
+    // Network stats are sampled for the graph, so they are still polled
     const pollInterval = setInterval(async () => {
       try {
-        const [newHealth, newStats] = await Promise.all([
-          fetchSystemHealth(),
-          fetchStats()
-        ]);
-        setHealth(newHealth);
+        const newStats = await fetchStats();
         setNetworkStats(prev => [...prev.slice(-19), newStats]);
       } catch (err) {
         console.error('Failed to update real-time data:', err);
       }
     }, 5000);
 
-    return () => clearInterval(pollInterval);
+    return () => {
+      unsubscribe();
+      clearInterval(pollInterval);
+    };
   }, []);
 
   const handleResolveThreat = async (threatId: string) => {
@@ -132,7 +152,7 @@ function App() {
             <Dashboard health={health} />
             <div className="grid grid-cols-1 lg:grid-cols-2 gap-8 mb-8">
               <NetworkGraph data={networkStats} />
-              <LiveLogs logs={logs} />
+              <LiveLogs />
             </div>
             <ThreatList threats={threats} onSelectThreat={setSelectedThreat} />
           </>
@@ -5,7 +5,13 @@ import type {
   NetworkStats,
   ThreatResolutionRequest,
   ModelMetrics,
-  AnalysisRequest
+  AnalysisRequest,
+  ThreatPage,
+  ThreatFilters,
+  LogPage,
+  LogFilters,
+  FeedEvent,
+  EventFeedFilters
 } from '../types';
 
 // Get the API URL from environment or default to localhost
@@ -16,14 +22,13 @@ if (import.meta.env.DEV) {
     console.log('API URL:', API_BASE_URL);
 }
 
-// Fetch threats
-export const fetchThreats = async (): Promise<{
-  threats: Threat[],
-  threat_level: string,
-  anomaly_count: number
-}> => {
+// Fetch one page of threats; pass next_cursor back as filters.cursor for the next page
+export const fetchThreats = async (filters: ThreatFilters = {}): Promise<ThreatPage> => {
   try {
-    const response = await axios.get(`${API_BASE_URL}/threats`);
+    const response = await axios.get(`${API_BASE_URL}/threats`, {
+      params: filters,
+      paramsSerializer: { indexes: null }  // severity=high&severity=critical
+    });
     return response.data; // Backend returns ThreatListResponse
   } catch (error) {
     console.error('Error fetching threats:', error);
@@ -34,6 +39,69 @@ export const fetchThreats = async (): Promise<{
   }
 };
 
+// Fetch one page of security logs, newest first
+export const fetchLogs = async (filters: LogFilters = {}): Promise<LogPage> => {
+  try {
+    const response = await axios.get(`${API_BASE_URL}/logs`, { params: filters });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching logs:', error);
+    if (axios.isAxiosError(error) && error.response) {
+      throw new Error(error.response.data.detail || 'Failed to fetch logs');
+    }
+    throw new Error('Failed to fetch logs');
+  }
+};
+
+// Subscribe to newly written logs, anomalies and threats; returns an unsubscribe function.
+// The server ends the stream with a `dropped` event when the client falls behind.
+export const subscribeEvents = (
+  filters: EventFeedFilters,
+  onEvent: (event: FeedEvent) => void,
+  onDropped?: () => void
+): (() => void) => {
+  const params = new URLSearchParams();
+  filters.types?.forEach(type => params.append('types', type));
+  filters.severity?.forEach(severity => params.append('severity', severity));
+  if (filters.source) params.append('source', filters.source);
+  if (filters.event_type) params.append('event_type', filters.event_type);
+
+  const source = new EventSource(`${API_BASE_URL}/events?${params}`);
+  (['log', 'anomaly', 'threat'] as const).forEach(type => {
+    source.addEventListener(type, message => {
+      onEvent({ type, data: JSON.parse((message as MessageEvent).data) } as FeedEvent);
+    });
+  });
+  source.addEventListener('dropped', () => {
+    source.close();
+    onDropped?.();
+  });
+  return () => source.close();
+};
+
+// Like subscribeEvents, but reconnects after a `dropped` event and calls catchUp
+// (e.g. a /logs or /threats refetch) to fill in what was missed.
+export const followEvents = (
+  filters: EventFeedFilters,
+  onEvent: (event: FeedEvent) => void,
+  catchUp: () => Promise<void>
+): (() => void) => {
+  let unsubscribe = () => {};
+  let closed = false;
+  const connect = () => {
+    unsubscribe = subscribeEvents(filters, onEvent, () => {
+      if (closed) return;
+      connect();  // subscribe again first so nothing falls between the catch-up and the feed
+      catchUp().catch(error => console.error('Error catching up after the event feed dropped:', error));
+    });
+  };
+  connect();
+  return () => {
+    closed = true;
+    unsubscribe();
+  };
+};
+
 // Fetch system health
 export const fetchSystemHealth = async (): Promise<SystemHealth> => {
   try {
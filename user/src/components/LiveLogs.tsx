@@ -1,6 +1,8 @@
 import React, { useState, useEffect } from 'react';
 import { format } from 'date-fns';
 import { Terminal } from 'lucide-react';
+import { fetchLogs, followEvents } from '../api/mockApi';
+import type { LogEntry } from '../types';
 
 interface Log {
   timestamp: string;
@@ -9,11 +11,51 @@ interface Log {
 }
 
 interface LiveLogsProps {
-  logs: Log[];
+  // Fixed logs to show; without them the component follows the /events feed
+  logs?: Log[];
 }
 
-export const LiveLogs: React.FC<LiveLogsProps> = ({ logs }) => {
+// Newest entries kept when following the feed
+const MAX_LIVE_LOGS = 100;
+
+const toLog = (entry: LogEntry): Log => ({
+  timestamp: entry.timestamp,
+  message: `[${entry.source ?? entry.log_type}] ${entry.message}`,
+  type: entry.threat_id ? 'warning' : 'info'
+});
+
+// Merge entries into the list by id, newest first
+const mergeLogs = (current: LogEntry[], incoming: LogEntry[]): LogEntry[] => {
+  const byId = new Map(current.map(entry => [entry.id, entry]));
+  incoming.forEach(entry => byId.set(entry.id, entry));
+  return Array.from(byId.values())
+    .sort((a, b) => Date.parse(b.timestamp) - Date.parse(a.timestamp))
+    .slice(0, MAX_LIVE_LOGS);
+};
+
+export const LiveLogs: React.FC<LiveLogsProps> = ({ logs: fixedLogs }) => {
   const [currentTime, setCurrentTime] = useState(format(new Date(), 'HH:mm:ss'));
+  const [liveLogs, setLiveLogs] = useState<LogEntry[]>([]);
+
+  useEffect(() => {
+    if (fixedLogs) return;
+
+    const catchUp = async () => {
+      const page = await fetchLogs({ limit: MAX_LIVE_LOGS });
+      setLiveLogs(current => mergeLogs(current, page.logs));
+    };
+    const unsubscribe = followEvents(
+      { types: ['log'] },
+      event => {
+        if (event.type === 'log') setLiveLogs(current => mergeLogs(current, [event.data]));
+      },
+      catchUp
+    );
+    catchUp().catch(error => console.error('Error loading recent logs:', error));
+    return unsubscribe;
+  }, [fixedLogs]);
+
+  const logs = fixedLogs ?? liveLogs.map(toLog);
 
   useEffect(() => {
     const intervalId = setInterval(() => {
@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { ThreatList } from './ThreatList';
 import { ThreatDetail } from './ThreatDetail';
 import { ResponseAction } from './ResponseAction';
-import { fetchThreats, resolveThreat } from '../api/mockApi';
+import { fetchThreats, followEvents, resolveThreat } from '../api/mockApi';
 import { Threat } from '../types';
 
 export const ThreatManagement: React.FC = () => {
@@ -13,7 +13,7 @@ export const ThreatManagement: React.FC = () => {
   const loadThreats = async () => {
     try {
       const fetchedThreats = await fetchThreats();
-      setThreats(fetchedThreats);
+      setThreats(fetchedThreats.threats);
     } catch (err) {
       setError('Failed to fetch threats');
     }
@@ -21,6 +21,18 @@ export const ThreatManagement: React.FC = () => {
 
   useEffect(() => {
     loadThreats();
+    // Pick up new and resolved threats as they happen; refetch if the feed dropped us
+    return followEvents(
+      { types: ['threat'] },
+      event => {
+        if (event.type !== 'threat') return;
+        const threat = event.data;
+        setThreats(prev => prev.some(t => t.id === threat.id)
+          ? prev.map(t => (t.id === threat.id ? threat : t))
+          : [threat, ...prev]);
+      },
+      loadThreats
+    );
   }, []);
 
   const handleResolveThreat = async (threatId: string) => {
@@ -13,6 +13,67 @@ export interface Threat {
   logs?: string[];
 }
 
+export interface ThreatPage {
+  threats: Threat[];
+  threat_level: string;
+  anomaly_count: number;
+  next_cursor: string | null;
+}
+
+export interface ThreatFilters {
+  status?: ThreatStatus;
+  severity?: ThreatSeverity[];
+  source_ip?: string;
+  since?: string;
+  until?: string;
+  limit?: number;
+  cursor?: string;
+}
+
+export interface LogEntry {
+  id: string;
+  timestamp: string;
+  log_type: string;
+  source?: string;
+  message: string;
+  threat_id?: string;
+}
+
+export interface LogPage {
+  logs: LogEntry[];
+  next_cursor: string | null;
+}
+
+export interface LogFilters {
+  source?: string;
+  event_type?: string;
+  since?: string;
+  until?: string;
+  limit?: number;
+  cursor?: string;
+}
+
+export interface AnomalyEvent {
+  id: string;
+  timestamp: string;
+  detection_type: string;
+  confidence_score?: number;
+  description?: string;
+  impact_severity?: string;
+}
+
+export type FeedEvent =
+  | { type: 'log'; data: LogEntry }
+  | { type: 'anomaly'; data: AnomalyEvent }
+  | { type: 'threat'; data: Threat };
+
+export interface EventFeedFilters {
+  types?: FeedEvent['type'][];
+  source?: string;
+  event_type?: string;
+  severity?: string[];
+}
+
 export interface SystemHealth {
   status: 'healthy' | 'warning' | 'critical';
   activeThreats: number;